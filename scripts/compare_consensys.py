@@ -1,42 +1,71 @@
+import copy
+import os
+from collections import OrderedDict
+
 import yaml
 import pandas as pd
 import argparse
 
+try:
+    # LibYAML-backed loader is several times faster than the pure-Python one
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+YAML_CACHE_SIZE = 100
+_yaml_cache = OrderedDict()
+
 def load_yaml(file_path):
-    """Load YAML file."""
+    """Load YAML file, reusing the parsed data while the file is unchanged."""
+    key = os.path.abspath(file_path)
+    stat = os.stat(key)
+    cached = _yaml_cache.get(key)
+    if cached is not None and cached[:2] == (stat.st_mtime, stat.st_size):
+        _yaml_cache.move_to_end(key)
+        return copy.deepcopy(cached[2])
+    
     with open(file_path, "r") as file:
-        return yaml.safe_load(file)
+        data = yaml.load(file, Loader=YamlLoader)
+    
+    _yaml_cache[key] = (stat.st_mtime, stat.st_size, data)
+    _yaml_cache.move_to_end(key)
+    if len(_yaml_cache) > YAML_CACHE_SIZE:
+        _yaml_cache.popitem(last=False)
+    return copy.deepcopy(data)
 
 def compare_yaml_files(file1_path, file2_path):
     """Compare two YAML files and return differences."""
-    data1 = load_yaml(file1_path)
-    data2 = load_yaml(file2_path)
-    
-    all_keys = set(data1.keys()).union(set(data2.keys()))
-    differences = []
+    data1 = pd.Series(load_yaml(file1_path), dtype=object)
+    data2 = pd.Series(load_yaml(file2_path), dtype=object)
     
-    for key in all_keys:
-        value1 = data1.get(key, "Not Present")
-        value2 = data2.get(key, "Not Present")
-        
-        if value1 != value2:
-            differences.append({"Parameter": key, "File1": value1, "File2": value2})
+    all_keys = data1.index.union(data2.index)
+    df = pd.DataFrame({
+        "File1": data1.reindex(all_keys, fill_value="Not Present"),
+        "File2": data2.reindex(all_keys, fill_value="Not Present"),
+    })
     
-    df_differences = pd.DataFrame(differences)
-    df_differences_only = df_differences[df_differences["File1"] != df_differences["File2"]]
+    # Compare the raw object arrays so YAML nulls present in both files count as equal
+    mask = df["File1"].to_numpy() != df["File2"].to_numpy()
     
-    return df_differences_only
+    return df[mask].rename_axis("Parameter").reset_index()
 
 def dataframe_to_markdown(df, file1_name="File1", file2_name="File2"):
     """Convert DataFrame to Markdown format."""
-    markdown = f"# Differences Between `{file1_name}` and `{file2_name}`\n\n"
-    markdown += "| Parameter | " + file1_name + " Value | " + file2_name + " Value |\n"
-    markdown += "|-----------|-------------|-------------|\n"
+    lines = [
+        f"# Differences Between `{file1_name}` and `{file2_name}`\n\n",
+        f"| Parameter | {file1_name} Value | {file2_name} Value |\n",
+        "|-----------|-------------|-------------|\n",
+    ]
     
-    for _, row in df.iterrows():
-        markdown += f"| {row['Parameter']} | {row['File1']} | {row['File2']} |\n"
+    if not df.empty:
+        # Format every row column-wise instead of boxing each row with iterrows
+        lines.extend(
+            "| " + df["Parameter"].astype(str)
+            + " | " + df["File1"].astype(str)
+            + " | " + df["File2"].astype(str) + " |\n"
+        )
     
-    return markdown
+    return "".join(lines)
 
 def save_to_csv(df, output_path="differences.csv"):
     """Save differences to a CSV file."""
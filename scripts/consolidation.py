@@ -1,12 +1,17 @@
-from web3 import Web3
+from web3 import Web3, HTTPProvider
 from eth_account import Account
 from eth_utils import remove_0x_prefix, to_hex
-from web3.types import HexStr, ChecksumAddress, Wei, TxParams, Nonce
+from web3.types import HexStr, ChecksumAddress, Wei, TxParams, Nonce, RPCEndpoint, RPCResponse
+from hexbytes import HexBytes
+import requests
+from requests.adapters import HTTPAdapter
 import sys
 import json
+import time
+import orjson
 import argparse
 from loguru import logger
-from typing import Optional, Dict, Any, cast
+from typing import Optional, Dict, Any, Mapping, Tuple, cast
 
 def setup_logging(log_file: Optional[str] = None):
     """Configure loguru logger with console and optional file output"""
@@ -44,6 +49,42 @@ def parse_args():
                       help='Path to the log file (optional)')
     return parser.parse_args()
 
+def _orjson_default(value: Any) -> Any:
+    """Serialize the web3 types orjson does not know about (HexBytes, AttributeDict)"""
+    if isinstance(value, (bytes, bytearray)):
+        return to_hex(value)
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class OrjsonHTTPProvider(HTTPProvider):
+    """HTTPProvider that encodes and decodes JSON-RPC payloads with orjson"""
+
+    def encode_rpc_request(self, method: RPCEndpoint, params: Any) -> bytes:
+        rpc_dict = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or [],
+            "id": next(self.request_counter),
+        }
+        try:
+            return orjson.dumps(rpc_dict, default=_orjson_default)
+        except TypeError:
+            # orjson rejects integers wider than 64 bits, fall back to the stdlib encoder
+            return json.dumps(rpc_dict, default=_orjson_default).encode()
+
+    @staticmethod
+    def decode_rpc_response(raw_response: bytes) -> RPCResponse:
+        return orjson.loads(raw_response)
+
+def create_http_session() -> requests.Session:
+    """Create a keep-alive session with a small connection pool for burst RPC calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 def print_curl_command(url: str, method: str, params: list):
     """Print equivalent curl command for debugging"""
     json_data = {
@@ -54,43 +95,131 @@ def print_curl_command(url: str, method: str, params: list):
     }
     curl_cmd = (
         f"curl -X POST -H 'Content-Type: application/json' "
-        f"--data '{json.dumps(json_data)}' {url}"
+        f"--data '{orjson.dumps(json_data).decode()}' {url}"
     )
     logger.debug("\nEquivalent curl command:")
     logger.debug(curl_cmd)
 
+# Consolidation fee changes at most once per block, so reuse it for roughly one slot
+CONSOLIDATION_FEE_TTL = 12
+
+# Memoized chain state for repeated runs in the same process (e.g. when imported as a library)
+_chain_id_cache: Dict[str, int] = {}
+_contract_code_cache: Dict[Tuple[int, ChecksumAddress], HexBytes] = {}
+_consolidation_fee_cache: Dict[Tuple[int, ChecksumAddress], Tuple[float, int, int]] = {}
+
+def fetch_bootstrap_state(
+    web3: Web3,
+    account_address: ChecksumAddress,
+    contract_address: ChecksumAddress
+) -> Dict[str, Any]:
+    """Fetch all pre-flight chain state in a single JSON-RPC batch request
+
+    Contract code and the consolidation fee are memoized per (chain_id, contract);
+    the fee expires after CONSOLIDATION_FEE_TTL seconds or once a new block is seen.
+    """
+    endpoint = str(web3.provider.endpoint_uri)
+    known_chain_id = _chain_id_cache.get(endpoint)
+    cache_key = (known_chain_id, contract_address)
+    code = _contract_code_cache.get(cache_key)
+    cached_fee = _consolidation_fee_cache.get(cache_key)
+    if cached_fee is not None and time.monotonic() - cached_fee[0] > CONSOLIDATION_FEE_TTL:
+        cached_fee = None
+
+    fee_call = ('eth_call', [{'to': contract_address, 'data': '0x'}, 'latest'])
+    batch = [
+        ('eth_chainId', []),
+        ('eth_blockNumber', []),
+        ('eth_getBalance', [account_address, 'latest']),
+        ('eth_gasPrice', []),
+        ('eth_getTransactionCount', [account_address, 'latest']),
+    ]
+    if code is None:
+        batch.append(('eth_getCode', [contract_address, 'latest']))
+    if cached_fee is None:
+        batch.append(fee_call)
+
+    responses = web3.provider.make_batch_request(batch)
+    if not isinstance(responses, list):
+        raise ConnectionError(f"Failed to connect to the Ethereum network: {responses.get('error')}")
+    results = {method: response for (method, _), response in zip(batch, responses)}
+
+    for method, response in results.items():
+        if method != 'eth_call' and 'error' in response:
+            raise ValueError(f"Failed to fetch {method}: {response['error']}")
+
+    chain_id = int(results['eth_chainId']['result'], 16)
+    if known_chain_id is not None and chain_id != known_chain_id:
+        # The endpoint now serves a different chain (e.g. a restarted devnet), start over
+        del _chain_id_cache[endpoint]
+        return fetch_bootstrap_state(web3, account_address, contract_address)
+    _chain_id_cache[endpoint] = chain_id
+    cache_key = (chain_id, contract_address)
+
+    block_number = int(results['eth_blockNumber']['result'], 16)
+    if code is None:
+        code = HexBytes(results['eth_getCode']['result'])
+        if len(code) > 0:
+            _contract_code_cache[cache_key] = code
+
+    fee, fee_error = None, None
+    if cached_fee is not None and cached_fee[1] == block_number:
+        fee = cached_fee[2]
+    else:
+        # Either not requested in the batch or the cached value is from an older block
+        fee_response = results.get('eth_call') or web3.provider.make_request(*fee_call)
+        if 'result' in fee_response:
+            fee = int(fee_response['result'], 16)
+            _consolidation_fee_cache[cache_key] = (time.monotonic(), block_number, fee)
+        else:
+            fee_error = fee_response.get('error')
+
+    return {
+        'chain_id': chain_id,
+        'code': code,
+        'balance': int(results['eth_getBalance']['result'], 16),
+        'gas_price': int(results['eth_gasPrice']['result'], 16),
+        'nonce': int(results['eth_getTransactionCount']['result'], 16),
+        # The fee probe may legitimately fail, so the caller decides on a fallback
+        'fee': fee,
+        'fee_error': fee_error,
+    }
+
 def send_consolidation_transaction(
     web3: Web3,
     account: Account,
     account_address: ChecksumAddress,
     chain_id: int,
-    validator_pubkey: str,
-    target_pubkey: str,
+    validator_pubkey: bytes,
+    target_pubkey: bytes,
     current_fee: int,
     contract_address: ChecksumAddress,
     rpc_url: str,
-    private_key: str
-) -> None:
-    """Send a consolidation transaction with the given parameters."""
+    private_key: str,
+    nonce: int,
+    gas_price: int
+) -> bool:
+    """Send a consolidation transaction with the given parameters.
+
+    Returns True if the transaction was broadcast and consumed the nonce.
+    """
     # Create transaction data by concatenating the validator pubkeys (total 96 bytes)
-    tx_data = HexStr('0x' + validator_pubkey + target_pubkey)
+    raw_data = validator_pubkey + target_pubkey
     
     # Additional validation of the final transaction data
-    data_without_prefix = remove_0x_prefix(tx_data)
-    total_bytes = len(data_without_prefix) // 2
+    total_bytes = len(raw_data)
     logger.debug("Transaction data validation:")
-    logger.debug(f"Total length: {len(data_without_prefix)} characters ({total_bytes} bytes)")
-    logger.debug(f"Expected: 192 characters (96 bytes)")
-    logger.debug(f"Source validator part: {data_without_prefix[:96]}")
-    logger.debug(f"Target validator part: {data_without_prefix[96:]}")
+    logger.debug(f"Total length: {total_bytes} bytes")
+    logger.debug(f"Expected: 96 bytes")
+    logger.debug(f"Source validator part: {validator_pubkey.hex()}")
+    logger.debug(f"Target validator part: {target_pubkey.hex()}")
     
     if total_bytes != 96:
         raise ValueError(f"Invalid total transaction data length. Expected 96 bytes, got {total_bytes} bytes")
         
+    tx_data = HexStr(to_hex(raw_data))
     logger.debug(f"Transaction data: {tx_data}")
 
-    # Get nonce
-    nonce = web3.eth.get_transaction_count(account_address)
     logger.debug(f"Nonce: {nonce}")
 
     # Prepare transaction
@@ -99,7 +228,7 @@ def send_consolidation_transaction(
         'to': contract_address,
         'value': Wei(current_fee),
         'gas': 200000,
-        'gasPrice': web3.eth.gas_price,
+        'gasPrice': Wei(gas_price),
         'nonce': Nonce(nonce),
         'chainId': chain_id,
         'data': tx_data
@@ -122,7 +251,14 @@ def send_consolidation_transaction(
     try:
         tx_hash = web3.eth.send_raw_transaction(signed_txn.raw_transaction)
         logger.info(f"Transaction sent! Hash: {tx_hash.hex()}")
+    except Exception as e:
+        logger.error(f"Failed to send transaction: {e}")
+        params = [signed_txn.raw_transaction.hex()]
+        print_curl_command(rpc_url, 'eth_sendRawTransaction', params)
+        return False
 
+    # The nonce is used once the node accepted the transaction, whatever happens while waiting
+    try:
         # Wait for receipt
         receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
         logger.info("Transaction receipt:")
@@ -140,7 +276,7 @@ def send_consolidation_transaction(
                     'value': Wei(0),  # No value needed for call
                     'data': tx_data,
                     'gas': 200000,  # Add required fields for TxParams
-                    'gasPrice': web3.eth.gas_price,
+                    'gasPrice': Wei(gas_price),
                     'nonce': Nonce(0),  # Nonce not needed for call
                     'chainId': chain_id
                 }
@@ -149,11 +285,10 @@ def send_consolidation_transaction(
                 web3.eth.call(call_params, block_identifier)
             except Exception as e:
                 logger.error(f"Revert reason: {str(e)}")
-
     except Exception as e:
-        logger.error(f"Failed to send transaction: {e}")
-        params = [signed_txn.raw_transaction.hex()]
-        print_curl_command(rpc_url, 'eth_sendRawTransaction', params)
+        logger.error(f"Failed to get transaction receipt: {e}")
+
+    return True
 
 def main():
     try:
@@ -164,16 +299,25 @@ def main():
         CONTRACT_ADDRESS = Web3.to_checksum_address('0x0000BBdDc7CE488642fb579F8B00f3a590007251')
 
         # Connect to Ethereum node
-        web3 = Web3(Web3.HTTPProvider(args.rpc_url))
-        if not web3.is_connected():
-            raise ConnectionError("Failed to connect to the Ethereum network")
+        web3 = Web3(OrjsonHTTPProvider(
+            args.rpc_url,
+            session=create_http_session(),
+            request_kwargs={'timeout': 30}
+        ))
+
+        # Account setup
+        account = Account.from_key(args.private_key)
+        account_address = Web3.to_checksum_address(account.address)
+
+        # Fetch chain id, contract code, balance, gas price, nonce and fee in one round-trip
+        state = fetch_bootstrap_state(web3, account_address, CONTRACT_ADDRESS)
 
         logger.info("Connected to Ethereum network")
-        chain_id = web3.eth.chain_id
+        chain_id = state['chain_id']
         logger.info(f"Chain ID: {chain_id} (hex: {hex(chain_id)})")
 
         # Check if contract exists
-        code = web3.eth.get_code(CONTRACT_ADDRESS)
+        code = state['code']
         logger.info(f"Contract code exists: {len(code) > 0}")
         if len(code) > 0:
             logger.debug(f"Contract code length: {len(code)} bytes")
@@ -181,64 +325,57 @@ def main():
         else:
             raise ValueError("Contract not deployed")
 
-        # Account setup
-        account = Account.from_key(args.private_key)
-        account_address = Web3.to_checksum_address(account.address)
         logger.info(f"Account: {account_address}")
-        balance = web3.eth.get_balance(account_address)
+        balance = state['balance']
         logger.info(f"Balance: {balance} wei ({web3.from_wei(balance, 'ether')} ETH)")
 
         # Get current gas price and use a lower value
-        gas_price = web3.eth.gas_price
+        gas_price = state['gas_price']
         gas_price = int(gas_price * 0.8)  # Use 80% of current gas price
         logger.info(f"Current gas price: {gas_price} wei")
 
         # Get current consolidation fee
-        try:
-            current_fee = web3.eth.call({
-                'to': CONTRACT_ADDRESS,
-                'data': HexStr('0x')
-            })
-            current_fee = int.from_bytes(current_fee, byteorder='big')
+        current_fee = state['fee']
+        if current_fee is not None:
             logger.info(f"Current consolidation fee: {current_fee} wei")
 
             # Ensure we're not sending 0 fee
             if current_fee == 0:
                 logger.warning("Consolidation fee is 0, using 1 wei as minimum value")
                 current_fee = 1
-        except Exception as e:
-            logger.error(f"Failed to retrieve the current consolidation fee: {e}")
+        else:
+            logger.error(f"Failed to retrieve the current consolidation fee: {state['fee_error']}")
             logger.warning("Using 1 wei as minimum value")
             current_fee = 1
 
-        # Remove 0x prefixes from both validator pubkeys and ensure they are the correct length (96 hex characters for 48 bytes)
-        source_pubkey = remove_0x_prefix(HexStr(args.source_validator))
-        target_pubkey = remove_0x_prefix(HexStr(args.target_validator))
-
-        if len(source_pubkey) != 96:
-            raise ValueError(f"Invalid source validator pubkey length: {len(source_pubkey)}")
-        if len(target_pubkey) != 96:
-            raise ValueError(f"Invalid target validator pubkey length: {len(target_pubkey)}")
-
-        # Validate pubkey formats
+        # Parse both validator pubkeys (with or without 0x prefix) into their raw 48 bytes
         try:
-            int(source_pubkey, 16)
-            int(target_pubkey, 16)
-            logger.info("Source validator pubkey format is valid")
-            logger.debug(f"Source pubkey length: {len(source_pubkey)} characters ({len(source_pubkey)//2} bytes)")
-            logger.debug(f"First 32 bytes of source: {source_pubkey[:64]}")
-            logger.debug(f"Last 16 bytes of source: {source_pubkey[-32:]}")
-
-            logger.info("Target validator pubkey format is valid")
-            logger.debug(f"Target pubkey length: {len(target_pubkey)} characters ({len(target_pubkey)//2} bytes)")
-            logger.debug(f"First 32 bytes of target: {target_pubkey[:64]}")
-            logger.debug(f"Last 16 bytes of target: {target_pubkey[-32:]}")
+            source_pubkey = bytes.fromhex(remove_0x_prefix(HexStr(args.source_validator)))
+            target_pubkey = bytes.fromhex(remove_0x_prefix(HexStr(args.target_validator)))
         except ValueError as e:
             raise ValueError(f"Invalid validator pubkey format: {e}")
 
+        if len(source_pubkey) != 48:
+            raise ValueError(f"Invalid source validator pubkey length: {len(source_pubkey)} bytes")
+        if len(target_pubkey) != 48:
+            raise ValueError(f"Invalid target validator pubkey length: {len(target_pubkey)} bytes")
+
+        logger.info("Source validator pubkey format is valid")
+        logger.debug(f"Source pubkey length: {len(source_pubkey)} bytes")
+        logger.debug(f"First 32 bytes of source: {source_pubkey[:32].hex()}")
+        logger.debug(f"Last 16 bytes of source: {source_pubkey[-16:].hex()}")
+
+        logger.info("Target validator pubkey format is valid")
+        logger.debug(f"Target pubkey length: {len(target_pubkey)} bytes")
+        logger.debug(f"First 32 bytes of target: {target_pubkey[:32].hex()}")
+        logger.debug(f"Last 16 bytes of target: {target_pubkey[-16:].hex()}")
+
+        # Both transactions come from the same account, so increment the nonce locally
+        nonce = state['nonce']
+
         # Send first consolidation transaction
         logger.info("Sending consolidation request ...")
-        send_consolidation_transaction(
+        if send_consolidation_transaction(
             web3=web3,
             account=account,
             account_address=account_address,
@@ -248,8 +385,11 @@ def main():
             current_fee=current_fee,
             contract_address=CONTRACT_ADDRESS,
             rpc_url=args.rpc_url,
-            private_key=args.private_key
-        )
+            private_key=args.private_key,
+            nonce=nonce,
+            gas_price=gas_price
+        ):
+            nonce += 1
 
         # Send second consolidation transaction
         logger.info("Sending consolidation transaction ...")
@@ -263,7 +403,9 @@ def main():
             current_fee=current_fee,
             contract_address=CONTRACT_ADDRESS,
             rpc_url=args.rpc_url,
-            private_key=args.private_key
+            private_key=args.private_key,
+            nonce=nonce,
+            gas_price=gas_price
         )
 
     except Exception as e:
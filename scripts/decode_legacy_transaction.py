@@ -1,22 +1,83 @@
-from eth_account._utils.legacy_transactions import TypedTransaction
-from hexbytes import HexBytes
+from eth_utils import remove_0x_prefix
 import argparse
+import rlp
+
+
+LEGACY_FIELDS = ('nonce', 'gasPrice', 'gas', 'to', 'value', 'data', 'v', 'r', 's')
+
+# Field order of the RLP payload for each EIP-2718 transaction type
+TYPED_FIELDS = {
+    1: ('chainId', 'nonce', 'gasPrice', 'gas', 'to', 'value', 'data', 'accessList',
+        'v', 'r', 's'),
+    2: ('chainId', 'nonce', 'maxPriorityFeePerGas', 'maxFeePerGas', 'gas', 'to', 'value',
+        'data', 'accessList', 'v', 'r', 's'),
+    3: ('chainId', 'nonce', 'maxPriorityFeePerGas', 'maxFeePerGas', 'gas', 'to', 'value',
+        'data', 'accessList', 'maxFeePerBlobGas', 'blobVersionedHashes', 'v', 'r', 's'),
+    4: ('chainId', 'nonce', 'maxPriorityFeePerGas', 'maxFeePerGas', 'gas', 'to', 'value',
+        'data', 'accessList', 'authorizationList', 'v', 'r', 's'),
+}
+
+AUTHORIZATION_FIELDS = ('chainId', 'address', 'nonce', 'yParity', 'r', 's')
+
+HEX_FIELDS = {'to', 'data', 'address'}
+
+
+def to_hex(value: bytes) -> str:
+    return '0x' + value.hex()
+
+
+def format_fields(names, values) -> dict:
+    """Convert raw RLP items into printable values keyed by field name."""
+    result = {}
+    for name, value in zip(names, values):
+        if name == 'accessList':
+            result[name] = [
+                {'address': to_hex(address), 'storageKeys': [to_hex(key) for key in keys]}
+                for address, keys in value
+            ]
+        elif name == 'blobVersionedHashes':
+            result[name] = [to_hex(item) for item in value]
+        elif name == 'authorizationList':
+            result[name] = [format_fields(AUTHORIZATION_FIELDS, item) for item in value]
+        elif name in HEX_FIELDS:
+            result[name] = to_hex(value)
+        else:
+            result[name] = int.from_bytes(value, 'big')
+    return result
+
+
+def decode_transaction(raw: bytes) -> dict:
+    """Decode a signed legacy or typed transaction straight from its RLP encoding."""
+    if not raw:
+        raise ValueError("Empty transaction")
+    # Typed transactions start with the type byte, legacy ones with an RLP list prefix
+    if raw[0] >= 0xc0:
+        return format_fields(LEGACY_FIELDS, rlp.decode(raw))
+
+    tx_type = raw[0]
+    if tx_type not in TYPED_FIELDS:
+        raise ValueError(f"Unsupported transaction type: {tx_type}")
+    fields = rlp.decode(raw[1:])
+    if tx_type == 3 and isinstance(fields[0], list):
+        # Network form of a blob transaction: [tx_payload_body, blobs, commitments, proofs]
+        fields = fields[0]
+    return {'type': tx_type, **format_fields(TYPED_FIELDS[tx_type], fields)}
 
 
 def print_transaction(path: str) -> None:
     tr = None
     with open(path, 'r') as f:
         tr = f.read()
-    print(TypedTransaction.from_bytes(HexBytes(tr)).as_dict())  
+    print(decode_transaction(bytes.fromhex(remove_0x_prefix(tr.strip()))))
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description='Parse legacy transaction and print output')
-    parser.add_argument('-f', '--transaction-file', 
-                        type=str, 
+    parser.add_argument('-f', '--transaction-file',
+                        type=str,
                         help='Txt file with transaction hash')
     args = parser.parse_args()
     print_transaction(args.transaction_file)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
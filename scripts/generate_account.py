@@ -6,17 +6,43 @@ import argparse
 import json
 import os
 import secrets
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Iterable, Optional
 
-from eth_account import Account
+import orjson
+from coincurve import PublicKey
+from eth_utils import keccak, to_checksum_address
 
 
-def generate_ethereum_account() -> dict[str, str]:
-    """Create a random Ethereum account."""
-    private_key = "0x" + secrets.token_hex(32)
-    account = Account.from_key(private_key)
-    return {"private_key": private_key, "public_key": account.address}
+PRIVATE_KEY_SIZE = 32
+# Below this many accounts the process pool start-up costs more than it saves
+PARALLEL_THRESHOLD = 20000
+
+
+def private_key_to_address(private_key: bytes) -> str:
+    """Derive the checksummed address straight from secp256k1 via coincurve."""
+    public_key = PublicKey.from_valid_secret(private_key).format(compressed=False)[1:]
+    return to_checksum_address(keccak(public_key)[-20:])
+
+
+def generate_ethereum_account(private_key: Optional[bytes] = None) -> dict[str, str]:
+    """Create an Ethereum account from raw key bytes, or a random one."""
+    if private_key is None:
+        private_key = secrets.token_bytes(PRIVATE_KEY_SIZE)
+    return {"private_key": "0x" + private_key.hex(), "public_key": private_key_to_address(private_key)}
+
+
+def derive_addresses(private_keys: list[bytes], workers: Optional[int] = None) -> list[str]:
+    """Derive addresses for the keys, spreading large batches over a process pool."""
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(private_keys) >= PARALLEL_THRESHOLD else 1
+    if workers <= 1:
+        return [private_key_to_address(private_key) for private_key in private_keys]
+
+    chunksize = max(1, len(private_keys) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(private_key_to_address, private_keys, chunksize=chunksize))
 
 
 def generate_multiple_accounts(
@@ -24,17 +50,37 @@ def generate_multiple_accounts(
     output_dir: Optional[str] = None,
     prefix: str = "eth_accounts",
     save_public: bool = False,
+    workers: Optional[int] = None,
+    jsonl: bool = False,
+    pretty: bool = False,
 ) -> list[dict[str, str]]:
-    accounts: list[dict[str, str]] = [generate_ethereum_account() for _ in range(num_accounts)]
+    # Draw the entropy for all keys at once instead of one syscall per account
+    raw_keys = os.urandom(PRIVATE_KEY_SIZE * num_accounts)
+    private_keys = [
+        raw_keys[offset:offset + PRIVATE_KEY_SIZE]
+        for offset in range(0, len(raw_keys), PRIVATE_KEY_SIZE)
+    ]
+    addresses = derive_addresses(private_keys, workers)
+    accounts: list[dict[str, str]] = [
+        {"private_key": "0x" + private_key.hex(), "public_key": address}
+        for private_key, address in zip(private_keys, addresses)
+    ]
 
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        json_filename = f"{prefix}_{timestamp}.json"
+        json_filename = f"{prefix}_{timestamp}.{'jsonl' if jsonl else 'json'}"
         json_filepath = os.path.join(output_dir, json_filename)
-        with open(json_filepath, "w", encoding="utf-8") as file:
-            json.dump(accounts, file, indent=4)
+        if jsonl:
+            with open(json_filepath, "wb") as file:
+                file.writelines(orjson.dumps(account) + b"\n" for account in accounts)
+        elif pretty:
+            with open(json_filepath, "w", encoding="utf-8") as file:
+                json.dump(accounts, file, indent=4)
+        else:
+            with open(json_filepath, "wb") as file:
+                file.write(orjson.dumps(accounts))
         print(f"\nAccounts saved to: {json_filepath}")
 
         if save_public:
@@ -80,6 +126,26 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="Save public keys to a separate .txt file",
     )
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Save accounts as newline-delimited JSON (.jsonl), one account per line",
+    )
+    output_format.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Save accounts as indented JSON (default: compact JSON)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help=(
+            "Number of processes used to derive addresses "
+            f"(default: CPU count for {PARALLEL_THRESHOLD}+ accounts, otherwise 1)"
+        ),
+    )
     return parser.parse_args(argv)
 
 
@@ -91,6 +157,9 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
         args.output_dir,
         args.prefix,
         args.save_public,
+        args.workers,
+        args.jsonl,
+        args.pretty,
     )
 
     if not args.no_print:
@@ -1,10 +1,54 @@
-from web3 import Web3
+from web3 import Web3, HTTPProvider
 import argparse
 import json
-from typing import List, Dict, Any
-from web3.types import TxData
+from typing import List, Dict, Any, Mapping
+from web3.types import TxData, RPCEndpoint, RPCResponse
+from eth_utils import to_hex
 from hexbytes import HexBytes
-from collections import Counter
+import ijson
+import orjson
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def _orjson_default(value: Any) -> Any:
+    """Serialize the web3 types orjson does not know about (HexBytes, AttributeDict)"""
+    if isinstance(value, (bytes, bytearray)):
+        return to_hex(value)
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class OrjsonHTTPProvider(HTTPProvider):
+    """HTTPProvider that encodes and decodes JSON-RPC payloads with orjson"""
+
+    def encode_rpc_request(self, method: RPCEndpoint, params: Any) -> bytes:
+        rpc_dict = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or [],
+            "id": next(self.request_counter),
+        }
+        try:
+            return orjson.dumps(rpc_dict, default=_orjson_default)
+        except TypeError:
+            # orjson rejects integers wider than 64 bits, fall back to the stdlib encoder
+            return json.dumps(rpc_dict, default=_orjson_default).encode()
+
+    @staticmethod
+    def decode_rpc_response(raw_response: bytes) -> RPCResponse:
+        return orjson.loads(raw_response)
+
+
+def create_http_session() -> requests.Session:
+    """Create a keep-alive session with a small connection pool for burst RPC calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
 
 
 def get_pending_pool_status(web3):
@@ -30,30 +74,51 @@ def get_pending_pool_status(web3):
         print(f"Error getting pool status: {str(e)}")
 
 
-def get_pending_pool_transactions(web3):
+def fetch_pending_transaction_types(web3, session=None):
+    """Stream eth_pendingTransactions and collect only the type of each transaction.
+
+    The response can be tens of MB on a busy node, so it is parsed incrementally
+    instead of being loaded as a whole. Returns None if the response has no result.
+    """
+    payload = {"jsonrpc": "2.0", "method": "eth_pendingTransactions", "params": [], "id": 1}
+    post = session.post if session else requests.post
+    tx_types = None
+    headers = {'Content-Type': 'application/json'}
+    with post(web3.provider.endpoint_uri, data=orjson.dumps(payload), headers=headers,
+              stream=True, timeout=30) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        for prefix, event, value in ijson.parse(response.raw):
+            if prefix == 'result' and event == 'start_array':
+                tx_types = []
+            elif prefix == 'result.item' and event == 'start_map':
+                tx_type = '0x0'  # Default to '0x0' for legacy transactions
+            elif prefix == 'result.item.type':
+                tx_type = value
+            elif prefix == 'result.item' and event == 'end_map':
+                tx_types.append(tx_type)
+    return tx_types
+
+
+def get_pending_pool_transactions(web3, session=None):
     """Get all pending transactions from the pool and count them by type."""
     try:
-        # Make direct JSON-RPC call to get pending transactions
-        response = web3.provider.make_request("eth_pendingTransactions", [])
+        tx_types = fetch_pending_transaction_types(web3, session)
         
-        if 'result' not in response:
+        if tx_types is None:
             print("Error: No 'result' field in response")
             return
-            
-        transactions = response['result']
         
         # Count transactions by type
-        type_counter = Counter()
-        for tx in transactions:
-            tx_type = tx.get('type', '0x0')  # Default to '0x0' for legacy transactions
-            type_counter[tx_type] += 1
+        tx_types = pd.Series(tx_types, dtype=object)
+        type_counts = tx_types.value_counts().sort_index()
             
         # Print results
         print("\nPending transactions by type:")
-        total_txs = sum(type_counter.values())
+        total_txs = len(tx_types)
         print(f"Total pending transactions: {total_txs}")
         
-        for tx_type, count in sorted(type_counter.items()):
+        for tx_type, count in type_counts.items():
             type_name = {
                 '0x0': 'Legacy',
                 '0x1': 'Access List',
@@ -68,41 +133,58 @@ def get_pending_pool_transactions(web3):
         print(f"Error getting pending pool transactions: {str(e)}")
 
 
+def print_pending_transactions(txs, source):
+    """Print nonce and hash for each raw JSON-RPC pending transaction."""
+    print(f"Pending transactions found in {source}: {len(txs)}")
+    for tx in txs:
+        nonce = int(tx['nonce'], 16) if 'nonce' in tx else 'N/A'
+        print(f"Pending tx: nonce={nonce}, hash={tx.get('hash', 'N/A')}")
+
+
+def get_pending_block_transactions(web3, address):
+    """Scan the full pending block for transactions sent from the address."""
+    response = web3.provider.make_request("eth_getBlockByNumber", ["pending", True])
+    if 'error' in response:
+        raise ValueError(response['error'])
+    
+    pending_block = response.get('result') or {}
+    address_lower = address.lower()
+    return [tx for tx in pending_block.get('transactions', [])
+            if isinstance(tx, dict) and tx.get('from', '').lower() == address_lower]
+
+
 def get_transaction_counts(web3, address):
-    """Get detailed transaction counts using different methods."""
+    """Get detailed transaction counts using a single JSON-RPC batch request."""
     try:
-        # Direct JSON-RPC calls for more detailed information
-        latest = web3.eth.get_transaction_count(address, 'latest')
-        pending = web3.eth.get_transaction_count(address, 'pending')
+        responses = web3.provider.make_batch_request([
+            ("eth_getTransactionCount", [address, "latest"]),
+            ("eth_getTransactionCount", [address, "pending"]),
+            ("txpool_contentFrom", [address]),
+        ])
+        if not isinstance(responses, list):
+            raise ValueError(f"Batch request failed: {responses.get('error')}")
+        latest_response, pending_response, txpool_response = responses
         
-        # Try direct eth_getTransactionCount calls
-        latest_direct = web3.provider.make_request("eth_getTransactionCount", [address, "latest"])
-        pending_direct = web3.provider.make_request("eth_getTransactionCount", [address, "pending"])
+        latest = int(latest_response['result'], 16) if 'result' in latest_response else None
+        pending = int(pending_response['result'], 16) if 'result' in pending_response else None
         
         print("\nTransaction count details:")
-        print(f"Latest (standard): {latest}")
-        print(f"Pending (standard): {pending}")
-        print(f"Latest (direct): {int(latest_direct['result'], 16) if 'result' in latest_direct else 'N/A'}")
-        print(f"Pending (direct): {int(pending_direct['result'], 16) if 'result' in pending_direct else 'N/A'}")
+        print(f"Latest: {latest if latest is not None else 'N/A'}")
+        print(f"Pending: {pending if pending is not None else 'N/A'}")
         
-        # Try to get pending transactions
-        try:
-            pending_block = web3.eth.get_block('pending', full_transactions=True)
-            if pending_block and 'transactions' in pending_block:
-                addr_pending_txs = [tx for tx in pending_block['transactions'] 
-                                  if isinstance(tx, dict) and tx.get('from', '').lower() == address.lower()]
-                print(f"Pending transactions found in block: {len(addr_pending_txs)}")
-                for tx in addr_pending_txs:
-                    print(f"Pending tx: nonce={tx.get('nonce', 'N/A')}, hash={tx.get('hash', 'N/A').hex()}")
-        except Exception as e:
-            print(f"Could not get pending block: {str(e)}")
+        # Try to get pending transactions, preferring the per-sender txpool view
+        txpool_content = txpool_response.get('result')
+        if txpool_content is not None:
+            print_pending_transactions(list(txpool_content.get('pending', {}).values()), "txpool")
+        else:
+            # Node does not support txpool_contentFrom, fall back to the pending block
+            try:
+                print_pending_transactions(get_pending_block_transactions(web3, address), "block")
+            except Exception as e:
+                print(f"Could not get pending block: {str(e)}")
         
         # Return the highest nonce we found plus 1
-        all_nonces = [latest, pending]
-        if 'result' in latest_direct:
-            all_nonces.append(int(latest_direct['result'], 16))
-        if 'result' in pending_direct:
-            all_nonces.append(int(pending_direct['result'], 16))
+        all_nonces = [nonce for nonce in (latest, pending) if nonce is not None]
         
         return max(all_nonces)
         
@@ -120,12 +202,17 @@ def main():
     
     args = parser.parse_args()
     
-    w3 = Web3(Web3.HTTPProvider(args.node_url))
+    session = create_http_session()
+    w3 = Web3(OrjsonHTTPProvider(
+        args.node_url,
+        session=session,
+        request_kwargs={'timeout': 30}
+    ))
     
     if args.status:
         get_pending_pool_status(w3)
     elif args.pool:
-        get_pending_pool_transactions(w3)
+        get_pending_pool_transactions(w3, session)
     elif args.address:
         get_transaction_counts(w3, args.address)
     else:
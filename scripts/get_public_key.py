@@ -1,17 +1,16 @@
-from web3 import Web3
-from eth_account import Account
+from coincurve import PublicKey
+from eth_utils import keccak, to_checksum_address, remove_0x_prefix
 import argparse
 
 def get_ethereum_address(private_key_hex):
-    # Add '0x' prefix if not present
-    if not private_key_hex.startswith('0x'):
-        private_key_hex = '0x' + private_key_hex
+    # Strip '0x' prefix if present
+    private_key = bytes.fromhex(remove_0x_prefix(private_key_hex))
         
-    # Create account from private key
-    account = Account.from_key(private_key_hex)
+    # Derive the uncompressed public key (without the 0x04 marker byte)
+    public_key = PublicKey.from_valid_secret(private_key).format(compressed=False)[1:]
     
-    # Get the Ethereum address (which is derived from the public key)
-    return account.address
+    # The Ethereum address is the last 20 bytes of the public key hash
+    return to_checksum_address(keccak(public_key)[-20:])
 
 
 def main() -> None:
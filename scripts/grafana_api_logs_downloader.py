@@ -2,13 +2,23 @@
 import argparse
 import json
 import logging
+import re
 import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, Iterable, List, Optional, Any, Union, Tuple
 import os
 from urllib.parse import urlparse
 
+import ijson
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from grafana_client import GrafanaApi # type: ignore
 
 # Configure logging
@@ -19,6 +29,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger("grafana-api-logs-downloader")
 
+# Loki query results are reused for this many seconds
+QUERY_CACHE_TTL = 60
+QUERY_CACHE_SIZE = 128
+
+# LogQL cleanup when no $instance value is given, and the dashboard UID in a /d/<uid>/... path
+_INSTANCE_LABEL_RE = re.compile(r'instance="\$instance",?\s*')
+_EMPTY_FILTER_RE = re.compile(r'\|=\s*``')
+_DASHBOARD_UID_RE = re.compile(r'/*d/([^/]+)')
+
+# Queries spanning more than this are split into parallel time windows
+SPLIT_QUERY_THRESHOLD = timedelta(hours=1)
+
+# Relative time arguments such as 30s, 15m, 1h or 7d
+_RELATIVE_TIME_RE = re.compile(r'^(\d+)([smhd])$')
+_RELATIVE_TIME_UNITS = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days'}
+
+# Formats supported by _save_logs
+SAVE_FORMATS = ("json", "jsonl", "txt")
+
+# Write buffer for saved log files
+SAVE_BUFFER_SIZE = 1 << 20
+
+@dataclass(slots=True)
+class LogEntry:
+    """A single Loki log line; entries of one stream share the same labels dict"""
+    timestamp: int
+    iso: str
+    labels: Dict[str, str]
+    log: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dict layout used in saved JSON output"""
+        return {
+            'timestamp': str(self.timestamp),
+            'datetime': self.iso,
+            'labels': self.labels,
+            'log': self.log
+        }
+
+
+def ns_to_iso(ts_array: np.ndarray) -> List[str]:
+    """Convert an int64 array of Unix nanosecond timestamps to UTC ISO strings in one pass
+    
+    The integer nanoseconds are formatted as-is (e.g. 2023-11-14T22:13:20.123456789Z),
+    so no precision is lost to a float round-trip.
+    """
+    return np.datetime_as_string(ts_array.astype('datetime64[ns]'), unit='ns', timezone='UTC').tolist()
+
+
+def _close_response(future: Future) -> None:
+    """Close the response of a finished request future, if it produced one"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
 class GrafanaApiLogDownloader:
     def __init__(
         self,
@@ -62,6 +127,29 @@ class GrafanaApiLogDownloader:
             organization_id=organization_id
         )
         
+        # Shared keep-alive session for the direct Loki requests
+        self._session = requests.Session()
+        self._session.verify = verify_ssl
+        self._session.headers['Accept-Encoding'] = 'gzip, deflate'
+        # Same credentials as the API client, the direct Loki proxy needs them too
+        if api_key:
+            self._session.headers['Authorization'] = f'Bearer {api_key}'
+        elif username and password:
+            self._session.auth = (username, password)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
+        # Data sources keyed by UID, loaded on first use
+        self._datasources: Optional[Dict[str, Dict]] = None
+        
+        # Recent query results: cache key -> (monotonic time, logs)
+        self._query_cache: OrderedDict = OrderedDict()
+        
         logger.info(f"Initialized Grafana API client for {grafana_url}")
 
     def check_connection(self) -> bool:
@@ -83,10 +171,16 @@ class GrafanaApiLogDownloader:
         """Get details for a specific data source by UID"""
         return self.client.datasource.get_by_uid(uid)
 
+    def _datasource_index(self, refresh: bool = False) -> Dict[str, Dict]:
+        """Get all data sources keyed by UID, fetched once and reused until refreshed"""
+        if self._datasources is None or refresh:
+            self._datasources = {ds['uid']: ds for ds in self.client.datasource.list_datasources()}
+        return self._datasources
+
     def get_datasource_id_from_uid(self, uid: str) -> Union[int, str]:
         """Get the numeric ID of a datasource from its UID"""
         try:
-            datasource = self.get_datasource_by_uid(uid)
+            datasource = self._datasource_index().get(uid) or self.get_datasource_by_uid(uid)
             datasource_id = datasource.get("id")
             if datasource_id is None:
                 raise ValueError(f"Datasource with UID {uid} does not have an ID")
@@ -109,11 +203,9 @@ class GrafanaApiLogDownloader:
         """Extract dashboard UID from a Grafana dashboard URL"""
         # Example URL: http://170.187.154.203:8084/d/service_logs_dashboard/services-logs?orgId=1
         # We need to extract 'service_logs_dashboard'
-        parsed_url = urlparse(dashboard_url)
-        path_parts = parsed_url.path.strip('/').split('/')
-        
-        if len(path_parts) >= 2 and path_parts[0] == 'd':
-            return path_parts[1]
+        match = _DASHBOARD_UID_RE.match(urlparse(dashboard_url).path)
+        if match:
+            return match.group(1)
         
         raise ValueError(f"Could not extract dashboard UID from URL: {dashboard_url}")
         
@@ -140,6 +232,25 @@ class GrafanaApiLogDownloader:
         panels = self.get_panels_from_dashboard(dashboard)
         return [panel for panel in panels if panel.get("type") == "logs"]
 
+    def _prepare_query(self, query: str, instance_value: str = "") -> str:
+        """Substitute $instance in a LogQL query and drop empty filter expressions"""
+        # Replace variables with user-provided values
+        if '$instance' in query:
+            if instance_value:
+                query = query.replace('$instance', instance_value)
+            else:
+                # If instance_value is empty, remove the instance label completely
+                query = _INSTANCE_LABEL_RE.sub('', query)
+        
+        # Clean up any empty filter expressions
+        query = _EMPTY_FILTER_RE.sub('', query)
+            
+        # Trim any extra whitespace
+        query = query.strip()
+        
+        logger.info(f"Prepared query: {query}")
+        return query
+
     def query_loki_datasource(
         self,
         datasource_uid: str,
@@ -148,8 +259,9 @@ class GrafanaApiLogDownloader:
         end_time: datetime,
         limit: int = 1000,
         direction: str = "BACKWARD",
-        instance_value: str = ""
-    ) -> List[Dict]:
+        instance_value: str = "",
+        concurrency: int = 1
+    ) -> List[LogEntry]:
         """
         Query Loki logs through Grafana API
         
@@ -161,28 +273,81 @@ class GrafanaApiLogDownloader:
             limit: Maximum number of log lines to retrieve
             direction: Query direction, either "BACKWARD" or "FORWARD"
             instance_value: Value to replace $instance variable in query
+            concurrency: Number of parallel sub-queries used for ranges longer than an hour
             
         Returns:
             List of log entries
         """
-        # Replace variables with user-provided values
-        if '$instance' in query:
-            if instance_value:
-                query = query.replace('$instance', instance_value)
-            else:
-                # If instance_value is empty, remove the instance label completely
-                query = query.replace('instance="$instance", ', '')
-                query = query.replace('instance="$instance"', '')
+        query = self._prepare_query(query, instance_value)
         
-        # Clean up any empty filter expressions
-        if '|= ``' in query:
-            query = query.replace('|= ``', '')
-            
-        # Trim any extra whitespace
-        query = query.strip()
+        # Repeat queries (e.g. several panels on the same dashboard) are served from the
+        # cache; times are snapped to the minute so near-identical ranges share an entry
+        cache_key = (
+            datasource_uid,
+            query,
+            int(start_time.timestamp()) // 60,
+            int(end_time.timestamp()) // 60,
+            limit,
+            direction
+        )
+        cached = self._query_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < QUERY_CACHE_TTL:
+            logger.info("Using cached result for query")
+            self._query_cache.move_to_end(cache_key)
+            return list(cached[1])
         
-        logger.info(f"Prepared query: {query}")
+        # Long ranges are split into windows fetched in parallel, which also keeps each
+        # request clear of Loki's query timeout
+        windows = [(start_time, end_time)]
+        if end_time - start_time > SPLIT_QUERY_THRESHOLD:
+            windows = split_time_range(start_time, end_time, concurrency)
+        
+        if len(windows) > 1:
+            logs = self._query_loki_windows(datasource_uid, query, windows, limit, direction)
+        else:
+            logs = self._query_loki(datasource_uid, query, start_time, end_time, limit, direction)
         
+        # Only cache successful non-empty results
+        if logs:
+            self._query_cache[cache_key] = (time.monotonic(), logs)
+            self._query_cache.move_to_end(cache_key)
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return list(logs)
+    
+    def _query_loki_windows(
+        self,
+        datasource_uid: str,
+        query: str,
+        windows: List[Tuple[datetime, datetime]],
+        limit: int,
+        direction: str
+    ) -> List[LogEntry]:
+        """Run a prepared LogQL query over consecutive time windows in parallel and merge the results"""
+        logger.info(f"Splitting query into {len(windows)} time windows")
+        with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+            parts = list(executor.map(
+                lambda window: self._query_loki(datasource_uid, query, window[0], window[1], limit, direction),
+                windows
+            ))
+        
+        # Windows don't overlap and each part is already sorted, so concatenating them in
+        # query direction keeps the order; every window used the full limit, so cutting the
+        # merged list keeps exactly the lines a single query would have returned
+        if direction == "BACKWARD":
+            parts.reverse()
+        return [entry for part in parts for entry in part][:limit]
+    
+    def _query_loki(
+        self,
+        datasource_uid: str,
+        query: str,
+        start_time: datetime,
+        end_time: datetime,
+        limit: int,
+        direction: str
+    ) -> List[LogEntry]:
+        """Run a prepared LogQL query, falling back to direct HTTP requests"""
         # Convert timestamps to seconds for Loki
         start_sec = int(start_time.timestamp())
         end_sec = int(end_time.timestamp())
@@ -222,19 +387,10 @@ class GrafanaApiLogDownloader:
             # Process the response
             logs = []
             if "data" in response and "result" in response["data"]:
-                for stream in response["data"]["result"]:
-                    stream_labels = stream.get("stream", {})
-                    for entry in stream.get("values", []):
-                        timestamp, log_line = entry
-                        logs.append({
-                            "timestamp": timestamp,
-                            "datetime": datetime.fromtimestamp(float(timestamp) / 1e9).isoformat(),
-                            "labels": stream_labels,
-                            "log": log_line
-                        })
-                
-                # Sort logs by timestamp
-                logs.sort(key=lambda x: x["timestamp"], reverse=(direction == "BACKWARD"))
+                logs = self._build_log_entries(
+                    response["data"]["result"],
+                    newest_first=(direction == "BACKWARD")
+                )
                 
             return logs
             
@@ -262,19 +418,34 @@ class GrafanaApiLogDownloader:
         end_time: datetime,
         limit: int = 1000,
         direction: str = "BACKWARD"
-    ) -> List[Dict]:
+    ) -> List[LogEntry]:
         """
         Fallback method to query Loki directly using HTTP requests
         """
-        # Try to get the datasource URL from Grafana
+        with self._open_loki_direct(datasource_uid, query, start_time, end_time, limit, direction) as response:
+            return self._process_loki_response_stream(response.raw, newest_first=(direction == "BACKWARD"))
+    
+    def _open_loki_direct(
+        self,
+        datasource_uid: str,
+        query: str,
+        start_time: datetime,
+        end_time: datetime,
+        limit: int = 1000,
+        direction: str = "BACKWARD"
+    ) -> requests.Response:
+        """
+        Open a streamed query_range response directly from Loki, trying every known endpoint
+        """
+        # Try to get the datasource URL and ID from Grafana
         datasource_url = None
+        datasource_id = None
         try:
-            datasources = self.client.datasource.list_datasources()
-            for ds in datasources:
-                if ds['uid'] == datasource_uid:
-                    datasource_url = ds['url'].rstrip('/')
-                    logger.info(f"Found datasource URL: {datasource_url}")
-                    break
+            ds = self._datasource_index().get(datasource_uid)
+            if ds is not None:
+                datasource_id = ds['id']
+                datasource_url = ds['url'].rstrip('/')
+                logger.info(f"Found datasource URL: {datasource_url}")
         except Exception as e:
             logger.warning(f"Could not get datasource URL: {str(e)}")
         
@@ -300,96 +471,184 @@ class GrafanaApiLogDownloader:
         
         # Try multiple approaches to connect to Loki
         errors = []
+        candidates = []
         
-        # We'll try the Grafana proxy first as it's more likely to work
+        # The Grafana proxy is the most likely to work
         try:
-            # Get datasource ID from UID
-            datasources = self.client.datasource.list_datasources()
-            datasource_id = None
-            for ds in datasources:
-                if ds['uid'] == datasource_uid:
-                    datasource_id = ds['id']
-                    break
-            
             if datasource_id is None:
                 raise ValueError(f"Could not find datasource ID for UID {datasource_uid}")
             
             proxy_url = f"{self.grafana_url}/api/datasources/proxy/{datasource_id}/loki/api/v1/query_range"
             logger.info(f"Trying Grafana proxy URL with ID: {proxy_url}")
-            
-            response = requests.get(
-                proxy_url,
-                params=params,
-                timeout=15  # Increased timeout
-            )
-            response.raise_for_status()
-            return self._process_loki_response(response.json())
+            candidates.append(("Grafana proxy", proxy_url))
         except Exception as e:
             error_msg = f"Error with Grafana proxy: {str(e)}"
             logger.warning(error_msg)
             errors.append(error_msg)
         
-        # If proxy fails, try direct URL from datasource
-        try:
-            loki_query_url = f"{datasource_url}/loki/api/v1/query_range"
-            logger.info(f"Trying direct URL: {loki_query_url}")
-            response = requests.get(
-                loki_query_url,
-                params=params,
-                timeout=15  # Increased timeout
-            )
-            response.raise_for_status()
-            return self._process_loki_response(response.json())
-        except Exception as e:
-            error_msg = f"Error with direct URL: {str(e)}"
-            logger.warning(error_msg)
-            errors.append(error_msg)
+        # Direct URL from datasource
+        loki_query_url = f"{datasource_url}/loki/api/v1/query_range"
+        logger.info(f"Trying direct URL: {loki_query_url}")
+        candidates.append(("direct URL", loki_query_url))
+        
+        # Loki on the same host as Grafana
+        parsed_url = urlparse(self.grafana_url)
+        loki_url = f"{parsed_url.scheme}://{parsed_url.netloc.split(':')[0]}:3100/loki/api/v1/query_range"
+        logger.info(f"Trying Loki on same host: {loki_url}")
+        candidates.append(("Loki on same host", loki_url))
         
-        # Try Loki on the same host as Grafana
+        # The attempts are independent, so race them and keep the first one that answers
+        executor = ThreadPoolExecutor(max_workers=len(candidates))
         try:
-            # Extract host from Grafana URL
-            parsed_url = urlparse(self.grafana_url)
-            loki_url = f"{parsed_url.scheme}://{parsed_url.netloc.split(':')[0]}:3100/loki/api/v1/query_range"
-            logger.info(f"Trying Loki on same host: {loki_url}")
-            
-            response = requests.get(
-                loki_url,
-                params=params,
-                timeout=15  # Increased timeout
-            )
-            response.raise_for_status()
-            return self._process_loki_response(response.json())
-        except Exception as e:
-            error_msg = f"Error with Loki on same host: {str(e)}"
-            logger.warning(error_msg)
-            errors.append(error_msg)
+            futures = {
+                executor.submit(self._open_loki_response, url, params): label
+                for label, url in candidates
+            }
+            for future in as_completed(futures):
+                try:
+                    response = future.result()
+                except Exception as e:
+                    error_msg = f"Error with {futures[future]}: {str(e)}"
+                    logger.warning(error_msg)
+                    errors.append(error_msg)
+                    continue
+                logger.info(f"Got logs via {futures[future]}")
+                # Release the connections of any slower attempt that also succeeds
+                for other in futures:
+                    if other is not future:
+                        other.add_done_callback(_close_response)
+                return response
+        finally:
+            # Don't wait for slower attempts once we have an answer
+            executor.shutdown(wait=False, cancel_futures=True)
         
         # If all approaches fail, raise an exception
         raise RuntimeError(f"All approaches to connect to Loki failed: {errors}")
     
-    def _process_loki_response(self, response_data: Dict) -> List[Dict]:
+    def _open_loki_response(self, url: str, params: Dict) -> requests.Response:
+        """Send a query_range request and return the response with its body still unread"""
+        response = self._session.get(url, params=params, timeout=15, stream=True)
+        try:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            if 'json' not in content_type:
+                raise ValueError(f"Unexpected content type: {content_type}")
+        except Exception:
+            response.close()
+            raise
+        response.raw.decode_content = True
+        return response
+
+    def _process_loki_response(self, response_data: Dict) -> List[LogEntry]:
         """Process Loki response data into a list of log entries."""
         if 'data' not in response_data or 'result' not in response_data['data']:
             logger.error(f"Unexpected response format: {response_data}")
             return []
         
-        log_entries = []
+        return self._build_log_entries(response_data['data']['result'])
+
+    def _process_loki_response_stream(self, raw: Any, newest_first: bool = True) -> List[LogEntry]:
+        """Process a raw Loki response stream without decoding the whole document at once.
+
+        Streams are yielded one by one by ijson, so only a single stream's values are
+        held as parsed JSON at any time.
+        """
+        return self._build_log_entries(ijson.items(raw, 'data.result.item'), newest_first)
+
+    def _build_log_entries(self, streams: Iterable[Dict], newest_first: bool = True) -> List[LogEntry]:
+        """Flatten Loki streams into log entries sorted by timestamp (newest first by default)."""
+        labels_pool = []
+        label_ids: List[int] = []
+        log_lines: List[str] = []
+        ts_parts = []
+        
+        for stream in streams:
+            values = stream.get('values', [])
+            if not values:
+                continue
+            
+            ts_parts.append(np.array([entry[0] for entry in values]).astype('int64'))
+            label_ids.extend([len(labels_pool)] * len(values))
+            labels_pool.append(stream.get('stream', {}))
+            log_lines.extend(entry[1] for entry in values)
         
-        for stream in response_data['data']['result']:
-            labels = stream.get('stream', {})
-            for entry in stream.get('values', []):
-                timestamp, log_line = entry
-                log_entries.append({
-                    'timestamp': timestamp,
-                    'datetime': datetime.fromtimestamp(float(timestamp) / 1e9).isoformat(),
-                    'labels': labels,
-                    'log': log_line
-                })
+        if not log_lines:
+            return []
+        
+        # Sort the integer timestamps once and only then build the entries in order
+        ts_array = np.concatenate(ts_parts)
+        order = np.argsort(-ts_array if newest_first else ts_array, kind='stable')
+        sorted_ts = ts_array[order]
+        
+        return [
+            LogEntry(timestamp, iso_time, labels_pool[label_ids[i]], log_lines[i])
+            for i, timestamp, iso_time in zip(order.tolist(), sorted_ts.tolist(), ns_to_iso(sorted_ts))
+        ]
+
+    def _save_logs_streaming(self, raw: Any, output_file: str) -> int:
+        """Write a raw Loki response stream to a JSON Lines file, one entry per line
         
-        # Sort by timestamp (newest first)
-        log_entries.sort(key=lambda x: x['timestamp'], reverse=True)
+        Entries are written in the order Loki returns them (grouped by stream) and the
+        response is never held in memory as a whole.
         
-        return log_entries
+        Returns:
+            Number of log entries written
+        """
+        count = 0
+        with open(output_file, "wb", buffering=SAVE_BUFFER_SIZE) as f:
+            for stream in ijson.items(raw, 'data.result.item'):
+                labels = stream.get('stream', {})
+                values = stream.get('values', [])
+                if not values:
+                    continue
+                timestamps = [entry[0] for entry in values]
+                iso_times = ns_to_iso(np.array(timestamps).astype('int64'))
+                for timestamp, iso_time, entry in zip(timestamps, iso_times, values):
+                    f.write(orjson.dumps({
+                        'timestamp': timestamp,
+                        'datetime': iso_time,
+                        'labels': labels,
+                        'log': entry[1]
+                    }, option=orjson.OPT_APPEND_NEWLINE))
+                count += len(values)
+        
+        logger.info(f"Saved {count} log entries to {output_file}")
+        return count
+
+    def download_logs_to_jsonl(
+        self,
+        datasource_uid: str,
+        query: str,
+        start_time: datetime,
+        end_time: datetime,
+        output_file: str,
+        limit: int = 1000,
+        direction: str = "BACKWARD",
+        instance_value: str = ""
+    ) -> int:
+        """
+        Stream Loki logs straight into a JSON Lines file without building them in memory
+        
+        Entries are written stream by stream in the order Loki returns them, not sorted by
+        timestamp across streams like the other formats, and the range is fetched in one
+        query rather than split into --concurrency windows.
+        
+        Args:
+            datasource_uid: UID of the Loki datasource
+            query: LogQL query
+            start_time: Start time for the query
+            end_time: End time for the query
+            output_file: File to write the logs to
+            limit: Maximum number of log lines to retrieve
+            direction: Query direction, either "BACKWARD" or "FORWARD"
+            instance_value: Value to replace $instance variable in query
+            
+        Returns:
+            Number of log entries written
+        """
+        query = self._prepare_query(query, instance_value)
+        with self._open_loki_direct(datasource_uid, query, start_time, end_time, limit, direction) as response:
+            return self._save_logs_streaming(response.raw, output_file)
 
     def download_logs_from_panel(
         self, 
@@ -400,8 +659,10 @@ class GrafanaApiLogDownloader:
         format: str = "json",
         instance_value: str = "",
         limit: int = 1000,
-        direction: str = "BACKWARD"
-    ) -> List[Dict]:
+        direction: str = "BACKWARD",
+        flat_output: bool = False,
+        concurrency: int = 1
+    ) -> List[LogEntry]:
         """
         Download logs using a panel configuration
         
@@ -410,14 +671,20 @@ class GrafanaApiLogDownloader:
             start_time: Start time (defaults to 1 hour ago)
             end_time: End time (defaults to now)
             output_file: File to save logs to
-            format: Output format (json or txt)
+            format: Output format (json, jsonl or txt)
             instance_value: Value to replace $instance variable in query
             limit: Maximum number of log lines to retrieve
             direction: Query direction (BACKWARD or FORWARD)
+            flat_output: Save JSON as a flat list of entries instead of grouping by stream
+            concurrency: Number of parallel sub-queries used for ranges longer than an hour
             
         Returns:
-            List of log entries
+            List of log entries (empty when streamed straight to a jsonl file)
         """
+        # Fail before the download rather than after it
+        if output_file:
+            check_output_file(output_file, format)
+        
         if not start_time:
             start_time = datetime.now() - timedelta(hours=1)
         if not end_time:
@@ -465,6 +732,21 @@ class GrafanaApiLogDownloader:
         logger.info(f"Extracted datasource UID: {datasource_uid}")
         logger.info(f"Extracted query: {expr}")
         
+        # Large jsonl downloads go straight to disk
+        if output_file and format.lower() == "jsonl":
+            count = self.download_logs_to_jsonl(
+                datasource_uid=datasource_uid,
+                query=expr,
+                start_time=start_time,
+                end_time=end_time,
+                output_file=output_file,
+                instance_value=instance_value,
+                limit=limit,
+                direction=direction
+            )
+            logger.info(f"Streamed {count} log entries to {output_file}")
+            return []
+        
         # Get logs
         logs = self.query_loki_datasource(
             datasource_uid=datasource_uid,
@@ -473,29 +755,112 @@ class GrafanaApiLogDownloader:
             end_time=end_time,
             instance_value=instance_value,
             limit=limit,
-            direction=direction
+            direction=direction,
+            concurrency=concurrency
         )
         
         # Save logs if output file is specified
         if output_file and logs:
-            self._save_logs(logs, output_file, format)
+            self._save_logs(logs, output_file, format, flat_output)
             
         return logs
         
-    def _save_logs(self, logs: List[Dict], output_file: str, format: str = "json"):
+    def _group_logs_by_stream(self, logs: List[LogEntry]) -> Dict:
+        """Group log entries by their labels so each stream's labels are written once"""
+        streams: Dict[int, Dict] = {}
+        for log in logs:
+            # Entries of one stream share the same labels object
+            stream = streams.get(id(log.labels))
+            if stream is None:
+                stream = streams[id(log.labels)] = {"labels": log.labels, "entries": []}
+            stream["entries"].append([str(log.timestamp), log.iso, log.log])
+        return {"streams": list(streams.values())}
+        
+    def _save_logs(self, logs: List[LogEntry], output_file: str, format: str = "json", flat_output: bool = False):
         """Save logs to a file"""
         if format.lower() == "json":
-            with open(output_file, "w") as f:
-                json.dump(logs, f, indent=2)
+            data = [log.to_dict() for log in logs] if flat_output else self._group_logs_by_stream(logs)
+            with open(output_file, "wb", buffering=SAVE_BUFFER_SIZE) as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        elif format.lower() == "jsonl":
+            with open(output_file, "wb", buffering=SAVE_BUFFER_SIZE) as f:
+                f.write(b"".join(orjson.dumps(log.to_dict(), option=orjson.OPT_APPEND_NEWLINE) for log in logs))
         elif format.lower() == "txt":
-            with open(output_file, "w") as f:
-                for log in logs:
-                    f.write(f"{log['datetime']} | {log['log']}\n")
+            with open(output_file, "w", buffering=SAVE_BUFFER_SIZE) as f:
+                f.write("".join(f"{log.iso} | {log.log}\n" for log in logs))
         else:
             raise ValueError(f"Unsupported format: {format}")
             
         logger.info(f"Saved {len(logs)} log entries to {output_file}")
 
+def check_output_file(output_file: str, format: str) -> None:
+    """Raise ValueError if logs can't be saved to output_file in the given format"""
+    if format.lower() not in SAVE_FORMATS:
+        raise ValueError(f"Unsupported format: {format}")
+    output_dir = os.path.dirname(output_file) or '.'
+    if not os.path.isdir(output_dir) or not os.access(output_dir, os.W_OK):
+        raise ValueError(f"Output directory is not writable: {output_dir}")
+    if os.path.exists(output_file) and not os.access(output_file, os.W_OK):
+        raise ValueError(f"Output file is not writable: {output_file}")
+
+
+def split_time_range(start_time: datetime, end_time: datetime, parts: int) -> List[Tuple[datetime, datetime]]:
+    """Split [start_time, end_time] into up to `parts` consecutive windows of equal length"""
+    parts = max(1, parts)
+    step = (end_time - start_time) / parts
+    bounds = [start_time + step * i for i in range(parts)] + [end_time]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def parse_time(value: str, now: datetime) -> datetime:
+    """Parse an ISO timestamp or a relative time like '15m' / '1h' (meaning that long before now)"""
+    match = _RELATIVE_TIME_RE.match(value)
+    if match:
+        return now - timedelta(**{_RELATIVE_TIME_UNITS[match[2]]: int(match[1])})
+    return datetime.fromisoformat(value)
+
+
+def panel_output_file(output_file: Optional[str], panel_index: int) -> Optional[str]:
+    """Derive a per-panel output file name, e.g. logs.json -> logs_panel2.json"""
+    if not output_file:
+        return None
+    root, ext = os.path.splitext(output_file)
+    return f"{root}_panel{panel_index}{ext}"
+
+
+def download_panels_concurrently(
+    downloader: GrafanaApiLogDownloader,
+    jobs: List[Tuple[Dict, Optional[str]]],
+    max_workers: int = 10,
+    **kwargs: Any
+) -> int:
+    """Download several panels in parallel, returning the total number of log entries
+    
+    Args:
+        downloader: Downloader shared by all panels
+        jobs: (panel configuration, output file) pairs
+        max_workers: Maximum number of panels queried at once
+        **kwargs: Passed through to download_logs_from_panel
+    """
+    total = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as executor:
+        futures = {
+            executor.submit(
+                downloader.download_logs_from_panel,
+                panel_config=panel_config,
+                output_file=output_file,
+                **kwargs
+            ): panel_config.get('title', 'Unnamed panel')
+            for panel_config, output_file in jobs
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            logs = future.result()
+            total += len(logs)
+            logger.info(f"[{done}/{len(jobs)}] Downloaded {len(logs)} log entries from panel: {futures[future]}")
+    
+    logger.info(f"Downloaded {total} log entries from {len(jobs)} panels")
+    return total
+
 
 def main():
     parser = argparse.ArgumentParser(description="Download logs from Grafana Loki using the official Grafana API")
@@ -509,9 +874,16 @@ def main():
     )
     parser.add_argument(
         "--panel-index",
+        default="0",
+        help="Index of the logs panel to use when using dashboard-url: a number, a comma-separated "
+             "list or 'all' (default: 0, first logs panel)"
+    )
+    parser.add_argument(
+        "--concurrency",
         type=int,
-        default=0,
-        help="Index of the logs panel to use when using dashboard-url (default: 0, first logs panel)"
+        default=10,
+        help="Maximum number of panels, or time windows of ranges longer than an hour, "
+             "queried in parallel (default: 10)"
     )
     parser.add_argument(
         "--api-key",
@@ -555,9 +927,16 @@ def main():
     )
     parser.add_argument(
         "--format",
-        choices=["json", "txt"],
+        choices=SAVE_FORMATS,
         default="json",
-        help="Output format (default: json)"
+        help="Output format (default: json); jsonl is streamed straight to the output file "
+             "in one query, grouped by stream instead of sorted by timestamp and without "
+             "--concurrency window splitting"
+    )
+    parser.add_argument(
+        "--flat-output",
+        action="store_true",
+        help="Write JSON as a flat list of entries instead of grouping them by stream labels"
     )
     parser.add_argument(
         "--instance",
@@ -600,59 +979,31 @@ def main():
         args.grafana_url = parts[0]
         logger.info(f"Extracted Grafana base URL: {args.grafana_url}")
 
-    # Process start and end times
+    # Validate the output target before spending time on the download
+    if args.output_file:
+        try:
+            check_output_file(args.output_file, args.format)
+        except ValueError as e:
+            parser.error(str(e))
+
+    # Process start and end times against a single "now" so relative times don't drift
     start_time = None
     end_time = None
+    now = datetime.now()
     
     if args.start_time:
-        # Handle relative time strings (e.g., "1h" for 1 hour ago)
-        if args.start_time.endswith(('s', 'm', 'h', 'd')):
-            unit = args.start_time[-1]
-            try:
-                value = int(args.start_time[:-1])
-                if unit == 's':
-                    start_time = datetime.now() - timedelta(seconds=value)
-                elif unit == 'm':
-                    start_time = datetime.now() - timedelta(minutes=value)
-                elif unit == 'h':
-                    start_time = datetime.now() - timedelta(hours=value)
-                elif unit == 'd':
-                    start_time = datetime.now() - timedelta(days=value)
-            except ValueError:
-                logger.error(f"Invalid relative time format: {args.start_time}")
-                sys.exit(1)
-        else:
-            # Try parsing as ISO format
-            try:
-                start_time = datetime.fromisoformat(args.start_time)
-            except ValueError:
-                logger.error(f"Invalid start time format: {args.start_time}")
-                sys.exit(1)
+        try:
+            start_time = parse_time(args.start_time, now)
+        except ValueError:
+            logger.error(f"Invalid start time format: {args.start_time}")
+            sys.exit(1)
     
     if args.end_time:
-        # Handle relative time strings similar to start_time
-        if args.end_time.endswith(('s', 'm', 'h', 'd')):
-            unit = args.end_time[-1]
-            try:
-                value = int(args.end_time[:-1])
-                if unit == 's':
-                    end_time = datetime.now() - timedelta(seconds=value)
-                elif unit == 'm':
-                    end_time = datetime.now() - timedelta(minutes=value)
-                elif unit == 'h':
-                    end_time = datetime.now() - timedelta(hours=value)
-                elif unit == 'd':
-                    end_time = datetime.now() - timedelta(days=value)
-            except ValueError:
-                logger.error(f"Invalid relative time format: {args.end_time}")
-                sys.exit(1)
-        else:
-            # Try parsing as ISO format
-            try:
-                end_time = datetime.fromisoformat(args.end_time)
-            except ValueError:
-                logger.error(f"Invalid end time format: {args.end_time}")
-                sys.exit(1)
+        try:
+            end_time = parse_time(args.end_time, now)
+        except ValueError:
+            logger.error(f"Invalid end time format: {args.end_time}")
+            sys.exit(1)
 
     # Initialize downloader
     downloader = GrafanaApiLogDownloader(
@@ -682,12 +1033,36 @@ def main():
                 logger.error("No logs panels found in the dashboard")
                 sys.exit(1)
                 
-            if args.panel_index >= len(logs_panels):
-                logger.error(f"Panel index {args.panel_index} out of range. Dashboard has {len(logs_panels)} logs panels.")
-                sys.exit(1)
+            if args.panel_index == "all":
+                panel_indices = list(range(len(logs_panels)))
+            else:
+                try:
+                    panel_indices = [int(index) for index in args.panel_index.split(',')]
+                except ValueError:
+                    logger.error(f"Invalid panel index: {args.panel_index}")
+                    sys.exit(1)
+            
+            for panel_index in panel_indices:
+                if not 0 <= panel_index < len(logs_panels):
+                    logger.error(f"Panel index {panel_index} out of range. Dashboard has {len(logs_panels)} logs panels.")
+                    sys.exit(1)
+            
+            if len(panel_indices) > 1:
+                download_panels_concurrently(
+                    downloader,
+                    [(logs_panels[index], panel_output_file(args.output_file, index)) for index in panel_indices],
+                    max_workers=args.concurrency,
+                    start_time=start_time,
+                    end_time=end_time,
+                    format=args.format,
+                    instance_value=args.instance or "",
+                    flat_output=args.flat_output,
+                    concurrency=args.concurrency
+                )
+                return
                 
             # Use the selected panel as our configuration
-            panel_config = logs_panels[args.panel_index]
+            panel_config = logs_panels[panel_indices[0]]
             logger.info(f"Using panel: {panel_config.get('title', 'Unnamed panel')}")
         
         # If panel file is provided, use that for configuration
@@ -720,10 +1095,25 @@ def main():
                 format=args.format,
                 instance_value=args.instance or "",
                 limit=1000,
-                direction="BACKWARD"
+                direction="BACKWARD",
+                flat_output=args.flat_output,
+                concurrency=args.concurrency
             )
             logger.info(f"Downloaded {len(logs)} log entries")
         # Otherwise, use direct query if datasource and query are provided
+        elif args.datasource_uid and args.query and args.output_file and args.format == "jsonl":
+            logger.info(f"Streaming direct query logs to {args.output_file}")
+            count = downloader.download_logs_to_jsonl(
+                datasource_uid=args.datasource_uid,
+                query=args.query,
+                start_time=start_time or (datetime.now() - timedelta(hours=1)),
+                end_time=end_time or datetime.now(),
+                output_file=args.output_file,
+                instance_value=args.instance or "",
+                limit=1000,
+                direction="BACKWARD"
+            )
+            logger.info(f"Downloaded {count} log entries")
         elif args.datasource_uid and args.query:
             logger.info(f"Using direct query to download logs")
             logs = downloader.query_loki_datasource(
@@ -733,11 +1123,12 @@ def main():
                 end_time=end_time or datetime.now(),
                 instance_value=args.instance or "",
                 limit=1000,
-                direction="BACKWARD"
+                direction="BACKWARD",
+                concurrency=args.concurrency
             )
             
             if args.output_file and logs:
-                downloader._save_logs(logs, args.output_file, args.format)
+                downloader._save_logs(logs, args.output_file, args.format, args.flat_output)
                 
             logger.info(f"Downloaded {len(logs)} log entries")
         else:
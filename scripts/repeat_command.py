@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 
 import argparse
+import importlib.util
+import os
+import random
 import subprocess
 import time
 import sys
@@ -8,41 +11,71 @@ import shlex
 import asyncio
 import signal
 import re
-from typing import List, Optional, Tuple
+from contextvars import ContextVar
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
 
-def parse_blob_tx_command(command: str) -> Tuple[Optional[str], Optional[str]]:
+# Flags extracted from send_blob_transactions.py commands for nonce replacement
+PRIVATE_KEY_RE = re.compile(r"--private-key\s+['\"]?(?:0x)?([a-fA-F0-9]{64})['\"]?", re.ASCII)
+RPC_URL_RE = re.compile(r"--rpc-url\s+['\"]?(https?://[^'\"\s]+)['\"]?", re.ASCII)
+# The same flag values, matched against single argv tokens
+PRIVATE_KEY_TOKEN_RE = re.compile(r"(?:0x)?([a-fA-F0-9]{64})", re.ASCII)
+RPC_URL_TOKEN_RE = re.compile(r"(https?://\S+)", re.ASCII)
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Web3 clients by RPC URL, reused for every nonce lookup
+_web3_clients: Dict[str, object] = {}
+
+# send_blob_transactions.py scripts loaded for in-process execution, by path
+_blob_tx_modules: Dict[str, ModuleType] = {}
+
+# Execution number of the in-process run printing on this thread, see TaggedStdout
+_output_tag: ContextVar[Optional[int]] = ContextVar("output_tag", default=None)
+
+# Commands and keys are only printed with --verbose
+_verbose = False
+
+def print_verbose(message: str) -> None:
+    """Print per-execution details, only with --verbose since they may include private keys."""
+    if _verbose:
+        print(message)
+
+def parse_blob_tx_command(command: str, argv: Optional[List[str]] = None) -> Tuple[Optional[str], Optional[str]]:
     """
     Parse a blob transaction command to extract private key and RPC URL.
+    If the command is already split into argv, the flag values are read from its tokens.
     Returns (private_key, rpc_url) if it's a blob transaction command, (None, None) otherwise.
     """
     if not "send_blob_transactions.py" in command:
         return None, None
     
-    # Clean up the command - remove newlines and extra spaces
-    command = ' '.join(command.replace('\n', ' ').split())
-    print(f"Parsing command: {command}")
-    
-    # Updated regex patterns to be more flexible
-    private_key_pattern = r"--private-key\s+['\"]?(?:0x)?([a-fA-F0-9]{64})['\"]?"
-    rpc_url_pattern = r"--rpc-url\s+['\"]?(https?://[^'\"\s]+)['\"]?"
-    
-    private_key_match = re.search(private_key_pattern, command)
-    rpc_url_match = re.search(rpc_url_pattern, command)
+    if argv is None:
+        # Clean up the command - remove newlines and extra spaces
+        command = WHITESPACE_RE.sub(' ', command).strip()
+        print_verbose(f"Parsing command: {command}")
+        private_key_match = PRIVATE_KEY_RE.search(command)
+        rpc_url_match = RPC_URL_RE.search(command)
+    else:
+        print_verbose(f"Parsing command: {argv}")
+        private_key_match = rpc_url_match = None
+        for flag, value in zip(argv, argv[1:]):
+            if flag == "--private-key":
+                private_key_match = PRIVATE_KEY_TOKEN_RE.fullmatch(value)
+            elif flag == "--rpc-url":
+                rpc_url_match = RPC_URL_TOKEN_RE.fullmatch(value)
     
     if private_key_match:
         private_key = '0x' + private_key_match.group(1)
-        print(f"Found private key: {private_key}")
+        print_verbose(f"Found private key: {private_key}")
     else:
-        print(f"Failed to extract private key. Pattern: {private_key_pattern}")
-        print(f"Command segment: {command[:100]}...")
+        print_verbose(f"Failed to extract private key from command: {command[:100]}...")
         return None, None
     
     if rpc_url_match:
         rpc_url = rpc_url_match.group(1)
-        print(f"Found RPC URL: {rpc_url}")
+        print_verbose(f"Found RPC URL: {rpc_url}")
     else:
-        print(f"Failed to extract RPC URL. Pattern: {rpc_url_pattern}")
-        print(f"Command segment: {command[:100]}...")
+        print_verbose(f"Failed to extract RPC URL from command: {command[:100]}...")
         return None, None
     
     return private_key, rpc_url
@@ -51,14 +84,120 @@ def get_current_nonce(private_key: str, rpc_url: str) -> int:
     """Get the current nonce for an account."""
     try:
         from web3 import Web3
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
+        w3 = _web3_clients.get(rpc_url)
+        if w3 is None:
+            w3 = _web3_clients[rpc_url] = Web3(Web3.HTTPProvider(rpc_url))
         account = w3.eth.account.from_key(private_key)
         return w3.eth.get_transaction_count(account.address, 'pending')
     except Exception as e:
         print(f"Error getting nonce: {e}")
         sys.exit(1)
 
-async def execute_command_async(command: str, execution_number: int, total_executions: int, max_retries: int = 3) -> None:
+def split_command(command: str) -> Optional[List[str]]:
+    """
+    Split a command into an argv list so it can be executed without a shell.
+    On Windows non-POSIX rules are used (with surrounding quotes removed); returns None
+    if the command can't be split there, in which case it is run through the shell.
+    """
+    if sys.platform != "win32":
+        return shlex.split(command)
+    try:
+        tokens = shlex.split(command, posix=False)
+    except ValueError:
+        return None
+    return [
+        token[1:-1] if len(token) >= 2 and token[0] == token[-1] and token[0] in "\"'" else token
+        for token in tokens
+    ]
+
+def get_in_process_blob_tx(argv: List[str]) -> Optional[Tuple[ModuleType, List[str]]]:
+    """
+    Load send_blob_transactions.py as a module when argv runs it with a Python interpreter,
+    so it can be called in-process instead of starting a new interpreter per execution.
+    Returns (module, script_args), or None if the command should run as a subprocess.
+    """
+    if len(argv) < 2 or not os.path.basename(argv[0]).startswith("python"):
+        return None
+    if os.path.basename(argv[1]) != "send_blob_transactions.py":
+        return None
+    
+    path = os.path.abspath(argv[1])
+    module = _blob_tx_modules.get(path)
+    if module is None:
+        try:
+            spec = importlib.util.spec_from_file_location("send_blob_transactions", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception as e:
+            print(f"Could not load {path} in-process, falling back to a subprocess: {e}")
+            return None
+        _blob_tx_modules[path] = module
+    return module, argv[2:]
+
+class TaggedStdout:
+    """
+    Wraps sys.stdout so lines printed by an in-process execution get the same [N] tag as
+    subprocess output. The tag comes from _output_tag, which asyncio.to_thread carries
+    over to the worker thread, so concurrent executions are tagged independently.
+    """
+    def __init__(self, stream):
+        self._stream = stream
+        # Unfinished line per execution number, print() writes the newline separately
+        self._partial: Dict[int, str] = {}
+
+    def write(self, text: str) -> int:
+        tag = _output_tag.get()
+        if tag is None:
+            return self._stream.write(text)
+        *lines, self._partial[tag] = (self._partial.get(tag, "") + text).split("\n")
+        for line in lines:
+            self._stream.write(f"[{tag}] {line}\n")
+        return len(text)
+
+    def finish(self, tag: int) -> None:
+        """Write out what is left of an execution's last line."""
+        line = self._partial.pop(tag, "")
+        if line:
+            self._stream.write(f"[{tag}] {line}\n")
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+async def run_in_process(module: ModuleType, script_args: List[str], execution_number: int) -> Tuple[int, str]:
+    """Run a loaded script's main() on a worker thread, returning (return code, error output)."""
+    if not isinstance(sys.stdout, TaggedStdout):
+        sys.stdout = TaggedStdout(sys.stdout)
+    tag = execution_number + 1
+    _output_tag.set(tag)
+    try:
+        await asyncio.to_thread(module.main, script_args)
+        return 0, ""
+    except SystemExit as e:
+        # sys.exit() and sys.exit(None) mean success, a message means failure
+        if e.code is None:
+            return 0, ""
+        if isinstance(e.code, int):
+            return e.code, ""
+        return 1, str(e.code)
+    except Exception as e:
+        return 1, str(e)
+    finally:
+        _output_tag.set(None)
+        sys.stdout.finish(tag)
+
+async def print_output_lines(stream: asyncio.StreamReader, execution_number: int) -> None:
+    """Print a subprocess output stream line by line, tagged with the execution number."""
+    async for line in stream:
+        print(f"[{execution_number + 1}] {line.decode().rstrip()}")
+
+async def execute_command_async(
+    command: str,
+    execution_number: int,
+    total_executions: int,
+    max_retries: int = 3,
+    refresh_command: Optional[Callable[[], str]] = None,
+    argv: Optional[List[str]] = None
+) -> None:
     """
     Execute a single command asynchronously.
     
@@ -67,35 +206,50 @@ async def execute_command_async(command: str, execution_number: int, total_execu
         execution_number (int): Current execution number
         total_executions (int): Total number of executions
         max_retries (int): Maximum number of retries for nonce errors
+        refresh_command (callable, optional): Rebuilds the command with a fresh nonce after a nonce error
+        argv (list, optional): The command already split into arguments
     """
+    if argv is None:
+        argv = split_command(command)
+    
     for attempt in range(max_retries):
-        print(f"\nStarting execution {execution_number + 1}/{total_executions} (attempt {attempt + 1}/{max_retries})")
-        print(f"Command: {command}")
+        print_verbose(f"\nStarting execution {execution_number + 1}/{total_executions} (attempt {attempt + 1}/{max_retries})")
+        print_verbose(f"Command: {command}")
         
         try:
-            if sys.platform == "win32":
-                process = await asyncio.create_subprocess_shell(
-                    command,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
+            in_process = get_in_process_blob_tx(argv) if argv else None
+            
+            if in_process:
+                # Blob transactions run in this process, reusing already imported modules
+                returncode, error_output = await run_in_process(*in_process, execution_number)
             else:
-                process = await asyncio.create_subprocess_exec(
-                    *shlex.split(command),
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
+                if argv is None:
+                    process = await asyncio.create_subprocess_shell(
+                        command,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE
+                    )
+                else:
+                    process = await asyncio.create_subprocess_exec(
+                        *argv,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE
+                    )
+                
+                # Print stdout line by line as it arrives instead of buffering all of it;
+                # stderr is kept whole since it is checked for nonce errors
+                _, stderr = await asyncio.gather(
+                    print_output_lines(process.stdout, execution_number),
+                    process.stderr.read()
                 )
+                returncode = await process.wait()
+                error_output = stderr.decode() if stderr else ""
             
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
+            if returncode == 0:
                 print(f"Execution {execution_number + 1} completed successfully")
-                if stdout:
-                    print(f"Output: {stdout.decode()}")
                 return  # Success, exit the retry loop
             else:
-                error_output = stderr.decode() if stderr else ""
-                print(f"Error in execution {execution_number + 1}. Return code: {process.returncode}")
+                print(f"Error in execution {execution_number + 1}. Return code: {returncode}")
                 if error_output:
                     print(f"Error output: {error_output}")
                 
@@ -103,7 +257,15 @@ async def execute_command_async(command: str, execution_number: int, total_execu
                 if "nonce too low" in error_output or "ALREADY_EXISTS" in error_output:
                     if attempt < max_retries - 1:
                         print("Nonce error detected, retrying with updated nonce...")
-                        await asyncio.sleep(1)  # Short delay before retry
+                        # Exponential backoff with jitter so concurrent retries don't collide again
+                        await asyncio.sleep(min(2 ** attempt, 8) * (0.5 + random.random()))
+                        if refresh_command:
+                            new_command = refresh_command()
+                            if new_command == command:
+                                print(f"Nonce for execution {execution_number + 1} is unchanged, not retrying")
+                                break
+                            command = new_command
+                            argv = split_command(command)
                         continue
                 break  # Exit loop for non-nonce errors or if max retries reached
                     
@@ -121,8 +283,11 @@ async def execute_commands_async(command: str, times: int, max_concurrent: int,
         max_concurrent (int): Maximum number of concurrent executions
         delay (float): Delay in seconds between starting each command
     """
+    # Split the command once; the nonce placeholder is substituted per token
+    base_argv = split_command(command)
+    
     # Check if this is a blob transaction command with {REPLACE} placeholder
-    private_key, rpc_url = parse_blob_tx_command(command)
+    private_key, rpc_url = parse_blob_tx_command(command, base_argv)
     
     if private_key and rpc_url and "{REPLACE}" in command:
         print("Using nonce replacement mode")
@@ -131,33 +296,60 @@ async def execute_commands_async(command: str, times: int, max_concurrent: int,
             print("Error: {REPLACE} found but couldn't extract private key and RPC URL from command")
             sys.exit(1)
     
-    # Create a semaphore to limit concurrent executions
-    semaphore = asyncio.Semaphore(max_concurrent)
+    # Fetch the nonce once and hand out consecutive nonces locally
+    base_nonce = None
+    if private_key and rpc_url and "{REPLACE}" in command:
+        base_nonce = get_current_nonce(private_key, rpc_url)
+        print(f"Starting from nonce {base_nonce}")
     
-    async def bounded_execute(cmd: str, execution_number: int, total_executions: int) -> None:
-        # Add delay before starting each command (except the first one)
-        if execution_number > 0:
-            print(f"Waiting {delay} seconds before starting execution {execution_number + 1}...")
-            await asyncio.sleep(delay)
-        
+    def with_fresh_nonce(cmd: str) -> str:
+        current_nonce = get_current_nonce(private_key, rpc_url)
+        print_verbose(f"Refetched nonce {current_nonce}")
+        return cmd.replace("{REPLACE}", str(current_nonce))
+    
+    async def run_execution(execution_number: int) -> None:
         # Replace nonce if needed
-        current_cmd = cmd
-        if private_key and rpc_url:
-            # Get fresh nonce for each transaction
-            current_nonce = get_current_nonce(private_key, rpc_url)
-            current_cmd = cmd.replace("{REPLACE}", str(current_nonce))
-            print(f"Using nonce {current_nonce} for execution {execution_number + 1}")
-            
-        async with semaphore:
-            await execute_command_async(current_cmd, execution_number, total_executions)
+        current_cmd = command
+        current_argv = base_argv
+        refresh_command = None
+        if base_nonce is not None:
+            current_nonce = str(base_nonce + execution_number)
+            current_cmd = command.replace("{REPLACE}", current_nonce)
+            if base_argv is not None:
+                current_argv = [token.replace("{REPLACE}", current_nonce) for token in base_argv]
+            refresh_command = lambda: with_fresh_nonce(command)
+            print_verbose(f"Using nonce {current_nonce} for execution {execution_number + 1}")
+        
+        await execute_command_async(
+            current_cmd,
+            execution_number,
+            times,
+            refresh_command=refresh_command,
+            argv=current_argv
+        )
     
-    # Create tasks sequentially to maintain delay between starts
-    tasks = []
-    for i in range(times):
-        task = asyncio.create_task(bounded_execute(command, i, times))
-        tasks.append(task)
+    # A fixed pool of workers pulls execution numbers from a shared iterator, so
+    # memory and scheduling cost depend on max_concurrent rather than on times
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    execution_numbers = iter(range(times))
+    
+    async def worker() -> None:
+        for execution_number in execution_numbers:
+            # Keep starts `delay` seconds apart, measured from the first start
+            wait = start + execution_number * delay - loop.time()
+            if wait > 0:
+                print_verbose(f"Waiting {wait:.2f} seconds before starting execution {execution_number + 1}...")
+                await asyncio.sleep(wait)
+            await run_execution(execution_number)
     
-    await asyncio.gather(*tasks)
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, min(max_concurrent, times)))]
+    try:
+        await asyncio.gather(*workers)
+    except asyncio.CancelledError:
+        for task in workers:
+            task.cancel()
+        raise
 
 def execute_command(command: str, times: int, delay: float) -> None:
     """
@@ -168,8 +360,11 @@ def execute_command(command: str, times: int, delay: float) -> None:
         times (int): Number of times to execute the command
         delay (float): Delay in seconds between executions
     """
+    # Split the command once; the nonce placeholder is substituted per token
+    base_argv = split_command(command)
+    
     # Check if this is a blob transaction command with {REPLACE} placeholder
-    private_key, rpc_url = parse_blob_tx_command(command)
+    private_key, rpc_url = parse_blob_tx_command(command, base_argv)
     
     if private_key and rpc_url and "{REPLACE}" in command:
         print("Using nonce replacement mode")
@@ -179,30 +374,33 @@ def execute_command(command: str, times: int, delay: float) -> None:
             sys.exit(1)
     
     for i in range(times):
-        print(f"\nExecution {i + 1}/{times}")
+        print_verbose(f"\nExecution {i + 1}/{times}")
         
         # Replace nonce if needed
         current_command = command
+        current_argv = base_argv
         if private_key and rpc_url:
             # Get fresh nonce for each transaction
-            current_nonce = get_current_nonce(private_key, rpc_url)
-            current_command = command.replace("{REPLACE}", str(current_nonce))
-            print(f"Using nonce {current_nonce} for execution {i + 1}")
+            current_nonce = str(get_current_nonce(private_key, rpc_url))
+            current_command = command.replace("{REPLACE}", current_nonce)
+            if base_argv is not None:
+                current_argv = [token.replace("{REPLACE}", current_nonce) for token in base_argv]
+            print_verbose(f"Using nonce {current_nonce} for execution {i + 1}")
         
-        print(f"Command: {current_command}")
+        print_verbose(f"Command: {current_command}")
         
         try:
-            # Use shlex.split for proper command parsing
-            if sys.platform == "win32":
+            # Run the split command directly; the shell is only a fallback for unparseable commands
+            if current_argv is None:
                 process = subprocess.run(current_command, shell=True, check=True)
             else:
-                process = subprocess.run(shlex.split(current_command), check=True)
+                process = subprocess.run(current_argv, check=True)
             
             print(f"Execution {i + 1} completed successfully")
             
             # Don't delay after the last execution
             if i < times - 1:
-                print(f"Waiting {delay} seconds before next execution...")
+                print_verbose(f"Waiting {delay} seconds before next execution...")
                 time.sleep(delay)
                 
         except subprocess.CalledProcessError as e:
@@ -221,24 +419,19 @@ def main():
     parser.add_argument("-d", "--delay", type=float, default=1.0, help="Delay in seconds between starting each command (default: 1.0)")
     parser.add_argument("--async", action="store_true", help="Execute commands asynchronously")
     parser.add_argument("-c", "--concurrent", type=int, default=3, help="Maximum number of concurrent executions in async mode (default: 3)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log each command, nonce and parsing details (may include private keys)")
     
     args = parser.parse_args()
     
+    global _verbose
+    _verbose = args.verbose
+    
     if getattr(args, 'async'):
-        # Set up asyncio event loop with proper signal handling
-        loop = asyncio.get_event_loop()
+        # asyncio.run cancels the running executions and closes the loop on Ctrl+C
         try:
-            loop.run_until_complete(
-                execute_commands_async(args.command, args.times, args.concurrent, args.delay)
-            )
+            asyncio.run(execute_commands_async(args.command, args.times, args.concurrent, args.delay))
         except KeyboardInterrupt:
             print("\nExecution interrupted by user")
-            # Cancel all running tasks
-            for task in asyncio.all_tasks(loop):
-                task.cancel()
-            loop.run_until_complete(asyncio.gather(*asyncio.all_tasks(loop), return_exceptions=True))
-        finally:
-            loop.close()
     else:
         execute_command(args.command, args.times, args.delay)
 
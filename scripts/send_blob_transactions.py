@@ -18,12 +18,13 @@ Reference: https://eips.ethereum.org/EIPS/eip-7762
 
 import os
 import argparse
-from eth_abi import abi
-from eth_utils import to_hex
-from web3 import Web3, HTTPProvider
+import asyncio
+from functools import lru_cache
 import hashlib
-import ckzg  # type: ignore
-import rlp
+import threading
+
+# web3, eth_account, requests and ckzg are imported where they are first used, so
+# --help and argument errors don't pay for loading them
 
 TRUSTED_SETUP = os.path.join(os.path.dirname(__file__), "trusted_setup.txt")
 
@@ -37,6 +38,83 @@ OSAKA_VERSIONED_HASH_PREFIX = b'\x01'  # Blob wrapper version 1
 OSAKA_GAS_LIMIT_CAP = 2**24  # 16,777,216
 OSAKA_BLOB_RESERVE_PRICE = 2**13  # 8,192 wei
 
+# Blob payload shared by every prepared blob. BLS12-381 field modulus:
+# p = 52435875175126190479447740508185965837690552500527637822603658699938581184513
+# Each 32-byte big-endian field element must be below p; this repeating pattern
+# (top byte 0x01) is well below it.
+VALID_FIELD_ELEMENT = int(0x0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef).to_bytes(32, 'big')
+# 4096 field elements of 32 bytes each = 131,072 bytes
+BLOB_TEMPLATE = VALID_FIELD_ELEMENT * 4096
+assert len(BLOB_TEMPLATE) == OSAKA_BLOB_SIZE_BYTES
+
+# Loaded KZG trusted setups by (file path, precompute), reused for every blob in this process
+_trusted_setup_cache = {}
+
+# Web3 clients by RPC URL, each with its own keep-alive connection pool
+_web3_cache = {}
+
+# Chain IDs by RPC URL; they don't change between transactions
+_chain_ids = {}
+
+# Gas estimates by (RPC URL, chain ID, recipient, number of blobs); identical blob
+# transactions cost the same, so only the first one in this process is estimated.
+# Kept in memory only, a restarted devnet or redeployed --to contract starts fresh
+_gas_estimates = {}
+
+# Next nonce by (RPC URL, address) for transactions sent without --nonce; fetched
+# once, then handed out locally. Guarded by a lock since sends may run on threads
+_next_nonces = {}
+_next_nonces_lock = threading.Lock()
+
+
+def get_web3(rpc_url):
+    """Return a Web3 client for rpc_url, created once per process and reused."""
+    w3 = _web3_cache.get(rpc_url)
+    if w3 is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from web3 import Web3, HTTPProvider
+        
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        w3 = Web3(HTTPProvider(rpc_url, session=session))
+        _web3_cache[rpc_url] = w3
+    return w3
+
+
+def get_chain_id(rpc_url):
+    """Fetch the chain ID of rpc_url once; it does not change between transactions."""
+    chain_id = _chain_ids.get(rpc_url)
+    if chain_id is None:
+        chain_id = _chain_ids[rpc_url] = get_web3(rpc_url).eth.chain_id
+    return chain_id
+
+
+def next_nonce(rpc_url, address):
+    """Return the next nonce for address, querying the node only for the first one."""
+    key = (rpc_url, address)
+    with _next_nonces_lock:
+        nonce = _next_nonces.get(key)
+        if nonce is None:
+            nonce = get_web3(rpc_url).eth.get_transaction_count(address, 'pending')
+        _next_nonces[key] = nonce + 1
+        return nonce
+
+
+def reset_nonce(rpc_url, address):
+    """Forget the local nonce for address so the next one is fetched from the node again."""
+    with _next_nonces_lock:
+        _next_nonces.pop((rpc_url, address), None)
+
+
+@lru_cache(maxsize=16)
+def get_account(private_key):
+    """Derive the signing account for a private key once."""
+    from eth_account import Account
+    return Account.from_key(private_key)
+
 
 # ============================================================================
 # VALIDATION FUNCTIONS - OSAKA FORK COMPLIANCE
@@ -111,6 +189,9 @@ def validate_blob_data(blobs):
         ValueError: If any blob has incorrect size
     """
     for i, blob in enumerate(blobs):
+        # The shared template is the right size by construction
+        if blob is BLOB_TEMPLATE:
+            continue
         if len(blob) != OSAKA_BLOB_SIZE_BYTES:
             raise ValueError(
                 f"Blob {i} size {len(blob)} bytes doesn't match Osaka requirement "
@@ -122,7 +203,7 @@ def validate_blob_data(blobs):
 # ARGUMENT PARSING - ENHANCED FOR OSAKA
 # ============================================================================
 
-def parse_args():
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(
         description='Send blob transactions to Ethereum network (Osaka fork compatible)'
     )
@@ -145,6 +226,9 @@ def parse_args():
                       help='Fee collector address to track balance (default: 0x1559...)')
     parser.add_argument('--log', action='store_true',
                       help='Log the transaction hash and receipt')
+    parser.add_argument('--ws-url', type=str,
+                      help='WebSocket RPC URL used to wait for the receipt once per new block '
+                           '(default: poll the HTTP RPC)')
     parser.add_argument('--nonce', type=int,
                       help='Specific nonce to use for the transaction (optional)')
     # Osaka fork enhancements
@@ -154,13 +238,44 @@ def parse_args():
                       help='Value to send in wei (default: 0 for blob tx, must be 0 for Osaka)')
     parser.add_argument('--validate-osaka-params', action='store_true',
                       help='Enable strict Osaka fork parameter validation (recommended: enabled)')
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 # ============================================================================
 # BLOB PREPARATION & VERSIONED HASH COMPUTATION
 # ============================================================================
 
+def load_trusted_setup(trusted_setup_path, precompute=0):
+    """
+    Load the KZG trusted setup, parsing the file only once per process.
+    
+    Args:
+        trusted_setup_path (str): Path to trusted setup file
+        precompute (int): ckzg precomputation level
+        
+    Returns:
+        The ckzg trusted setup object
+    """
+    key = (trusted_setup_path, precompute)
+    trusted_setup = _trusted_setup_cache.get(key)
+    if trusted_setup is None:
+        import ckzg  # type: ignore
+        trusted_setup = ckzg.load_trusted_setup(trusted_setup_path, precompute)
+        _trusted_setup_cache[key] = trusted_setup
+    return trusted_setup
+
+
+def commitment_to_versioned_hash(commitment):
+    """
+    Osaka fork (EIP-7762): Versioned hash = version prefix + hash
+    Version 0x01 indicates blob wrapper version 1
+    Then append first 31 bytes of sha256(commitment) to make 32 bytes total
+    """
+    # sha256 is a content hash here, not a security primitive
+    digest = hashlib.sha256(commitment, usedforsecurity=False).digest()
+    return OSAKA_VERSIONED_HASH_PREFIX + memoryview(digest)[1:]
+
+
 def prepare_blobs(number_of_blobs):
     """
     Prepare blob data for transaction.
@@ -176,24 +291,8 @@ def prepare_blobs(number_of_blobs):
     Returns:
         list: List of blob data (each 131,072 bytes with valid field elements)
     """
-    # BLS12-381 field modulus
-    # p = 52435875175126190479447740508185965837690552500527637822603658699938581184513
-    # In hex: 0x52435975_67b9acf0_51633ada_5cb158ad_10d2e47f_f0a6f067_ffffffff_fffffffe3
-    # Max valid value for a field element is p - 1
-    # To be safe, we use 0x40000000_00000000_00000000_00000000_00000000_00000000_00000000_00000000
-    # which represents 2^255 and is well below the field modulus
-    
-    # Create a blob with repeating valid field element pattern
-    # Each field element is represented as a 32-byte big-endian integer
-    valid_field_element = int(0x0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef).to_bytes(32, 'big')
-    
-    # Create blob: 4096 field elements of 32 bytes each = 131,072 bytes
-    blob_data = valid_field_element * 4096
-    
-    # Create list of identical blobs
-    blobs = [blob_data for _ in range(number_of_blobs)]
-    
-    return blobs
+    # Every blob is the same read-only bytes object
+    return [BLOB_TEMPLATE] * number_of_blobs
 
 
 def compute_versioned_hashes(blobs, w3, trusted_setup_path):
@@ -213,18 +312,21 @@ def compute_versioned_hashes(blobs, w3, trusted_setup_path):
     Returns:
         list: List of 32-byte versioned hashes with 0x01 prefix (Osaka v1)
     """
-    trusted_setup = ckzg.load_trusted_setup(trusted_setup_path, 0)
+    import ckzg  # type: ignore
+    
+    trusted_setup = load_trusted_setup(trusted_setup_path)
     
     versioned_hashes = []
+    # prepare_blobs returns identical blobs, so each distinct blob is committed only once
+    hashes_by_blob = {}
     
     for blob in blobs:
-        # Compute KZG commitment for the blob
-        commitment = ckzg.blob_to_kzg_commitment(blob, trusted_setup)
-        
-        # Osaka fork (EIP-7762): Versioned hash = version prefix + hash
-        # Version 0x01 indicates blob wrapper version 1
-        # Then append first 31 bytes of sha256(commitment) to make 32 bytes total
-        versioned_hash = OSAKA_VERSIONED_HASH_PREFIX + hashlib.sha256(commitment).digest()[1:]
+        versioned_hash = hashes_by_blob.get(blob)
+        if versioned_hash is None:
+            # Compute KZG commitment for the blob
+            commitment = ckzg.blob_to_kzg_commitment(blob, trusted_setup)
+            versioned_hash = commitment_to_versioned_hash(commitment)
+            hashes_by_blob[blob] = versioned_hash
         
         versioned_hashes.append(versioned_hash)
     
@@ -235,7 +337,7 @@ def compute_versioned_hashes(blobs, w3, trusted_setup_path):
 # TRANSACTION CONSTRUCTION - OSAKA FORK
 # ============================================================================
 
-def construct_blob_transaction(w3, acct, args, blobs, versioned_hashes):
+def construct_blob_transaction(w3, acct, args, blobs, versioned_hashes=None):
     """
     Construct a blob transaction compatible with Osaka fork.
     
@@ -244,14 +346,15 @@ def construct_blob_transaction(w3, acct, args, blobs, versioned_hashes):
     - Value: 0 (blobs are separate from value transfer)
     - maxFeePerBlobGas: Hex string for blob gas price
     - Gas: Must not exceed 2^24 (16,777,216)
-    - NOTE: blobVersionedHashes are computed by web3.py from blobs
+    - NOTE: blobVersionedHashes are computed from blobs when signing
     
     Args:
         w3 (Web3): Web3 instance
         acct: Account object
         args: Parsed arguments
         blobs (list): List of blob data
-        versioned_hashes (list): List of versioned hashes (for reference only, web3.py will compute)
+        versioned_hashes (list, optional): List of versioned hashes, only needed for gas
+            estimation (computed here if required and not given; signing computes its own)
         
     Returns:
         dict: Transaction dictionary ready for signing
@@ -259,7 +362,7 @@ def construct_blob_transaction(w3, acct, args, blobs, versioned_hashes):
     # Osaka fork: Type 0x3 for blob transactions
     tx = {
         "type": 3,  # 0x3 for blob transaction
-        "chainId": w3.eth.chain_id,
+        "chainId": get_chain_id(args.rpc_url),
         "from": acct.address,
         "to": args.to,
         "value": args.value,  # Must be 0 for blob transactions (Osaka)
@@ -268,8 +371,8 @@ def construct_blob_transaction(w3, acct, args, blobs, versioned_hashes):
         "maxPriorityFeePerGas": args.gas_price,
         # Osaka fork: maxFeePerBlobGas in integer format (web3.py will handle conversion)
         "maxFeePerBlobGas": args.gas_price,
-        "nonce": args.nonce if args.nonce is not None else w3.eth.get_transaction_count(acct.address),
-        # NOTE: Do NOT include blobVersionedHashes here - web3.py computes them from blobs!
+        "nonce": args.nonce if args.nonce is not None else next_nonce(args.rpc_url, acct.address),
+        # NOTE: Do NOT include blobVersionedHashes here - sign_blob_transaction computes them from blobs!
     }
     
     if args.log:
@@ -281,12 +384,21 @@ def construct_blob_transaction(w3, acct, args, blobs, versioned_hashes):
     if args.gas_limit:
         tx["gas"] = args.gas_limit
     else:
+        gas_key = (args.rpc_url, tx['chainId'], args.to, len(blobs))
         try:
-            # Estimate gas - web3.py needs the blobs for accurate estimation
-            # Create a temporary tx dict WITH versioned hashes for estimation
-            temp_tx = tx.copy()
-            temp_tx["blobVersionedHashes"] = versioned_hashes
-            tx["gas"] = w3.eth.estimate_gas(temp_tx)
+            if gas_key in _gas_estimates:
+                tx["gas"] = _gas_estimates[gas_key]
+            else:
+                if versioned_hashes is None:
+                    versioned_hashes = compute_versioned_hashes(blobs, w3, TRUSTED_SETUP)
+                # Estimate gas - web3.py needs the blobs for accurate estimation
+                # Add the versioned hashes for estimation only; the signed tx must not carry them
+                tx["blobVersionedHashes"] = versioned_hashes
+                try:
+                    tx["gas"] = w3.eth.estimate_gas(tx)
+                finally:
+                    del tx["blobVersionedHashes"]
+                _gas_estimates[gas_key] = tx["gas"]
             
             if args.log:
                 print(f"[OSAKA] Estimated gas: {tx['gas']}")
@@ -308,6 +420,86 @@ def construct_blob_transaction(w3, acct, args, blobs, versioned_hashes):
 # TRANSACTION SIGNING & SUBMISSION - OSAKA FORK
 # ============================================================================
 
+def sign_blob_transaction(acct, tx, blobs, trusted_setup_path):
+    """
+    Sign a blob transaction and wrap it with its blobs for network submission.
+    
+    eth_account can compute the blob data itself, but it reloads the trusted setup for
+    every commitment and proof (3 loads per blob, ~2.5 s each). Here the commitments and
+    proofs come from the setup loaded once by load_trusted_setup, and the signed
+    transaction is wrapped as 0x03 || rlp([tx_payload_body, blobs, commitments, proofs]).
+    
+    Args:
+        acct: Account object
+        tx (dict): Transaction dictionary without blobVersionedHashes
+        blobs (list): List of blob data
+        trusted_setup_path (str): Path to trusted setup file
+        
+    Returns:
+        bytes: The raw transaction in network form
+    """
+    import ckzg  # type: ignore
+    import rlp  # type: ignore
+    
+    trusted_setup = load_trusted_setup(trusted_setup_path)
+    
+    # prepare_blobs returns identical blobs, so each distinct blob is committed only once
+    kzg_by_blob = {}
+    for blob in blobs:
+        if blob not in kzg_by_blob:
+            commitment = ckzg.blob_to_kzg_commitment(blob, trusted_setup)
+            kzg_by_blob[blob] = (commitment, ckzg.compute_blob_kzg_proof(blob, commitment, trusted_setup))
+    commitments = [kzg_by_blob[blob][0] for blob in blobs]
+    proofs = [kzg_by_blob[blob][1] for blob in blobs]
+    
+    # Without blobs eth_account signs the plain transaction: 0x03 || rlp(tx_payload_body)
+    signed = acct.sign_transaction({
+        **tx,
+        "blobVersionedHashes": [commitment_to_versioned_hash(commitment) for commitment in commitments],
+    })
+    tx_payload_body = rlp.decode(bytes(signed.raw_transaction[1:]))
+    return bytes([tx["type"]]) + rlp.encode([tx_payload_body, list(blobs), commitments, proofs])
+
+
+async def _wait_for_receipt_ws(ws_url, tx_hash):
+    """Check for the receipt once per newHeads notification instead of polling."""
+    from web3 import AsyncWeb3, WebSocketProvider
+    from web3.exceptions import TransactionNotFound
+    
+    async with AsyncWeb3(WebSocketProvider(ws_url)) as w3:
+        await w3.eth.subscribe("newHeads")
+        # The transaction may have been included before the subscription started
+        try:
+            return await w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            pass
+        async for _ in w3.socket.process_subscriptions():
+            try:
+                return await w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+
+
+def wait_for_receipt(w3, tx_hash, ws_url=None, timeout=120):
+    """
+    Wait for a transaction receipt, over a newHeads subscription if ws_url is given,
+    otherwise by polling the HTTP RPC.
+    
+    Raises:
+        TimeExhausted: If the transaction is not included within timeout seconds
+    """
+    if ws_url is None:
+        return w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+    
+    from web3.exceptions import TimeExhausted
+    try:
+        return asyncio.run(asyncio.wait_for(_wait_for_receipt_ws(ws_url, tx_hash), timeout))
+    except asyncio.TimeoutError:
+        raise TimeExhausted(
+            f"Transaction {tx_hash.hex()} is not in the chain after {timeout} seconds"
+        )
+
+
 def send_blob(args):
     """
     Prepare and send a blob transaction compatible with Osaka fork.
@@ -329,6 +521,9 @@ def send_blob(args):
     
     Args:
         args: Parsed command-line arguments
+        
+    Returns:
+        The transaction receipt
     """
     try:
         # ====================================================================
@@ -343,8 +538,8 @@ def send_blob(args):
             )
         
         # Initialize Web3
-        w3 = Web3(HTTPProvider(args.rpc_url))
-        acct = w3.eth.account.from_key(args.private_key)
+        w3 = get_web3(args.rpc_url)
+        acct = get_account(args.private_key)
         
         # ====================================================================
         # PHASE 2: BLOB PREPARATION
@@ -357,64 +552,71 @@ def send_blob(args):
         # ====================================================================
         # PHASE 3: VERSIONED HASH COMPUTATION (OSAKA-SPECIFIC)
         # ====================================================================
-        versioned_hashes = compute_versioned_hashes(blobs, w3, TRUSTED_SETUP)
-        
+        # Only needed for logging and gas estimation; signing computes its own
+        versioned_hashes = None
         if args.log:
+            versioned_hashes = compute_versioned_hashes(blobs, w3, TRUSTED_SETUP)
             print(f"[OSAKA] Computed {len(versioned_hashes)} versioned hashes")
             for i, vh in enumerate(versioned_hashes):
                 # Show hash in hex format
                 hash_hex = '0x' + vh.hex()
                 print(f"  Hash {i}: {hash_hex}")
         
-        # ====================================================================
-        # PHASE 4: TRANSACTION CONSTRUCTION (OSAKA FORMAT)
-        # ====================================================================
-        tx = construct_blob_transaction(w3, acct, args, blobs, versioned_hashes)
-        
-        # ====================================================================
-        # PHASE 5: TRANSACTION SIGNING (OSAKA FORMAT)
-        # ====================================================================
+        # A nonce assigned in construct_blob_transaction is only used once the node accepts
+        # the transaction; if anything before that fails, resync with the node
         try:
-            # Let web3.py handle the blob transaction signing and wrapping
-            # Pass blobs parameter to automatically construct the blob transaction
-            signed = acct.sign_transaction(tx, blobs=blobs)
-            full_blob_tx = signed.raw_transaction
+            # ====================================================================
+            # PHASE 4: TRANSACTION CONSTRUCTION (OSAKA FORMAT)
+            # ====================================================================
+            tx = construct_blob_transaction(w3, acct, args, blobs, versioned_hashes)
+        
+            # ====================================================================
+            # PHASE 5: TRANSACTION SIGNING (OSAKA FORMAT)
+            # ====================================================================
+            try:
+                # Sign and wrap with the blobs, KZG data computed with the cached trusted setup
+                full_blob_tx = sign_blob_transaction(acct, tx, blobs, TRUSTED_SETUP)
             
-            if args.log:
-                print("[OSAKA] Transaction signed successfully with blobs")
-                print(f"[OSAKA] Blob count: {len(blobs)}")
-                print(f"[OSAKA] Raw transaction length: {len(full_blob_tx)} bytes")
-        except Exception as e:
-            error_msg = str(e).lower()
-            if "blob" in error_msg or "kzg" in error_msg:
-                raise ValueError(
-                    f"Osaka blob signing failed (EIP-7762 compatibility issue): {e}. "
-                    "Verify: 1) Blob count <= 6, 2) Versioned hashes computed, "
-                    "3) Type is 0x3, 4) Blob sizes are 131,072 bytes, "
-                    "5) Blob data contains valid BLS12-381 field elements"
-                )
-            raise
+                if args.log:
+                    print("[OSAKA] Transaction signed successfully with blobs")
+                    print(f"[OSAKA] Blob count: {len(blobs)}")
+                    print(f"[OSAKA] Raw transaction length: {len(full_blob_tx)} bytes")
+            except Exception as e:
+                error_msg = str(e).lower()
+                if "blob" in error_msg or "kzg" in error_msg:
+                    raise ValueError(
+                        f"Osaka blob signing failed (EIP-7762 compatibility issue): {e}. "
+                        "Verify: 1) Blob count <= 6, 2) Versioned hashes computed, "
+                        "3) Type is 0x3, 4) Blob sizes are 131,072 bytes, "
+                        "5) Blob data contains valid BLS12-381 field elements"
+                    )
+                raise
         
-        # ====================================================================
-        # PHASE 6: RPC SUBMISSION
-        # ====================================================================
-        try:
-            tx_hash = w3.eth.send_raw_transaction(full_blob_tx)
-            if args.log:
-                print(f"✓ Transaction submitted: {tx_hash.hex()}")
-        except Exception as e:
-            error_msg = str(e).lower()
-            if "blob" in error_msg or "version" in error_msg:
-                raise ValueError(
-                    f"❌ Osaka blob format rejected by RPC: {e}. "
-                    "Verify Osaka fork compatibility with network endpoint."
-                )
+            # ====================================================================
+            # PHASE 6: RPC SUBMISSION
+            # ====================================================================
+            try:
+                tx_hash = w3.eth.send_raw_transaction(full_blob_tx)
+                if args.log:
+                    print(f"✓ Transaction submitted: {tx_hash.hex()}")
+            except Exception as e:
+                error_msg = str(e).lower()
+                if "blob" in error_msg or "version" in error_msg:
+                    raise ValueError(
+                        f"❌ Osaka blob format rejected by RPC: {e}. "
+                        "Verify Osaka fork compatibility with network endpoint."
+                    )
+                raise
+        
+        except Exception:
+            if args.nonce is None:
+                reset_nonce(args.rpc_url, acct.address)
             raise
         
         # ====================================================================
         # PHASE 7: RECEIPT CONFIRMATION
         # ====================================================================
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = wait_for_receipt(w3, tx_hash, args.ws_url)
         
         if args.log:
             if tx_receipt.status == 1:
@@ -427,6 +629,7 @@ def send_blob(args):
                 print(f"  Status: {tx_receipt.status}")
         
         print(f"Transaction included in block {tx_receipt.blockNumber}, status: {tx_receipt.status}")
+        return tx_receipt
         
     except ValueError as e:
         print(f"Validation Error: {e}")
@@ -436,27 +639,57 @@ def send_blob(args):
         raise
 
 
-def get_fee_collector_balance(args):
-    """Get current balance of fee collector address."""
-    w3 = Web3(HTTPProvider(args.rpc_url))
-    balance = w3.eth.get_balance(args.fee_collector)
-    print(f"Fee collector balance: {balance} wei")
-    return balance
+def get_fee_collector_balance_change(args, block_number):
+    """
+    Get the fee collector balance before and after block_number in one JSON-RPC batch,
+    so the change is exactly what that block paid out.
+    """
+    w3 = get_web3(args.rpc_url)
+    with w3.batch_requests() as batch:
+        batch.add(w3.eth.get_balance(args.fee_collector, block_number - 1))
+        batch.add(w3.eth.get_balance(args.fee_collector, block_number))
+        initial_balance, final_balance = batch.execute()
+    print(f"Fee collector balance before block {block_number}: {initial_balance} wei")
+    print(f"Fee collector balance after block {block_number}: {final_balance} wei")
+    return initial_balance, final_balance
+
+
+def prefetch_send_state(args):
+    """Fetch the chain ID and (without --nonce) the sender's next nonce in one JSON-RPC batch."""
+    w3 = get_web3(args.rpc_url)
+    address = get_account(args.private_key).address
+    nonce_key = (args.rpc_url, address)
+    fetch_chain_id = args.rpc_url not in _chain_ids
+    fetch_nonce = args.nonce is None and nonce_key not in _next_nonces
+    if not (fetch_chain_id or fetch_nonce):
+        return
+    
+    with w3.batch_requests() as batch:
+        if fetch_chain_id:
+            batch.add(w3.eth.chain_id)
+        if fetch_nonce:
+            batch.add(w3.eth.get_transaction_count(address, 'pending'))
+        results = iter(batch.execute())
+    
+    if fetch_chain_id:
+        _chain_ids[args.rpc_url] = next(results)
+    if fetch_nonce:
+        with _next_nonces_lock:
+            _next_nonces.setdefault(nonce_key, next(results))
 
 
-def main() -> int:
+def main(argv=None) -> int:
     """Main entry point for blob transaction submission."""
-    args = parse_args()
+    args = parse_args(argv)
     
-    # Get initial balance and calculate difference
+    prefetch_send_state(args)
+    tx_receipt = send_blob(args)
+    
+    # Calculate the fee collector balance difference across the inclusion block
     if args.fee_collector:
-        initial_balance = get_fee_collector_balance(args)
-        send_blob(args)
-        final_balance = get_fee_collector_balance(args)
+        initial_balance, final_balance = get_fee_collector_balance_change(args, tx_receipt.blockNumber)
         balance_difference = final_balance - initial_balance
         print(f"\nFee collector balance change: {balance_difference} wei")
-    else:
-        send_blob(args)
     
     return 0
 
@@ -19,14 +19,12 @@ Reference: https://eips.ethereum.org/EIPS/eip-7762
 import os
 import argparse
 import subprocess
-import json
-import time
-from eth_abi import abi
-from eth_utils import to_hex
+from functools import lru_cache
 from web3 import Web3, HTTPProvider
+import requests
+from requests.adapters import HTTPAdapter
 import hashlib
 import ckzg  # type: ignore
-import rlp
 
 TRUSTED_SETUP = os.path.join(os.path.dirname(__file__), "trusted_setup.txt")
 
@@ -40,6 +38,40 @@ OSAKA_VERSIONED_HASH_PREFIX = b'\x01'  # Blob wrapper version 1
 OSAKA_GAS_LIMIT_CAP = 2**24  # 16,777,216
 OSAKA_BLOB_RESERVE_PRICE = 2**13  # 8,192 wei
 
+# Blob payload shared by every prepared blob. BLS12-381 field modulus:
+# p = 52435875175126190479447740508185965837690552500527637822603658699938581184513
+# Each 32-byte big-endian field element must be below p; this repeating pattern
+# (top byte 0x01) is well below it.
+VALID_FIELD_ELEMENT = int(0x0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef).to_bytes(32, 'big')
+# 4096 field elements of 32 bytes each = 131,072 bytes
+BLOB_TEMPLATE = VALID_FIELD_ELEMENT * 4096
+assert len(BLOB_TEMPLATE) == OSAKA_BLOB_SIZE_BYTES
+
+# Loaded KZG trusted setups by file path, reused for every blob in this process
+_trusted_setup_cache = {}
+
+# Web3 clients by RPC URL, each with its own keep-alive connection pool
+_web3_cache = {}
+
+
+def get_web3(rpc_url):
+    """Return a Web3 client for rpc_url, created once per process and reused."""
+    w3 = _web3_cache.get(rpc_url)
+    if w3 is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        w3 = Web3(HTTPProvider(rpc_url, session=session))
+        _web3_cache[rpc_url] = w3
+    return w3
+
+
+@lru_cache(maxsize=8)
+def get_chain_id(rpc_url):
+    """Fetch the chain ID of rpc_url once; it does not change between transactions."""
+    return get_web3(rpc_url).eth.chain_id
+
 
 # ============================================================================
 # VALIDATION FUNCTIONS - OSAKA FORK COMPLIANCE
@@ -177,6 +209,23 @@ def parse_args():
 # BLOB PREPARATION & VERSIONED HASH COMPUTATION
 # ============================================================================
 
+def load_trusted_setup(trusted_setup_path):
+    """
+    Load the KZG trusted setup, parsing the file only once per process.
+    
+    Args:
+        trusted_setup_path (str): Path to trusted setup file
+        
+    Returns:
+        The ckzg trusted setup object
+    """
+    trusted_setup = _trusted_setup_cache.get(trusted_setup_path)
+    if trusted_setup is None:
+        trusted_setup = ckzg.load_trusted_setup(trusted_setup_path, 0)
+        _trusted_setup_cache[trusted_setup_path] = trusted_setup
+    return trusted_setup
+
+
 def prepare_blobs(number_of_blobs):
     """
     Prepare blob data for transaction.
@@ -192,24 +241,8 @@ def prepare_blobs(number_of_blobs):
     Returns:
         list: List of blob data (each 131,072 bytes with valid field elements)
     """
-    # BLS12-381 field modulus
-    # p = 52435875175126190479447740508185965837690552500527637822603658699938581184513
-    # In hex: 0x52435975_67b9acf0_51633ada_5cb158ad_10d2e47f_f0a6f067_ffffffff_fffffffe3
-    # Max valid value for a field element is p - 1
-    # To be safe, we use 0x40000000_00000000_00000000_00000000_00000000_00000000_00000000_00000000
-    # which represents 2^255 and is well below the field modulus
-    
-    # Create a blob with repeating valid field element pattern
-    # Each field element is represented as a 32-byte big-endian integer
-    valid_field_element = int(0x0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef).to_bytes(32, 'big')
-    
-    # Create blob: 4096 field elements of 32 bytes each = 131,072 bytes (Osaka requirement)
-    blob_data = valid_field_element * 4096
-    
-    # Create list of identical blobs
-    blobs = [blob_data for _ in range(number_of_blobs)]
-    
-    return blobs
+    # Every blob is the same read-only bytes object
+    return [BLOB_TEMPLATE] * number_of_blobs
 
 
 def compute_versioned_hashes(blobs, w3, trusted_setup_path):
@@ -229,18 +262,25 @@ def compute_versioned_hashes(blobs, w3, trusted_setup_path):
     Returns:
         list: List of 32-byte versioned hashes with 0x01 prefix (Osaka v1)
     """
-    trusted_setup = ckzg.load_trusted_setup(trusted_setup_path, 0)
+    trusted_setup = load_trusted_setup(trusted_setup_path)
     
     versioned_hashes = []
+    # prepare_blobs returns identical blobs, so each distinct blob is committed only once
+    hashes_by_blob = {}
     
     for blob in blobs:
-        # Compute KZG commitment for the blob
-        commitment = ckzg.blob_to_kzg_commitment(blob, trusted_setup)
-        
-        # Osaka fork (EIP-7762): Versioned hash = version prefix + hash
-        # Version 0x01 indicates blob wrapper version 1
-        # Then append first 31 bytes of sha256(commitment) to make 32 bytes total
-        versioned_hash = OSAKA_VERSIONED_HASH_PREFIX + hashlib.sha256(commitment).digest()[1:]
+        versioned_hash = hashes_by_blob.get(blob)
+        if versioned_hash is None:
+            # Compute KZG commitment for the blob
+            commitment = ckzg.blob_to_kzg_commitment(blob, trusted_setup)
+            
+            # Osaka fork (EIP-7762): Versioned hash = version prefix + hash
+            # Version 0x01 indicates blob wrapper version 1
+            # Then append first 31 bytes of sha256(commitment) to make 32 bytes total
+            # sha256 is a content hash here, not a security primitive
+            digest = hashlib.sha256(commitment, usedforsecurity=False).digest()
+            versioned_hash = OSAKA_VERSIONED_HASH_PREFIX + memoryview(digest)[1:]
+            hashes_by_blob[blob] = versioned_hash
         
         versioned_hashes.append(versioned_hash)
     
@@ -275,7 +315,7 @@ def construct_blob_transaction(w3, acct, args, blobs, versioned_hashes):
     # Osaka fork: Type 0x3 for blob transactions
     tx = {
         "type": 3,  # 0x3 for blob transaction
-        "chainId": w3.eth.chain_id,
+        "chainId": get_chain_id(args.rpc_url),
         "from": acct.address,
         "to": args.to,
         "value": args.value,  # Must be 0 for blob transactions (Osaka)
@@ -299,10 +339,12 @@ def construct_blob_transaction(w3, acct, args, blobs, versioned_hashes):
     else:
         try:
             # Estimate gas - web3.py needs the blobs for accurate estimation
-            # Create a temporary tx dict WITH versioned hashes for estimation
-            temp_tx = tx.copy()
-            temp_tx["blobVersionedHashes"] = versioned_hashes
-            tx["gas"] = w3.eth.estimate_gas(temp_tx)
+            # Add the versioned hashes for estimation only; the signed tx must not carry them
+            tx["blobVersionedHashes"] = versioned_hashes
+            try:
+                tx["gas"] = w3.eth.estimate_gas(tx)
+            finally:
+                del tx["blobVersionedHashes"]
             
             if args.log:
                 print(f"[OSAKA] Estimated gas: {tx['gas']}")
@@ -456,7 +498,7 @@ def send_blob(args):
             )
         
         # Initialize Web3
-        w3 = Web3(HTTPProvider(args.rpc_url))
+        w3 = get_web3(args.rpc_url)
         acct = w3.eth.account.from_key(args.private_key)
         
         # ====================================================================
@@ -577,7 +619,7 @@ def send_blob(args):
 
 def get_fee_collector_balance(args):
     """Get current balance of fee collector address."""
-    w3 = Web3(HTTPProvider(args.rpc_url))
+    w3 = get_web3(args.rpc_url)
     balance = w3.eth.get_balance(args.fee_collector)
     print(f"Fee collector balance: {balance} wei")
     return balance
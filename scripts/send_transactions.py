@@ -36,13 +36,19 @@ def send_transaction(args):
     w3 = Web3(HTTPProvider(args.rpc_url))
     acct = w3.eth.account.from_key(args.private_key)
 
+    # Fetch the nonce and chain ID in one JSON-RPC batch rather than during dict construction
+    with w3.batch_requests() as batch:
+        batch.add(w3.eth.get_transaction_count(acct.address))
+        batch.add(w3.eth.chain_id)
+        nonce, chain_id = batch.execute()
+
     # Base transaction parameters
     tx = {
         "from": acct.address,
         "to": args.to,
         "value": args.value,
-        "nonce": w3.eth.get_transaction_count(acct.address),
-        "chainId": w3.eth.chain_id,
+        "nonce": nonce,
+        "chainId": chain_id,
     }
 
     # Add data if provided
@@ -63,7 +69,8 @@ def send_transaction(args):
     else:
         try:
             tx["gas"] = w3.eth.estimate_gas(tx)
-            print(f"Estimated gas: {tx['gas']}")
+            if args.log:
+                print(f"Estimated gas: {tx['gas']}")
         except Exception as e:
             print(f"Gas estimation failed: {e}")
             print("Using default gas limit of 21,000")
@@ -5,7 +5,7 @@ import json
 from datetime import datetime, timedelta
 import logging
 
-from grafana_api_logs_downloader import GrafanaApiLogDownloader # type: ignore
+from grafana_api_logs_downloader import GrafanaApiLogDownloader, parse_time # type: ignore
 
 """
 Universal script for downloading logs from any Grafana dashboard using the official Grafana API.
@@ -45,6 +45,11 @@ def main():
         default="json",
         help="Output format (default: json)"
     )
+    parser.add_argument(
+        "--flat-output",
+        action="store_true",
+        help="Write JSON as a flat list of entries instead of grouping them by stream labels"
+    )
     
     # Grafana connection parameters
     parser.add_argument(
@@ -134,59 +139,24 @@ def main():
         logger.setLevel(logging.DEBUG)
         
     # Process start and end times
-    end_time = datetime.now()
-    start_time = end_time - timedelta(hours=args.hours)
+    now = datetime.now()
+    end_time = now
+    start_time = now - timedelta(hours=args.hours)
     
-    # Override with explicit times if provided
+    # Override with explicit times if provided; relative times (e.g. "1h") mean that long ago
     if args.start_time:
-        # Handle relative time strings (e.g., "1h" for 1 hour ago)
-        if args.start_time.endswith(('s', 'm', 'h', 'd')):
-            unit = args.start_time[-1]
-            try:
-                value = int(args.start_time[:-1])
-                if unit == 's':
-                    start_time = datetime.now() - timedelta(seconds=value)
-                elif unit == 'm':
-                    start_time = datetime.now() - timedelta(minutes=value)
-                elif unit == 'h':
-                    start_time = datetime.now() - timedelta(hours=value)
-                elif unit == 'd':
-                    start_time = datetime.now() - timedelta(days=value)
-            except ValueError:
-                logger.error(f"Invalid relative time format: {args.start_time}")
-                return
-        else:
-            # Try parsing as ISO format
-            try:
-                start_time = datetime.fromisoformat(args.start_time)
-            except ValueError:
-                logger.error(f"Invalid start time format: {args.start_time}")
-                return
+        try:
+            start_time = parse_time(args.start_time, now)
+        except ValueError:
+            logger.error(f"Invalid start time format: {args.start_time}")
+            return
     
     if args.end_time:
-        # Handle relative time strings similar to start_time
-        if args.end_time.endswith(('s', 'm', 'h', 'd')):
-            unit = args.end_time[-1]
-            try:
-                value = int(args.end_time[:-1])
-                if unit == 's':
-                    end_time = datetime.now() - timedelta(seconds=value)
-                elif unit == 'm':
-                    end_time = datetime.now() - timedelta(minutes=value)
-                elif unit == 'h':
-                    end_time = datetime.now() - timedelta(hours=value)
-                elif unit == 'd':
-                    end_time = datetime.now() - timedelta(days=value)
-            except ValueError:
-                logger.error(f"Invalid relative time format: {args.end_time}")
-                return
-        else:
-            # Try parsing as ISO format
-            try:
-                end_time = datetime.fromisoformat(args.end_time)
-            except ValueError:
-                logger.error(f"Invalid end time format: {args.end_time}")
-                return
+        try:
+            end_time = parse_time(args.end_time, now)
+        except ValueError:
+            logger.error(f"Invalid end time format: {args.end_time}")
+            return
     
     # Initialize the downloader
     downloader = GrafanaApiLogDownloader(
@@ -232,7 +202,8 @@ def main():
                 format=args.format,
                 instance_value=args.instance or "",
                 limit=args.limit,
-                direction=args.direction
+                direction=args.direction,
+                flat_output=args.flat_output
             )
             logger.info(f"Downloaded {len(logs)} log entries")
             
@@ -242,7 +213,7 @@ def main():
                 # Print a preview of the first 5 logs
                 print("\nPreview of downloaded logs:")
                 for i, log in enumerate(logs[:5]):
-                    print(f"{i+1}. {log['datetime']}: {log['log'][:100]}...")
+                    print(f"{i+1}. {log.iso}: {log.log[:100]}...")
                 
                 if len(logs) > 5:
                     print(f"... and {len(logs) - 5} more entries")
@@ -286,7 +257,8 @@ def main():
                 format=args.format,
                 instance_value=args.instance or "",
                 limit=args.limit,
-                direction=args.direction
+                direction=args.direction,
+                flat_output=args.flat_output
             )
             logger.info(f"Downloaded {len(logs)} log entries")
             
@@ -296,7 +268,7 @@ def main():
                 # Print a preview of the first 5 logs
                 print("\nPreview of downloaded logs:")
                 for i, log in enumerate(logs[:5]):
-                    print(f"{i+1}. {log['datetime']}: {log['log'][:100]}...")
+                    print(f"{i+1}. {log.iso}: {log.log[:100]}...")
                 
                 if len(logs) > 5:
                     print(f"... and {len(logs) - 5} more entries")
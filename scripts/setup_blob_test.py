@@ -2,9 +2,16 @@
 
 import os
 import argparse
-import json
 from pathlib import Path
-import subprocess
+
+import orjson
+
+try:
+    from scripts import generate_account, transfer_eth
+except ImportError:
+    # Run as a plain script, with scripts/ itself on sys.path
+    import generate_account
+    import transfer_eth
 
 def setup_test_accounts(num_users: int, eth_amount: float, rpc_url: str, funder_key: str):
     """
@@ -32,17 +39,11 @@ def setup_test_accounts(num_users: int, eth_amount: float, rpc_url: str, funder_
     
     # Generate accounts
     print("\n1. Generating new accounts...")
-    gen_accounts_cmd = [
-        "python3", "scripts/generate_account.py",
-        "-n", str(num_users),
-        "-o", "accounts",
-        "-p", "blob_test_accounts",
-        "--no-print"
-    ]
-    
-    result = subprocess.run(gen_accounts_cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"Error generating accounts: {result.stderr}")
+    # Called in-process, so the account and web3 modules are imported only once
+    try:
+        accounts = generate_account.generate_multiple_accounts(num_users, "accounts", "blob_test_accounts")
+    except Exception as e:
+        print(f"Error generating accounts: {e}")
         return None
     
     # Get the latest generated accounts file
@@ -54,24 +55,25 @@ def setup_test_accounts(num_users: int, eth_amount: float, rpc_url: str, funder_
     latest_account_file = account_files[-1]
     print(f"Accounts generated and saved to: {latest_account_file}")
     
-    # Read the generated accounts
-    with open(latest_account_file) as f:
-        accounts = json.load(f)
-    
     # Fund the accounts
     print(f"\n2. Funding {len(accounts)} accounts with {eth_amount} ETH each...")
     print(f"Total ETH needed: {eth_amount * len(accounts)} ETH")
-    fund_cmd = [
-        "python3", "scripts/transfer_eth.py",
+    fund_args = [
         "--from-key", funder_key,
         "--to-file", str(latest_account_file),
         "--amount", str(eth_amount),
         "--rpc-url", rpc_url
     ]
     
-    result = subprocess.run(fund_cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"Error funding accounts: {result.stderr}")
+    try:
+        transfer_eth.main(fund_args)
+    except SystemExit as e:
+        # transfer_eth exits with a non-zero code on any failed transfer
+        if e.code:
+            print(f"Error funding accounts: exit code {e.code}")
+            return None
+    except Exception as e:
+        print(f"Error funding accounts: {e}")
         return None
     
     print("\nAccounts funded successfully!")
@@ -84,8 +86,10 @@ def setup_test_accounts(num_users: int, eth_amount: float, rpc_url: str, funder_
     }
     
     config_file = accounts_dir / "current_test_config.json"
-    with open(config_file, 'w') as f:
-        json.dump(config, f, indent=4)
+    # Write to a temporary file and rename it so readers never see a partial config
+    tmp_config_file = config_file.with_suffix(".json.tmp")
+    tmp_config_file.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_config_file, config_file)
     
     print(f"\nTest configuration saved to: {config_file}")
     print("\nSetup completed successfully!")
@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 import argparse
 import logging
-import json
-from typing import List, Dict, Optional
+import os
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import ijson
+import orjson
 import slackweb
 
 # Constants
@@ -18,6 +21,9 @@ SLACK_COLORS = {
     "fail": "warning"
 }
 
+# Slack clients by webhook URL, reused across notifications in the same process
+_slack_clients: Dict[str, slackweb.Slack] = {}
+
 def parse_arguments() -> argparse.Namespace:
     """Parse and return command line arguments."""
     parser = argparse.ArgumentParser(description='slack notification script')
@@ -64,38 +70,73 @@ def get_footer_text(args: argparse.Namespace) -> Optional[str]:
         footer_text += f"Tests started at: {args.timestamp}"
     return footer_text or None
 
-def load_test_results(report_name: str) -> Dict:
-    """Load and return test results from JSON file."""
+def build_attachments(args: argparse.Namespace) -> List[Dict]:
+    """Build the Slack message attachments from the notification arguments."""
+    return [{
+        "color": SLACK_COLORS[args.verdict],
+        "fields": create_attachment_fields(args),
+        "footer": get_footer_text(args),
+    }]
+
+def get_slack_client(webhook_url: str) -> slackweb.Slack:
+    """Return the Slack client for a webhook URL, creating it on first use."""
+    slack = _slack_clients.get(webhook_url)
+    if slack is None:
+        slack = _slack_clients[webhook_url] = slackweb.Slack(url=webhook_url)
+    return slack
+
+@lru_cache(maxsize=32)
+def get_report_path(report_name: str) -> str:
+    """Resolve the JSON report path for a report name once."""
+    return os.fspath(Path(REPORTS_DIR) / f"{report_name}.json")
+
+def load_test_results(report_name: str) -> Tuple[Dict, List[str]]:
+    """Stream the summary and the failed test names out of the JSON report file.
+
+    Only the summary and each test's nodeid/outcome are kept, so memory stays
+    bounded no matter how much output the report captured.
+    """
+    summary = {}
+    failed_tests = []
     try:
-        report_path = Path(REPORTS_DIR) / f"{report_name}.json"
-        with open(report_path) as f:
-            return json.load(f)
+        report_path = get_report_path(report_name)
+        with open(report_path, 'rb') as f:
+            builder = None
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if prefix == 'summary' or prefix.startswith('summary.'):
+                    if builder is None:
+                        builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    if prefix == 'summary' and event == 'end_map':
+                        summary = builder.value
+                elif prefix == 'tests.item' and event == 'start_map':
+                    nodeid = outcome = None
+                elif prefix == 'tests.item.nodeid':
+                    nodeid = value
+                elif prefix == 'tests.item.outcome':
+                    outcome = value
+                elif prefix == 'tests.item' and event == 'end_map' and outcome == "failed":
+                    failed_tests.append(get_test_name(nodeid))
     except FileNotFoundError:
         logging.error(f"Report file not found: {report_path}")
         raise
-    except json.JSONDecodeError:
+    except ijson.JSONError:
         logging.error(f"Invalid JSON in report file: {report_path}")
         raise
+    return summary, failed_tests
 
-def get_failed_tests(data: Dict) -> List[str]:
-    """Extract failed test names from test data."""
-    return [x["nodeid"].split("::")[1] for x in data["tests"] if x["outcome"] == "failed"]
+def get_test_name(nodeid: str) -> str:
+    """Return the test name from a pytest nodeid (path::test[::...])."""
+    # Split at most twice, deeper parts of parametrized/class nodeids are not needed
+    return nodeid.split("::", 2)[1]
 
 def notify() -> None:
     """Main function to send Slack notifications."""
     args = parse_arguments()
-    
-    attachment_fields = create_attachment_fields(args)
-    footer_text = get_footer_text(args)
 
     try:
-        slack = slackweb.Slack(url=args.webhook_url)
-        attachments = [{
-            "color": SLACK_COLORS[args.verdict],
-            "fields": attachment_fields,
-            "footer": footer_text,
-        }]
-        
+        attachments = build_attachments(args)
+        slack = get_slack_client(args.webhook_url)
         if args.text:
             slack.notify(text=args.text, attachments=attachments)
         else:
@@ -121,12 +162,11 @@ def send_to_slack(
     additional_message = ""
 
     if not summary:
-        data = load_test_results(report_name)
-        summary = json.dumps(data["summary"])
+        summary_data, failed_tests = load_test_results(report_name)
+        summary = orjson.dumps(summary_data).decode()
         
-        if "passed" not in data["summary"] or data["summary"]["passed"] < data["summary"]["total"] - data["summary"].get("skipped", 0):
+        if "passed" not in summary_data or summary_data["passed"] < summary_data["total"] - summary_data.get("skipped", 0):
             verdict = "fail"
-            failed_tests = get_failed_tests(data)
             additional_message = "Failed tests: " + ", ".join(failed_tests)
 
     if not post_only_failed or verdict == "fail":
@@ -145,18 +185,9 @@ def send_to_slack(
             report_link=f"{job_url}/{ARTIFACTS_DOWNLOAD_PATH}" if job_url else None
         )
 
-        # Create Slack client and send notification
-        slack = slackweb.Slack(url=args.webhook_url)
-        attachment_fields = create_attachment_fields(args)
-        footer_text = get_footer_text(args)
-
-        attachments = [{
-            "color": SLACK_COLORS[args.verdict],
-            "fields": attachment_fields,
-            "footer": footer_text,
-        }]
+        attachments = build_attachments(args)
         logging.info(f"Sending attachments: {attachments}")
-        slack.notify(attachments=attachments)
+        get_slack_client(args.webhook_url).notify(attachments=attachments)
     else:
         logging.warning("Skipped sending report to slack")
 
@@ -1,59 +1,183 @@
-from web3 import Web3
+from web3 import AsyncWeb3, Web3, WebSocketProvider
+from web3.exceptions import TimeExhausted, TransactionNotFound
 import argparse
-import json
+import asyncio
+import os
+import random
+import re
+import orjson
 from eth_account import Account
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 import sys
 from pathlib import Path
 import time
+import statistics
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Same addresses Web3.is_address accepts as text (it does not verify the checksum),
+# compiled once so large --to-file lists skip its per-call dispatch
+HEX_ADDRESS_RE = re.compile(r"(?:0[xX])?[0-9a-fA-F]{40}", re.ASCII)
+
+# Below this many transfers the process pool start-up costs more than signing saves
+SIGN_PARALLEL_THRESHOLD = 2000
+
+# Next nonce per sender after a successful transfer in this process, so transfers to
+# many addresses don't query the node for every one; refreshed from chain on errors
+_next_nonces = {}
+
+# One Web3 client per RPC URL for the whole process, see get_web3
+_web3_clients = {}
+
+# Receipts of a batch are polled together, at most RECEIPT_BATCH_SIZE hashes per JSON-RPC
+# batch and once every RECEIPT_POLL_INTERVAL seconds, however many transfers are pending
+RECEIPT_POLL_INTERVAL = 1
+RECEIPT_BATCH_SIZE = 100
+# Extra seconds to wait per transfer on top of the base timeout, large batches span several blocks
+RECEIPT_TIMEOUT_PER_TX = 0.1
+
+# Chain ID by RPC URL; it never changes, so it is fetched once per process
+_chain_ids = {}
+
+# (fetched at, gas price) by RPC URL; gas price moves slowly compared to a batch
+# of transfers, so it is refetched only every GAS_PRICE_TTL seconds
+GAS_PRICE_TTL = 10
+_gas_prices = {}
+
+# (fetched at, EIP-1559 fee fields) by RPC URL, refreshed like _gas_prices; an
+# empty dict means the node has no fee market and legacy gasPrice is used
+FEE_HISTORY_BLOCKS = 5
+_fee_params = {}
+
+def create_http_session():
+    """Create a keep-alive session so every RPC call reuses the same connections."""
+    session = requests.Session()
+    # urllib3 never retries a POST that reached the server, so a raw transaction
+    # is only resent when the connection itself failed
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                          max_retries=Retry(total=3, backoff_factor=0.2))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def get_web3(rpc_url):
+    """Return the shared Web3 client for rpc_url, backed by a pooled HTTP session."""
+    web3 = _web3_clients.get(rpc_url)
+    if web3 is None:
+        web3 = Web3(Web3.HTTPProvider(rpc_url, session=create_http_session(),
+                                      request_kwargs={'timeout': 30}))
+        _web3_clients[rpc_url] = web3
+    return web3
+
+@lru_cache(maxsize=16)
+def get_account(private_key):
+    """Derive the signing account for a private key once."""
+    return Account.from_key(private_key)
+
+def get_chain_id(web3):
+    """Fetch the chain ID of the web3 endpoint once; it does not change between transactions."""
+    rpc_url = web3.provider.endpoint_uri
+    chain_id = _chain_ids.get(rpc_url)
+    if chain_id is None:
+        chain_id = _chain_ids[rpc_url] = web3.eth.chain_id
+    return chain_id
+
+def get_gas_price(web3, ttl=GAS_PRICE_TTL):
+    """Return the node's gas price, reusing the last value for up to ttl seconds."""
+    rpc_url = web3.provider.endpoint_uri
+    fetched_at, gas_price = _gas_prices.get(rpc_url, (0.0, None))
+    if gas_price is None or time.monotonic() - fetched_at > ttl:
+        gas_price = web3.eth.gas_price
+        _gas_prices[rpc_url] = (time.monotonic(), gas_price)
+    return gas_price
+
+def get_fee_params(web3, ttl=GAS_PRICE_TTL):
+    """
+    Return maxFeePerGas/maxPriorityFeePerGas from one eth_feeHistory call over the
+    last FEE_HISTORY_BLOCKS blocks, reused for up to ttl seconds.
+    """
+    rpc_url = web3.provider.endpoint_uri
+    fetched_at, fees = _fee_params.get(rpc_url, (0.0, None))
+    if fees is None or time.monotonic() - fetched_at > ttl:
+        try:
+            fee_history = web3.eth.fee_history(FEE_HISTORY_BLOCKS, 'latest', [50])
+            # The last base fee is the one the next block will charge
+            base_fee = fee_history['baseFeePerGas'][-1]
+            priority_fee = int(statistics.median(reward[0] for reward in fee_history['reward']))
+            fees = {
+                'type': 2,
+                'maxFeePerGas': 2 * base_fee + priority_fee,
+                'maxPriorityFeePerGas': priority_fee
+            }
+        except Exception as e:
+            print(f"Could not get fee history, using legacy gas price: {str(e)}")
+            fees = {}
+        _fee_params[rpc_url] = (time.monotonic(), fees)
+    return fees
+
+def set_transaction_fees(web3, transaction, gas_price_gwei=None):
+    """Set an explicit --gas-price as gasPrice, otherwise EIP-1559 fees from the fee history."""
+    if gas_price_gwei:
+        transaction['gasPrice'] = web3.to_wei(gas_price_gwei, 'gwei')
+        return
+    fees = get_fee_params(web3)
+    if fees:
+        transaction.update(fees)
+    else:
+        transaction['gasPrice'] = int(get_gas_price(web3) * 2)  # Use 2x gas price by default
 
 def load_addresses_from_file(file_path):
     """Load addresses from a text file or JSON file."""
     file_path = Path(file_path)
     if file_path.suffix == '.txt':
-        with open(file_path, 'r') as f:
-            # Remove any whitespace and empty lines
-            return [addr.strip() for addr in f.readlines() if addr.strip()]
+        # Split the raw bytes in one go, then remove any whitespace and empty lines
+        lines = (line.strip() for line in file_path.read_bytes().splitlines())
+        return [line.decode() for line in lines if line]
     elif file_path.suffix == '.json':
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            # Handle both array of objects with 'public_key' and array of addresses
-            addresses = []
-            for item in data:
-                if isinstance(item, dict) and 'public_key' in item:
-                    addresses.append(item['public_key'])
-                elif isinstance(item, str):
-                    addresses.append(item)
-            return addresses
+        data = orjson.loads(file_path.read_bytes())
+        # Handle both array of objects with 'public_key' and array of addresses
+        addresses = []
+        for item in data:
+            if isinstance(item, dict) and 'public_key' in item:
+                addresses.append(item['public_key'])
+            elif isinstance(item, str):
+                addresses.append(item)
+        return addresses
     else:
         raise ValueError("Unsupported file format. Use .txt or .json")
 
 def validate_eth_address(address):
     """Validate if the address is a valid Ethereum address."""
-    return Web3.is_address(address)
+    return isinstance(address, str) and HEX_ADDRESS_RE.fullmatch(address) is not None
 
 def get_transaction_counts(web3, address):
-    """Get detailed transaction counts using different methods."""
+    """Get detailed transaction counts using a single JSON-RPC batch request."""
     try:
-        # Direct JSON-RPC calls for more detailed information
-        latest = web3.eth.get_transaction_count(address, 'latest')
-        pending = web3.eth.get_transaction_count(address, 'pending')
+        responses = web3.provider.make_batch_request([
+            ("eth_getTransactionCount", [address, "latest"]),
+            ("eth_getTransactionCount", [address, "pending"]),
+        ])
+        if not isinstance(responses, list):
+            raise ValueError(f"Batch request failed: {responses.get('error')}")
+        latest_response, pending_response = responses
         
-        # Try direct eth_getTransactionCount calls
-        latest_direct = web3.provider.make_request("eth_getTransactionCount", [address, "latest"])
-        pending_direct = web3.provider.make_request("eth_getTransactionCount", [address, "pending"])
+        latest = int(latest_response['result'], 16) if 'result' in latest_response else None
+        pending = int(pending_response['result'], 16) if 'result' in pending_response else None
         
         print("\nTransaction count details:")
-        print(f"Latest (standard): {latest}")
-        print(f"Pending (standard): {pending}")
-        print(f"Latest (direct): {int(latest_direct['result'], 16) if 'result' in latest_direct else 'N/A'}")
-        print(f"Pending (direct): {int(pending_direct['result'], 16) if 'result' in pending_direct else 'N/A'}")
+        print(f"Latest: {latest if latest is not None else 'N/A'}")
+        print(f"Pending: {pending if pending is not None else 'N/A'}")
         
         # Try to get pending transactions
         try:
             pending_block = web3.eth.get_block('pending', full_transactions=True)
             if pending_block and 'transactions' in pending_block:
+                address_lower = address.lower()
                 addr_pending_txs = [tx for tx in pending_block['transactions'] 
-                                  if isinstance(tx, dict) and tx.get('from', '').lower() == address.lower()]
+                                  if isinstance(tx, dict) and tx.get('from', '').lower() == address_lower]
                 print(f"Pending transactions found in block: {len(addr_pending_txs)}")
                 for tx in addr_pending_txs:
                     print(f"Pending tx: nonce={tx.get('nonce', 'N/A')}, hash={tx.get('hash', 'N/A').hex()}")
@@ -61,11 +185,7 @@ def get_transaction_counts(web3, address):
             print(f"Could not get pending block: {str(e)}")
         
         # Return the highest nonce we found plus 1
-        all_nonces = [latest, pending]
-        if 'result' in latest_direct:
-            all_nonces.append(int(latest_direct['result'], 16))
-        if 'result' in pending_direct:
-            all_nonces.append(int(pending_direct['result'], 16))
+        all_nonces = [nonce for nonce in (latest, pending) if nonce is not None]
         
         return max(all_nonces)
         
@@ -76,6 +196,8 @@ def get_transaction_counts(web3, address):
 def check_transaction_status(web3, tx_hash, timeout=60):
     """Check transaction status with timeout."""
     start_time = time.time()
+    # Start polling fast and back off to 2s; jitter keeps concurrent pollers apart
+    delay = 0.2
     while time.time() - start_time < timeout:
         try:
             tx_receipt = web3.eth.get_transaction_receipt(tx_hash)
@@ -83,19 +205,21 @@ def check_transaction_status(web3, tx_hash, timeout=60):
                 return tx_receipt
         except Exception:
             pass
-        time.sleep(2)
+        time.sleep(delay + random.random() * 0.05)
+        delay = min(delay * 1.6, 2.0)
     return None
 
 def cancel_pending_transactions(web3, from_private_key, start_nonce, end_nonce):
     """Cancel pending transactions by sending 0 ETH transactions to self with higher gas price."""
-    account = Account.from_key(from_private_key)
+    account = get_account(from_private_key)
     from_address = account.address
     
     print(f"\nAttempting to cancel transactions with nonces from {start_nonce} to {end_nonce}")
     
     # Get current gas price and use 5x for cancellation
-    gas_price = web3.eth.gas_price
+    gas_price = get_gas_price(web3)
     cancel_gas_price = gas_price * 5
+    chain_id = get_chain_id(web3)
     
     for nonce in range(start_nonce, end_nonce + 1):
         try:
@@ -106,11 +230,11 @@ def cancel_pending_transactions(web3, from_private_key, start_nonce, end_nonce):
                 'value': 0,  # 0 ETH
                 'gas': 21000,
                 'gasPrice': cancel_gas_price,
-                'chainId': web3.eth.chain_id
+                'chainId': chain_id
             }
             
             # Sign and send cancellation transaction
-            signed_txn = web3.eth.account.sign_transaction(transaction, from_private_key)
+            signed_txn = account.sign_transaction(transaction)
             tx_hash = web3.eth.send_raw_transaction(signed_txn.raw_transaction)
             print(f"Cancellation transaction sent for nonce {nonce}, hash: {tx_hash.hex()}")
             
@@ -128,15 +252,16 @@ def cancel_pending_transactions(web3, from_private_key, start_nonce, end_nonce):
     print("Cancellation attempts completed")
     time.sleep(5)  # Wait for cancellations to propagate
 
-def transfer_eth(web3, from_private_key, to_address, amount_eth, gas_price_gwei=None, max_retries=3):
-    """Transfer ETH to a single address."""
-    account = Account.from_key(from_private_key)
-    from_address = account.address
-    last_tx_hash = None
-    
+def get_start_nonce(web3, from_private_key, from_address, latest_nonce=None, pending_nonce=None):
+    """
+    Get the nonce to send from, offering to cancel transactions stuck in the pool.
+    Counts the caller already fetched are used instead of asking the node again.
+    """
     # Get initial nonce with detailed information
-    latest_nonce = web3.eth.get_transaction_count(from_address, 'latest')
-    pending_nonce = web3.eth.get_transaction_count(from_address, 'pending')
+    if latest_nonce is None:
+        latest_nonce = web3.eth.get_transaction_count(from_address, 'latest')
+    if pending_nonce is None:
+        pending_nonce = web3.eth.get_transaction_count(from_address, 'pending')
     
     if pending_nonce > latest_nonce:
         print(f"\nDetected {pending_nonce - latest_nonce} pending transactions")
@@ -144,11 +269,92 @@ def transfer_eth(web3, from_private_key, to_address, amount_eth, gas_price_gwei=
         if response.lower() == 'yes':
             cancel_pending_transactions(web3, from_private_key, latest_nonce, pending_nonce - 1)
             # Get fresh nonce after cancellation
-            nonce = web3.eth.get_transaction_count(from_address, 'latest')
+            return web3.eth.get_transaction_count(from_address, 'latest')
+        return pending_nonce
+    return latest_nonce
+
+async def _wait_for_receipts_ws(ws_url, tx_hashes, receipts):
+    """Fill receipts (tx hash -> receipt) once per newHeads notification instead of polling."""
+    async with AsyncWeb3(WebSocketProvider(ws_url)) as w3:
+        await w3.eth.subscribe("newHeads")
+
+        async def check(tx_hash):
+            try:
+                receipts[tx_hash] = await w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                pass
+
+        # Some transactions may have been included before the subscription started
+        await asyncio.gather(*(check(tx_hash) for tx_hash in tx_hashes))
+        if len(receipts) == len(tx_hashes):
+            return
+        async for _ in w3.socket.process_subscriptions():
+            await asyncio.gather(*(check(tx_hash) for tx_hash in tx_hashes if tx_hash not in receipts))
+            if len(receipts) == len(tx_hashes):
+                return
+
+async def _poll_receipts(async_web3, tx_hashes, receipts):
+    """Fill receipts (tx hash -> receipt), polling every pending hash in one batch per interval."""
+    while True:
+        pending = [tx_hash for tx_hash in tx_hashes if tx_hash not in receipts]
+        for start in range(0, len(pending), RECEIPT_BATCH_SIZE):
+            chunk = pending[start:start + RECEIPT_BATCH_SIZE]
+            try:
+                responses = await async_web3.provider.make_batch_request(
+                    [("eth_getTransactionReceipt", [tx_hash.to_0x_hex()]) for tx_hash in chunk]
+                )
+                if not isinstance(responses, list):
+                    raise ValueError(f"Batch request failed: {responses.get('error')}")
+                included = [tx_hash for tx_hash, response in zip(chunk, responses) if response.get('result')]
+                if included:
+                    # Fetched again through web3 so the receipts are formatted like everywhere else
+                    async with async_web3.batch_requests() as batch:
+                        for tx_hash in included:
+                            batch.add(async_web3.eth.get_transaction_receipt(tx_hash))
+                        receipts.update(zip(included, await batch.async_execute()))
+            except Exception as e:
+                # Including a receipt that was reorged out between the two requests, retried next round
+                print(f"Error polling receipts: {str(e)}")
+        if len(receipts) == len(tx_hashes):
+            return
+        await asyncio.sleep(RECEIPT_POLL_INTERVAL)
+
+async def wait_for_receipts(async_web3, tx_hashes, ws_url=None, timeout=30):
+    """
+    Wait for the receipts of tx_hashes, over one newHeads subscription if ws_url is
+    given, otherwise by polling async_web3. Returns a receipt or exception per hash.
+    """
+    receipts = {}
+    try:
+        if ws_url is None:
+            await asyncio.wait_for(_poll_receipts(async_web3, tx_hashes, receipts), timeout)
         else:
-            nonce = pending_nonce
-    else:
-        nonce = latest_nonce
+            await asyncio.wait_for(_wait_for_receipts_ws(ws_url, tx_hashes, receipts), timeout)
+    except asyncio.TimeoutError:
+        pass
+    return [receipts.get(tx_hash) or TimeExhausted(
+                f"Transaction {tx_hash.hex()} is not in the chain after {timeout} seconds")
+            for tx_hash in tx_hashes]
+
+def wait_for_receipt(web3, tx_hash, ws_url=None, timeout=30):
+    """Wait for a single receipt, over WebSocket if ws_url is given, otherwise by polling."""
+    if ws_url is None:
+        return web3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+    result, = asyncio.run(wait_for_receipts(None, [tx_hash], ws_url, timeout))
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+def transfer_eth(web3, from_private_key, to_address, amount_eth, gas_price_gwei=None, max_retries=3, ws_url=None):
+    """Transfer ETH to a single address."""
+    account = get_account(from_private_key)
+    from_address = account.address
+    last_tx_hash = None
+    
+    # Continue from this sender's previous successful transfer without querying the node
+    nonce = _next_nonces.pop(from_address, None)
+    if nonce is None:
+        nonce = get_start_nonce(web3, from_private_key, from_address)
     
     print(f"Starting with nonce: {nonce}")
     
@@ -163,32 +369,32 @@ def transfer_eth(web3, from_private_key, to_address, amount_eth, gas_price_gwei=
                 'to': to_address,
                 'value': amount_wei,
                 'gas': 21000,
-                'chainId': web3.eth.chain_id
+                'chainId': get_chain_id(web3)
             }
 
-            # Set gas price - use higher gas price by default
-            if gas_price_gwei:
-                transaction['gasPrice'] = web3.to_wei(gas_price_gwei, 'gwei')
-            else:
-                gas_price = web3.eth.gas_price
-                transaction['gasPrice'] = int(gas_price * 2)  # Use 2x gas price by default
+            set_transaction_fees(web3, transaction, gas_price_gwei)
 
             print(f"\nTransaction details:")
             print(f"From: {from_address}")
             print(f"To: {to_address}")
             print(f"Value: {web3.from_wei(amount_wei, 'ether')} ETH")
-            print(f"Gas Price: {web3.from_wei(transaction['gasPrice'], 'gwei')} Gwei")
+            if 'gasPrice' in transaction:
+                print(f"Gas Price: {web3.from_wei(transaction['gasPrice'], 'gwei')} Gwei")
+            else:
+                print(f"Max Fee: {web3.from_wei(transaction['maxFeePerGas'], 'gwei')} Gwei")
+                print(f"Max Priority Fee: {web3.from_wei(transaction['maxPriorityFeePerGas'], 'gwei')} Gwei")
             print(f"Nonce: {nonce}")
 
             # Sign and send transaction
-            signed_txn = web3.eth.account.sign_transaction(transaction, from_private_key)
+            signed_txn = account.sign_transaction(transaction)
             tx_hash = web3.eth.send_raw_transaction(signed_txn.raw_transaction)
             last_tx_hash = tx_hash
             print(f"Transaction sent with nonce {nonce}, hash: {tx_hash.hex()}")
             
             # Wait for transaction receipt
-            tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
+            tx_receipt = wait_for_receipt(web3, tx_hash, ws_url)
             if tx_receipt and tx_receipt.status == 1:
+                _next_nonces[from_address] = nonce + 1
                 return tx_receipt
             else:
                 raise Exception("Transaction failed or timed out")
@@ -196,16 +402,17 @@ def transfer_eth(web3, from_private_key, to_address, amount_eth, gas_price_gwei=
         except Exception as e:
             error_message = str(e)
             print(f"Error: {error_message}")
+            error_message_lower = error_message.lower()
 
-            if 'nonce too low' in error_message.lower():
+            if 'nonce too low' in error_message_lower:
                 nonce = web3.eth.get_transaction_count(from_address, 'latest')
                 print(f"Got new nonce: {nonce}")
                 continue
-            elif 'already known' in error_message.lower() or 'known transaction' in error_message.lower():
+            elif 'already known' in error_message_lower or 'known transaction' in error_message_lower:
                 if last_tx_hash:
                     print("Transaction already in mempool, waiting for confirmation...")
                     try:
-                        tx_receipt = web3.eth.wait_for_transaction_receipt(last_tx_hash, timeout=30)
+                        tx_receipt = wait_for_receipt(web3, last_tx_hash, ws_url)
                         if tx_receipt and tx_receipt.status == 1:
                             return tx_receipt
                     except Exception as wait_error:
@@ -220,16 +427,98 @@ def transfer_eth(web3, from_private_key, to_address, amount_eth, gas_price_gwei=
                 print(f"All attempts failed")
                 return None
 
-def main():
+def _sign_transaction(transaction, private_key):
+    return get_account(private_key).sign_transaction(transaction)
+
+def sign_transactions(transactions, private_key, workers=None):
+    """Sign the transactions, spreading large batches over a process pool."""
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(transactions) >= SIGN_PARALLEL_THRESHOLD else 1
+    if workers <= 1:
+        return [_sign_transaction(transaction, private_key) for transaction in transactions]
+
+    chunksize = max(1, len(transactions) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_sign_transaction, transactions, repeat(private_key), chunksize=chunksize))
+
+def sign_transfers(web3, from_private_key, addresses, amount_eth, nonce, gas_price_gwei=None):
+    """Sign one transfer per address, using consecutive nonces starting at nonce."""
+    amount_wei = web3.to_wei(amount_eth, 'ether')
+    chain_id = get_chain_id(web3)
+    fees = {}
+    set_transaction_fees(web3, fees, gas_price_gwei)
+
+    transactions = [
+        {
+            'nonce': nonce + offset,
+            'to': to_address,
+            'value': amount_wei,
+            'gas': 21000,
+            'chainId': chain_id,
+            **fees
+        }
+        for offset, to_address in enumerate(addresses)
+    ]
+    return sign_transactions(transactions, from_private_key)
+
+async def send_transfers(rpc_url, signed_txns, timeout=30, ws_url=None):
+    """Send pre-signed transfers and wait for all of their receipts concurrently.
+
+    Returns one receipt per transaction, or None where sending or waiting failed.
+    """
+    async_web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc_url))
+    try:
+        # Send in nonce order so the node never sees a gap; once one send fails the
+        # later nonces could never be mined, so they are not sent at all
+        tx_hashes = []
+        for signed_txn in signed_txns:
+            try:
+                tx_hash = await async_web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+            except Exception as e:
+                print(f"Error sending transaction: {str(e)}")
+                break
+            print(f"Transaction sent, hash: {tx_hash.hex()}")
+            tx_hashes.append(tx_hash)
+
+        # Inclusion is what takes time, so wait for every receipt at once
+        results = await wait_for_receipts(async_web3, tx_hashes, ws_url,
+                                          timeout + RECEIPT_TIMEOUT_PER_TX * len(tx_hashes))
+    finally:
+        await async_web3.provider.disconnect()
+
+    receipts = [None] * len(signed_txns)
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            print(f"Error waiting for receipt of {tx_hashes[i].hex()}: {str(result)}")
+        elif result.status == 1:
+            receipts[i] = result
+    return receipts
+
+def transfer_eth_batch(web3, from_private_key, addresses, amount_eth, gas_price_gwei=None, ws_url=None):
+    """Transfer ETH to many addresses at once, overlapping the wait for their receipts."""
+    from_address = get_account(from_private_key).address
+    nonce = _next_nonces.pop(from_address, None)
+    if nonce is None:
+        nonce = get_start_nonce(web3, from_private_key, from_address)
+    print(f"Starting with nonce: {nonce}")
+
+    signed_txns = sign_transfers(web3, from_private_key, addresses, amount_eth, nonce, gas_price_gwei)
+    receipts = asyncio.run(send_transfers(web3.provider.endpoint_uri, signed_txns, ws_url=ws_url))
+    if all(receipts):
+        _next_nonces[from_address] = nonce + len(addresses)
+    return receipts
+
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(description='Transfer ETH to one or multiple addresses')
     parser.add_argument('--from-key', required=True, help='Private key to send from (with 0x prefix)')
     parser.add_argument('--to', help='Single address to send to')
     parser.add_argument('--to-file', help='File containing addresses (one per line for .txt, or JSON format)')
     parser.add_argument('--amount', type=float, required=True, help='Amount of ETH to send to each address')
-    parser.add_argument('--gas-price', type=float, help='Gas price in Gwei (optional)')
+    parser.add_argument('--gas-price', type=float, help='Gas price in Gwei for a legacy transaction (optional, default: EIP-1559 fees from fee history)')
     parser.add_argument('--rpc-url', help='Custom RPC URL (required)')
+    parser.add_argument('--ws-url', help='WebSocket RPC URL to check receipts once per new block (default: poll --rpc-url)')
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if not args.to and not args.to_file:
         parser.error("Either --to or --to-file must be specified")
@@ -240,20 +529,29 @@ def main():
     if not args.rpc_url:
         parser.error("--rpc-url is required for Gnosis chain")
 
-    # Setup web3 connection
-    web3 = Web3(Web3.HTTPProvider(args.rpc_url))
+    return args
 
-    if not web3.is_connected():
-        print("Error: Could not connect to Gnosis network")
-        sys.exit(1)
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Setup web3 connection
+    web3 = get_web3(args.rpc_url)
+    account = get_account(args.from_key)
 
-    # Get chain ID for display
+    # Get chain ID, balance and nonces in one JSON-RPC batch round trip, which
+    # doubles as the connection check
     try:
-        chain_id = web3.eth.chain_id
-        print(f"Connected to Gnosis network with chain ID: {chain_id}")
+        with web3.batch_requests() as batch:
+            batch.add(web3.eth.chain_id)
+            batch.add(web3.eth.get_balance(account.address))
+            batch.add(web3.eth.get_transaction_count(account.address, 'latest'))
+            batch.add(web3.eth.get_transaction_count(account.address, 'pending'))
+            chain_id, balance, latest_nonce, pending_nonce = batch.execute()
     except Exception as e:
-        print(f"Warning: Could not get chain ID: {str(e)}")
+        print(f"Error: Could not connect to Gnosis network: {str(e)}")
         sys.exit(1)
+    _chain_ids[args.rpc_url] = chain_id
+    print(f"Connected to Gnosis network with chain ID: {chain_id}")
 
     # Get addresses to send to
     if args.to:
@@ -274,8 +572,6 @@ def main():
         sys.exit(1)
 
     # Check balance
-    account = Account.from_key(args.from_key)
-    balance = web3.eth.get_balance(account.address)
     balance_eth = web3.from_wei(balance, 'ether')
     total_needed = args.amount * len(addresses)
 
@@ -288,14 +584,23 @@ def main():
         print(f"Error: Insufficient balance. Need {total_needed:.6f} ETH but only have {balance_eth:.6f} ETH")
         sys.exit(1)
 
+    # Resolve the starting nonce here so the transfers continue from it without another query
+    _next_nonces[account.address] = get_start_nonce(web3, args.from_key, account.address,
+                                                    latest_nonce, pending_nonce)
+
     # Perform transfers
     print("\nStarting transfers...")
     success_count = 0
     
-    for i, address in enumerate(addresses, 1):
+    if len(addresses) == 1:
+        receipts = [transfer_eth(web3, args.from_key, addresses[0], args.amount, args.gas_price,
+                                 ws_url=args.ws_url)]
+    else:
+        receipts = transfer_eth_batch(web3, args.from_key, addresses, args.amount, args.gas_price,
+                                      ws_url=args.ws_url)
+
+    for i, (address, receipt) in enumerate(zip(addresses, receipts), 1):
         print(f"\nTransfer {i}/{len(addresses)} to {address}")
-        receipt = transfer_eth(web3, args.from_key, address, args.amount, args.gas_price)
-        
         if receipt:
             print(f"Success! Transaction hash: {receipt['transactionHash'].hex()}")
             success_count += 1
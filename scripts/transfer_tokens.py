@@ -1,10 +1,20 @@
-from web3 import Web3
+from web3 import AsyncWeb3, Web3, WebSocketProvider
+from web3.exceptions import TimeExhausted, TransactionNotFound
 import argparse
-import json
+import asyncio
+import orjson
+import random
+import re
 from eth_account import Account
+from eth_abi import encode
+from eth_utils import is_checksum_address, to_checksum_address
+from hexbytes import HexBytes
 import sys
 from pathlib import Path
 import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ERC-20 Token ABI - only the methods we need
 TOKEN_ABI = [
@@ -41,51 +51,173 @@ TOKEN_ABI = [
     }
 ]
 
+# 4-byte selector of transfer(address,uint256)
+TRANSFER_SELECTOR = bytes.fromhex("a9059cbb")
+
+# Hex addresses in any case, with or without the 0x prefix; compiled once so large
+# --to-file lists are checked without per-call dispatch
+HEX_ADDRESS_RE = re.compile(r"(?:0[xX])?[0-9a-fA-F]{40}", re.ASCII)
+
+# One Web3 client per RPC URL for the whole process, see get_web3
+_web3_clients = {}
+
+# Chain ID by RPC URL; it never changes, so it is fetched once per process
+_chain_ids = {}
+
+# (fetched at, value) by RPC URL; gas price and base fee move slowly compared to a
+# batch of transfers, so they are refetched only every GAS_PRICE_TTL seconds
+GAS_PRICE_TTL = 10
+_gas_prices = {}
+_base_fees = {}
+
+# Whether the chain has a base fee, by RPC URL; decides the transaction type once per process
+_eip1559_support = {}
+
+# Node error messages for a transaction type it doesn't accept (geth, erigon/besu, nethermind)
+TX_TYPE_ERRORS = ('transaction type not supported', 'tx type not supported', 'invalid transaction type')
+
+# Retry delays in seconds, see backoff_delay
+RETRY_BACKOFF_BASE = 1
+RETRY_BACKOFF_MAX = 30
+
+# Raw transactions per eth_sendRawTransaction JSON-RPC batch; many providers reject or
+# throttle larger batches
+SEND_BATCH_SIZE = 50
+
+# Next nonce per sender after a successful transfer in this process, so later transfers
+# don't query the node again; refreshed from chain on errors
+_next_nonces = {}
+
+def create_http_session():
+    """Create a keep-alive session so every RPC call reuses the same connections."""
+    session = requests.Session()
+    # urllib3 never retries a POST that reached the server, so a raw transaction
+    # is only resent when the connection itself failed
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                          max_retries=Retry(total=3, backoff_factor=0.2))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def get_web3(rpc_url):
+    """Return the shared Web3 client for rpc_url, backed by a pooled HTTP session."""
+    web3 = _web3_clients.get(rpc_url)
+    if web3 is None:
+        web3 = Web3(Web3.HTTPProvider(rpc_url, session=create_http_session(),
+                                      request_kwargs={'timeout': 30}))
+        _web3_clients[rpc_url] = web3
+    return web3
+
+def build_transfer_transaction(token_address, to_address, amount, fields):
+    """
+    Build an ERC-20 transfer transaction from the other transaction fields, encoding
+    the calldata directly instead of going through the contract ABI per transfer.
+    """
+    return {
+        'value': 0,
+        **fields,
+        'to': token_address,
+        'data': TRANSFER_SELECTOR + encode(['address', 'uint256'], [to_address, amount])
+    }
+
+def get_chain_id(web3):
+    """Fetch the chain ID of the web3 endpoint once; it does not change between transactions."""
+    rpc_url = web3.provider.endpoint_uri
+    chain_id = _chain_ids.get(rpc_url)
+    if chain_id is None:
+        chain_id = _chain_ids[rpc_url] = web3.eth.chain_id
+    return chain_id
+
+def get_gas_price(web3, ttl=GAS_PRICE_TTL):
+    """Return the node's gas price, reusing the last value for up to ttl seconds."""
+    rpc_url = web3.provider.endpoint_uri
+    fetched_at, gas_price = _gas_prices.get(rpc_url, (0.0, None))
+    if gas_price is None or time.monotonic() - fetched_at > ttl:
+        gas_price = web3.eth.gas_price
+        _gas_prices[rpc_url] = (time.monotonic(), gas_price)
+    return gas_price
+
+def get_base_fee(web3, ttl=GAS_PRICE_TTL):
+    """Return the next block's base fee (the gas price before London), cached like get_gas_price."""
+    rpc_url = web3.provider.endpoint_uri
+    fetched_at, base_fee = _base_fees.get(rpc_url, (0.0, None))
+    if base_fee is None or time.monotonic() - fetched_at > ttl:
+        # eth_feeHistory returns only the base fees, unlike eth_getBlockByNumber which
+        # sends the whole latest block; its last entry is the base fee of the next block
+        try:
+            base_fee = web3.eth.fee_history(1, 'latest')['baseFeePerGas'][-1] or None
+        except Exception:
+            base_fee = None
+        if base_fee is None:
+            base_fee = get_gas_price(web3, ttl)
+        _base_fees[rpc_url] = (time.monotonic(), base_fee)
+    return base_fee
+
+def backoff_delay(attempt):
+    """Seconds to wait before retry attempt + 1: doubling from RETRY_BACKOFF_BASE, capped, with jitter."""
+    return min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt) + random.random() * 0.5
+
+def supports_eip1559(web3):
+    """Return whether the chain has a base fee (London or later), checked once per RPC URL."""
+    rpc_url = web3.provider.endpoint_uri
+    if rpc_url not in _eip1559_support:
+        _eip1559_support[rpc_url] = 'baseFeePerGas' in web3.eth.get_block('latest')
+    return _eip1559_support[rpc_url]
+
+def is_tx_type_error(error):
+    """Return whether a send failed because the node does not accept the transaction type."""
+    message = str(error).lower()
+    return any(pattern in message for pattern in TX_TYPE_ERRORS)
+
 def load_addresses_from_file(file_path):
     """Load addresses from a text file or JSON file."""
     file_path = Path(file_path)
     if file_path.suffix == '.txt':
-        with open(file_path, 'r') as f:
-            # Remove any whitespace and empty lines
-            return [addr.strip() for addr in f.readlines() if addr.strip()]
+        # Split the raw bytes in one go, then remove any whitespace and empty lines
+        lines = (line.strip() for line in file_path.read_bytes().splitlines())
+        return [line.decode() for line in lines if line]
     elif file_path.suffix == '.json':
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            # Handle both array of objects with 'public_key' and array of addresses
-            addresses = []
-            for item in data:
-                if isinstance(item, dict) and 'public_key' in item:
-                    addresses.append(item['public_key'])
-                elif isinstance(item, str):
-                    addresses.append(item)
-            return addresses
+        data = orjson.loads(file_path.read_bytes())
+        # Handle both array of objects with 'public_key' and array of addresses
+        addresses = []
+        for item in data:
+            if isinstance(item, dict) and 'public_key' in item:
+                addresses.append(item['public_key'])
+            elif isinstance(item, str):
+                addresses.append(item)
+        return addresses
     else:
         raise ValueError("Unsupported file format. Use .txt or .json")
 
 def validate_eth_address(address):
-    """Validate if the address is a valid Ethereum address."""
-    return Web3.is_address(address)
+    """Validate if the address is a valid Ethereum address, with a correct checksum if mixed-case."""
+    if not isinstance(address, str) or HEX_ADDRESS_RE.fullmatch(address) is None:
+        return False
+    hex_digits = address[-40:]
+    # Single-case addresses carry no checksum, only mixed-case ones need the keccak check
+    if hex_digits == hex_digits.lower() or hex_digits == hex_digits.upper():
+        return True
+    return is_checksum_address('0x' + hex_digits)
 
 def get_transaction_counts(web3, address):
-    """Get detailed transaction counts using different methods."""
+    """Get detailed transaction counts using a single JSON-RPC batch request."""
     try:
-        latest = web3.eth.get_transaction_count(address, 'latest')
-        pending = web3.eth.get_transaction_count(address, 'pending')
+        responses = web3.provider.make_batch_request([
+            ("eth_getTransactionCount", [address, "latest"]),
+            ("eth_getTransactionCount", [address, "pending"]),
+        ])
+        if not isinstance(responses, list):
+            raise ValueError(f"Batch request failed: {responses.get('error')}")
+        latest_response, pending_response = responses
         
-        latest_direct = web3.provider.make_request("eth_getTransactionCount", [address, "latest"])
-        pending_direct = web3.provider.make_request("eth_getTransactionCount", [address, "pending"])
+        latest = int(latest_response['result'], 16) if 'result' in latest_response else None
+        pending = int(pending_response['result'], 16) if 'result' in pending_response else None
         
         print("\nTransaction count details:")
-        print(f"Latest (standard): {latest}")
-        print(f"Pending (standard): {pending}")
-        print(f"Latest (direct): {int(latest_direct['result'], 16) if 'result' in latest_direct else 'N/A'}")
-        print(f"Pending (direct): {int(pending_direct['result'], 16) if 'result' in pending_direct else 'N/A'}")
+        print(f"Latest: {latest if latest is not None else 'N/A'}")
+        print(f"Pending: {pending if pending is not None else 'N/A'}")
         
-        all_nonces = [latest, pending]
-        if 'result' in latest_direct:
-            all_nonces.append(int(latest_direct['result'], 16))
-        if 'result' in pending_direct:
-            all_nonces.append(int(pending_direct['result'], 16))
+        all_nonces = [nonce for nonce in (latest, pending) if nonce is not None]
         
         return max(all_nonces)
         
@@ -93,176 +225,364 @@ def get_transaction_counts(web3, address):
         print(f"Error getting transaction counts: {str(e)}")
         return web3.eth.get_transaction_count(address, 'latest')
 
-def cancel_pending_transactions(web3, from_private_key, start_nonce, end_nonce):
+async def _wait_for_receipts_ws(ws_url, tx_hashes, receipts):
+    """Fill receipts (tx hash -> receipt) once per newHeads notification instead of polling."""
+    async with AsyncWeb3(WebSocketProvider(ws_url)) as w3:
+        await w3.eth.subscribe("newHeads")
+
+        async def check(tx_hash):
+            try:
+                receipts[tx_hash] = await w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                pass
+
+        # Some transactions may have been included before the subscription started
+        await asyncio.gather(*(check(tx_hash) for tx_hash in tx_hashes))
+        if len(receipts) == len(tx_hashes):
+            return
+        async for _ in w3.socket.process_subscriptions():
+            await asyncio.gather(*(check(tx_hash) for tx_hash in tx_hashes if tx_hash not in receipts))
+            if len(receipts) == len(tx_hashes):
+                return
+
+async def wait_for_receipts(async_web3, tx_hashes, ws_url=None, timeout=30):
+    """
+    Wait for the receipts of tx_hashes, over one newHeads subscription if ws_url is
+    given, otherwise by polling async_web3. Returns a receipt or exception per hash.
+    """
+    if ws_url is None:
+        return await asyncio.gather(
+            *(async_web3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout) for tx_hash in tx_hashes),
+            return_exceptions=True
+        )
+
+    receipts = {}
+    try:
+        await asyncio.wait_for(_wait_for_receipts_ws(ws_url, tx_hashes, receipts), timeout)
+    except asyncio.TimeoutError:
+        pass
+    return [receipts.get(tx_hash) or TimeExhausted(
+                f"Transaction {tx_hash.hex()} is not in the chain after {timeout} seconds")
+            for tx_hash in tx_hashes]
+
+def wait_for_receipt(web3, tx_hash, ws_url=None, timeout=30):
+    """Wait for a single receipt, over WebSocket if ws_url is given, otherwise by polling."""
+    if ws_url is None:
+        return web3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+    result, = asyncio.run(wait_for_receipts(None, [tx_hash], ws_url, timeout))
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+async def wait_for_receipts_from(rpc_url, tx_hashes, ws_url=None, timeout=30):
+    """Wait for the receipts of tx_hashes from rpc_url, see wait_for_receipts."""
+    async_web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc_url))
+    try:
+        return await wait_for_receipts(async_web3, tx_hashes, ws_url, timeout)
+    finally:
+        await async_web3.provider.disconnect()
+
+def cancel_pending_transactions(web3, from_private_key, start_nonce, end_nonce, ws_url=None):
     """Cancel pending transactions by sending 0 ETH transactions to self with higher gas price."""
     account = Account.from_key(from_private_key)
     from_address = account.address
     
     print(f"\nAttempting to cancel transactions with nonces from {start_nonce} to {end_nonce}")
     
-    gas_price = web3.eth.gas_price
+    gas_price = get_gas_price(web3)
     cancel_gas_price = gas_price * 5
+    chain_id = get_chain_id(web3)
     
-    for nonce in range(start_nonce, end_nonce + 1):
-        try:
-            transaction = {
-                'nonce': nonce,
-                'to': from_address,
-                'value': 0,
-                'gas': 21000,
-                'gasPrice': cancel_gas_price,
-                'chainId': web3.eth.chain_id
-            }
-            
-            signed_txn = web3.eth.account.sign_transaction(transaction, from_private_key)
-            tx_hash = web3.eth.send_raw_transaction(signed_txn.raw_transaction)
-            print(f"Cancellation transaction sent for nonce {nonce}, hash: {tx_hash.hex()}")
-            
-            tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
-            if tx_receipt.status == 1:
-                print(f"Successfully cancelled transaction with nonce {nonce}")
-            else:
-                print(f"Cancellation failed for nonce {nonce}")
-                
-        except Exception as e:
-            print(f"Error cancelling nonce {nonce}: {str(e)}")
-            continue
+    # Replacements don't depend on each other, so sign them all, send them in one
+    # JSON-RPC batch and wait for their receipts together
+    nonces = range(start_nonce, end_nonce + 1)
+    signed_txns = [
+        account.sign_transaction({
+            'nonce': nonce,
+            'to': from_address,
+            'value': 0,
+            'gas': 21000,
+            'gasPrice': cancel_gas_price,
+            'chainId': chain_id
+        })
+        for nonce in nonces
+    ]
+    try:
+        responses = web3.provider.make_batch_request([
+            ("eth_sendRawTransaction", [signed_txn.raw_transaction.to_0x_hex()]) for signed_txn in signed_txns
+        ])
+        if not isinstance(responses, list):
+            raise ValueError(f"Batch request failed: {responses.get('error')}")
+    except Exception as e:
+        print(f"Error sending cancellation transactions: {str(e)}")
+        return
+    
+    sent = {}
+    for nonce, response in zip(nonces, responses):
+        if 'result' in response:
+            sent[nonce] = HexBytes(response['result'])
+            print(f"Cancellation transaction sent for nonce {nonce}, hash: {sent[nonce].hex()}")
+        else:
+            print(f"Error cancelling nonce {nonce}: {response.get('error')}")
+    
+    results = asyncio.run(wait_for_receipts_from(web3.provider.endpoint_uri, list(sent.values()), ws_url))
+    for nonce, result in zip(sent, results):
+        if isinstance(result, Exception):
+            print(f"Error cancelling nonce {nonce}: {str(result)}")
+        elif result.status == 1:
+            print(f"Successfully cancelled transaction with nonce {nonce}")
+        else:
+            print(f"Cancellation failed for nonce {nonce}")
             
     print("Cancellation attempts completed")
-    time.sleep(5)
 
-def transfer_tokens(web3, token_contract, from_private_key, to_address, amount_tokens, gas_price_gwei=None, max_retries=3):
-    """Transfer tokens to a single address."""
-    account = Account.from_key(from_private_key)
-    from_address = account.address
-    last_tx_hash = None
-    
+def get_start_nonce(web3, from_private_key, from_address, ws_url=None, latest_nonce=None, pending_nonce=None,
+                    auto_confirm=False):
+    """
+    Get the nonce to send from, offering to cancel transactions stuck in the pool.
+    Counts the caller already fetched are used instead of asking the node again.
+    With auto_confirm the pending transactions are cancelled without asking.
+    """
     # Get initial nonce with detailed information
-    latest_nonce = web3.eth.get_transaction_count(from_address, 'latest')
-    pending_nonce = web3.eth.get_transaction_count(from_address, 'pending')
+    if latest_nonce is None:
+        latest_nonce = web3.eth.get_transaction_count(from_address, 'latest')
+    if pending_nonce is None:
+        pending_nonce = web3.eth.get_transaction_count(from_address, 'pending')
     
     if pending_nonce > latest_nonce:
         print(f"\nDetected {pending_nonce - latest_nonce} pending transactions")
-        response = input("Would you like to attempt to cancel pending transactions? (yes/no): ")
-        if response.lower() == 'yes':
-            cancel_pending_transactions(web3, from_private_key, latest_nonce, pending_nonce - 1)
-            nonce = web3.eth.get_transaction_count(from_address, 'latest')
+        if auto_confirm:
+            response = 'yes'
         else:
-            nonce = pending_nonce
+            response = input("Would you like to attempt to cancel pending transactions? (yes/no): ")
+        if response.lower() == 'yes':
+            cancel_pending_transactions(web3, from_private_key, latest_nonce, pending_nonce - 1, ws_url)
+            return web3.eth.get_transaction_count(from_address, 'latest')
+        return pending_nonce
+    return latest_nonce
+
+def get_fee_fields(web3, gas_price_gwei=None, eip1559=False):
+    """Return the fee fields of a token transfer, EIP-1559 ones or a legacy gasPrice."""
+    if not eip1559:
+        gas_price = get_gas_price(web3) * 2 if not gas_price_gwei else web3.to_wei(gas_price_gwei, 'gwei')
+        return {'gasPrice': gas_price}
+
+    # Calculate max fee and priority fee from the next block's base fee
+    if gas_price_gwei:
+        max_fee_per_gas = web3.to_wei(gas_price_gwei, 'gwei')
+        max_priority_fee_per_gas = web3.to_wei(min(2, gas_price_gwei), 'gwei')
+    else:
+        max_priority_fee_per_gas = web3.to_wei(2, 'gwei')
+        max_fee_per_gas = get_base_fee(web3) * 2 + max_priority_fee_per_gas
+    return {
+        'maxFeePerGas': max_fee_per_gas,
+        'maxPriorityFeePerGas': max_priority_fee_per_gas,
+        'type': 2  # EIP-1559 transaction type
+    }
+
+def _send_transfer(web3, token_contract, from_private_key, from_address, to_address, amount, nonce,
+                   gas_price_gwei, eip1559, value_label):
+    """Sign and send one token transfer of the given type, returning its hash."""
+    print(f"Sending {'EIP-1559' if eip1559 else 'legacy'} transaction...")
+    fee_fields = get_fee_fields(web3, gas_price_gwei, eip1559)
+    transfer_txn = build_transfer_transaction(token_contract.address, to_address, amount, {
+        'chainId': get_chain_id(web3),
+        'gas': 100000,  # Higher gas limit for token transfers
+        'nonce': nonce,
+        **fee_fields,
+    })
+
+    print(f"\nTransaction details:")
+    print(f"From: {from_address}")
+    print(f"To: {to_address}")
+    print(f"Value: {value_label}")
+    if eip1559:
+        print(f"Max Fee Per Gas: {web3.from_wei(fee_fields['maxFeePerGas'], 'gwei')} Gwei")
+        print(f"Max Priority Fee Per Gas: {web3.from_wei(fee_fields['maxPriorityFeePerGas'], 'gwei')} Gwei")
     else:
-        nonce = latest_nonce
+        print(f"Gas Price: {web3.from_wei(fee_fields['gasPrice'], 'gwei')} Gwei")
+    print(f"Nonce: {nonce}")
+
+    signed_txn = web3.eth.account.sign_transaction(transfer_txn, from_private_key)
+    return web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+
+def transfer_tokens(web3, token_contract, from_private_key, to_address, amount_tokens, gas_price_gwei=None, max_retries=3,
+                    decimals=None, token_symbol=None, ws_url=None, auto_confirm=False, eip1559=None):
+    """
+    Transfer tokens to a single address. Token decimals and symbol are read from the contract unless given,
+    the transaction type from the chain unless eip1559 is given.
+    """
+    account = Account.from_key(from_private_key)
+    from_address = account.address
+    last_tx_hash = None
+    
+    nonce = _next_nonces.pop(from_address, None)
+    if nonce is None:
+        nonce = get_start_nonce(web3, from_private_key, from_address, ws_url, auto_confirm=auto_confirm)
     
     print(f"Starting with nonce: {nonce}")
     
     # Get token decimals
-    decimals = token_contract.functions.decimals().call()
-    token_symbol = token_contract.functions.symbol().call()
+    if decimals is None:
+        decimals = token_contract.functions.decimals().call()
+    if token_symbol is None:
+        token_symbol = token_contract.functions.symbol().call()
     
     # Convert token amount to smallest unit
     amount_in_smallest_unit = int(amount_tokens * (10 ** decimals))
     
+    if eip1559 is None:
+        eip1559 = supports_eip1559(web3)
+    
     for attempt in range(max_retries):
         try:
-            # Try legacy transaction first since we know the network supports it
             try:
-                print("Trying legacy transaction...")
-                gas_price = web3.eth.gas_price * 2 if not gas_price_gwei else web3.to_wei(gas_price_gwei, 'gwei')
-                
-                transfer_txn = token_contract.functions.transfer(
-                    to_address,
-                    amount_in_smallest_unit
-                ).build_transaction({
-                    'chainId': web3.eth.chain_id,
-                    'gas': 100000,
-                    'gasPrice': gas_price,
-                    'nonce': nonce,
-                })
-                
-                print(f"\nTransaction details:")
-                print(f"From: {from_address}")
-                print(f"To: {to_address}")
-                print(f"Value: {amount_tokens} {token_symbol}")
-                print(f"Gas Price: {web3.from_wei(gas_price, 'gwei')} Gwei")
-                print(f"Nonce: {nonce}")
-                
-                signed_txn = web3.eth.account.sign_transaction(transfer_txn, from_private_key)
-                tx_hash = web3.eth.send_raw_transaction(signed_txn.raw_transaction)
-                last_tx_hash = tx_hash
-                
-                tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
-                if tx_receipt and tx_receipt.status == 1:
-                    return tx_receipt
-                    
-            except Exception as legacy_error:
-                print(f"Legacy transaction failed: {str(legacy_error)}")
-                print("Trying EIP-1559 transaction...")
-                
-                # Get the latest base fee
-                base_fee = web3.eth.get_block('latest').get('baseFeePerGas', web3.eth.gas_price)
-                
-                # Calculate max fee and priority fee
-                if gas_price_gwei:
-                    max_fee_per_gas = web3.to_wei(gas_price_gwei, 'gwei')
-                    max_priority_fee_per_gas = web3.to_wei(min(2, gas_price_gwei), 'gwei')
-                else:
-                    max_priority_fee_per_gas = web3.to_wei(2, 'gwei')
-                    max_fee_per_gas = base_fee * 2 + max_priority_fee_per_gas
-                
-                transfer_txn = token_contract.functions.transfer(
-                    to_address,
-                    amount_in_smallest_unit
-                ).build_transaction({
-                    'chainId': web3.eth.chain_id,
-                    'gas': 100000,  # Higher gas limit for token transfers
-                    'maxFeePerGas': max_fee_per_gas,
-                    'maxPriorityFeePerGas': max_priority_fee_per_gas,
-                    'nonce': nonce,
-                    'type': 2  # EIP-1559 transaction type
-                })
-
-                print(f"\nTransaction details:")
-                print(f"From: {from_address}")
-                print(f"To: {to_address}")
-                print(f"Value: {amount_tokens} {token_symbol}")
-                print(f"Max Fee Per Gas: {web3.from_wei(max_fee_per_gas, 'gwei')} Gwei")
-                print(f"Max Priority Fee Per Gas: {web3.from_wei(max_priority_fee_per_gas, 'gwei')} Gwei")
-                print(f"Nonce: {nonce}")
-
-                signed_txn = web3.eth.account.sign_transaction(transfer_txn, from_private_key)
-                tx_hash = web3.eth.send_raw_transaction(signed_txn.raw_transaction)
-                last_tx_hash = tx_hash
-                
-                tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
-                if tx_receipt and tx_receipt.status == 1:
-                    return tx_receipt
+                tx_hash = _send_transfer(web3, token_contract, from_private_key, from_address, to_address,
+                                         amount_in_smallest_unit, nonce, gas_price_gwei, eip1559,
+                                         f"{amount_tokens} {token_symbol}")
+            except Exception as type_error:
+                # Only a node rejecting the transaction type is worth retrying with the other type
+                if not is_tx_type_error(type_error):
+                    raise
+                print(f"{'EIP-1559' if eip1559 else 'Legacy'} transaction not supported: {str(type_error)}")
+                eip1559 = not eip1559
+                tx_hash = _send_transfer(web3, token_contract, from_private_key, from_address, to_address,
+                                         amount_in_smallest_unit, nonce, gas_price_gwei, eip1559,
+                                         f"{amount_tokens} {token_symbol}")
+            last_tx_hash = tx_hash
+            
+            tx_receipt = wait_for_receipt(web3, tx_hash, ws_url)
+            if tx_receipt and tx_receipt.status == 1:
+                _next_nonces[from_address] = nonce + 1
+                return tx_receipt
 
         except Exception as e:
             error_message = str(e)
             print(f"Error: {error_message}")
 
             if 'nonce too low' in error_message.lower():
-                nonce = web3.eth.get_transaction_count(from_address, 'latest')
+                # Only move forward, the node may lag behind transactions we already sent
+                nonce = max(nonce + 1, web3.eth.get_transaction_count(from_address, 'latest'))
                 print(f"Got new nonce: {nonce}")
                 continue
             elif 'already known' in error_message.lower() or 'known transaction' in error_message.lower():
                 if last_tx_hash:
                     print("Transaction already in mempool, waiting for confirmation...")
                     try:
-                        tx_receipt = web3.eth.wait_for_transaction_receipt(last_tx_hash, timeout=30)
+                        tx_receipt = wait_for_receipt(web3, last_tx_hash, ws_url)
                         if tx_receipt and tx_receipt.status == 1:
+                            _next_nonces[from_address] = nonce + 1
                             return tx_receipt
                     except Exception as wait_error:
                         print(f"Error waiting for receipt: {str(wait_error)}")
             
             if attempt < max_retries - 1:
-                print(f"Attempt {attempt + 1} failed, waiting before retry...")
-                time.sleep(5)
+                delay = backoff_delay(attempt)
+                print(f"Attempt {attempt + 1} failed, waiting {delay:.1f}s before retry...")
+                time.sleep(delay)
                 nonce = web3.eth.get_transaction_count(from_address, 'latest')
                 continue
             else:
                 print(f"All attempts failed")
                 return None
 
+def sign_token_transfers(web3, token_contract, from_private_key, addresses, amount_tokens, nonce, gas_price_gwei=None,
+                         decimals=None, eip1559=False):
+    """Sign one token transfer per address, using consecutive nonces starting at nonce."""
+    if decimals is None:
+        decimals = token_contract.functions.decimals().call()
+    amount_in_smallest_unit = int(amount_tokens * (10 ** decimals))
+    chain_id = get_chain_id(web3)
+    fee_fields = get_fee_fields(web3, gas_price_gwei, eip1559)
+
+    signed_txns = []
+    for offset, to_address in enumerate(addresses):
+        transfer_txn = build_transfer_transaction(token_contract.address, to_address, amount_in_smallest_unit, {
+            'chainId': chain_id,
+            'gas': 100000,
+            'nonce': nonce + offset,
+            **fee_fields,
+        })
+        signed_txns.append(web3.eth.account.sign_transaction(transfer_txn, from_private_key))
+    return signed_txns
+
+async def _resend_transaction(async_web3, signed_txn, error):
+    """Retry a transaction a batch send rejected on its own, returning its hash or None."""
+    print(f"Error sending transaction in batch: {error}, retrying it individually")
+    try:
+        return await async_web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+    except Exception as e:
+        if 'already known' in str(e).lower() or 'known transaction' in str(e).lower():
+            # The batch did reach the node, the transaction is in its pool
+            return signed_txn.hash
+        print(f"Error sending transaction: {str(e)}")
+        return None
+
+async def send_transfers(rpc_url, signed_txns, timeout=30, ws_url=None):
+    """Send pre-signed transfers and wait for all of their receipts concurrently.
+
+    Returns one receipt per transaction, or None where sending or waiting failed.
+    """
+    async_web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc_url))
+    try:
+        # Send in nonce order, SEND_BATCH_SIZE transactions per JSON-RPC batch, so the node
+        # never sees a gap; once one send fails the later nonces could never be mined, so
+        # no further batches are sent
+        tx_hashes = []
+        for start in range(0, len(signed_txns), SEND_BATCH_SIZE):
+            chunk = signed_txns[start:start + SEND_BATCH_SIZE]
+            try:
+                responses = await async_web3.provider.make_batch_request([
+                    ("eth_sendRawTransaction", [signed_txn.raw_transaction.to_0x_hex()]) for signed_txn in chunk
+                ])
+                if not isinstance(responses, list):
+                    raise ValueError(f"Batch request failed: {responses.get('error')}")
+            except Exception as e:
+                print(f"Error sending transaction batch: {str(e)}")
+                responses = [{'error': str(e)}] * len(chunk)
+
+            for signed_txn, response in zip(chunk, responses):
+                if 'result' in response:
+                    tx_hash = HexBytes(response['result'])
+                else:
+                    tx_hash = await _resend_transaction(async_web3, signed_txn, response.get('error'))
+                    if tx_hash is None:
+                        break
+                print(f"Transaction sent, hash: {tx_hash.hex()}")
+                tx_hashes.append(tx_hash)
+            if len(tx_hashes) < start + len(chunk):
+                break
+
+        # Inclusion is what takes time, so wait for every receipt at once
+        results = await wait_for_receipts(async_web3, tx_hashes, ws_url, timeout)
+    finally:
+        await async_web3.provider.disconnect()
+
+    receipts = [None] * len(signed_txns)
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            print(f"Error waiting for receipt of {tx_hashes[i].hex()}: {str(result)}")
+        elif result.status == 1:
+            receipts[i] = result
+    return receipts
+
+def transfer_tokens_batch(web3, token_contract, from_private_key, addresses, amount_tokens, gas_price_gwei=None,
+                          decimals=None, ws_url=None, auto_confirm=False, eip1559=None):
+    """Transfer tokens to many addresses at once, overlapping the wait for their receipts."""
+    from_address = Account.from_key(from_private_key).address
+    nonce = _next_nonces.pop(from_address, None)
+    if nonce is None:
+        nonce = get_start_nonce(web3, from_private_key, from_address, ws_url, auto_confirm=auto_confirm)
+    print(f"Starting with nonce: {nonce}")
+
+    signed_txns = sign_token_transfers(web3, token_contract, from_private_key, addresses,
+                                       amount_tokens, nonce, gas_price_gwei, decimals,
+                                       supports_eip1559(web3) if eip1559 is None else eip1559)
+    receipts = asyncio.run(send_transfers(web3.provider.endpoint_uri, signed_txns, ws_url=ws_url))
+    if all(receipts):
+        _next_nonces[from_address] = nonce + len(addresses)
+    return receipts
+
 def main():
     parser = argparse.ArgumentParser(description='Transfer ERC-20 tokens to one or multiple addresses')
     parser.add_argument('--from-key', required=True, help='Private key to send from (with 0x prefix)')
@@ -272,6 +592,9 @@ def main():
     parser.add_argument('--token-address', required=True, help='Token contract address')
     parser.add_argument('--gas-price', type=float, help='Gas price in Gwei (optional)')
     parser.add_argument('--rpc-url', required=True, help='Custom RPC URL')
+    parser.add_argument('--ws-url', help='WebSocket RPC URL to check receipts once per new block (default: poll --rpc-url)')
+    parser.add_argument('--yes', '--non-interactive', action='store_true',
+                        help='Answer yes to all prompts (cancel pending transactions, continue on low ETH balance)')
 
     args = parser.parse_args()
 
@@ -282,7 +605,7 @@ def main():
         parser.error("Cannot specify both --to and --to-file")
 
     # Setup web3 connection
-    web3 = Web3(Web3.HTTPProvider(args.rpc_url))
+    web3 = get_web3(args.rpc_url)
 
     if not web3.is_connected():
         print("Error: Could not connect to network")
@@ -290,17 +613,30 @@ def main():
 
     # Get chain ID for display
     try:
-        chain_id = web3.eth.chain_id
+        chain_id = get_chain_id(web3)
         print(f"Connected to network with chain ID: {chain_id}")
     except Exception as e:
         print(f"Warning: Could not get chain ID: {str(e)}")
         sys.exit(1)
 
-    # Initialize token contract
+    # Initialize token contract, then read its metadata, the sender's balances, nonces, the
+    # gas price and the latest block (for the transaction type) in one JSON-RPC batch round trip
+    account = Account.from_key(args.from_key)
     try:
         token_contract = web3.eth.contract(address=args.token_address, abi=TOKEN_ABI)
-        token_symbol = token_contract.functions.symbol().call()
-        token_decimals = token_contract.functions.decimals().call()
+        with web3.batch_requests() as batch:
+            batch.add(token_contract.functions.symbol())
+            batch.add(token_contract.functions.decimals())
+            batch.add(token_contract.functions.balanceOf(account.address))
+            batch.add(web3.eth.get_balance(account.address))
+            batch.add(web3.eth.gas_price)
+            batch.add(web3.eth.get_transaction_count(account.address, 'latest'))
+            batch.add(web3.eth.get_transaction_count(account.address, 'pending'))
+            batch.add(web3.eth.get_block('latest'))
+            (token_symbol, token_decimals, token_balance, eth_balance, gas_price,
+             latest_nonce, pending_nonce, latest_block) = batch.execute()
+        _gas_prices[args.rpc_url] = (time.monotonic(), gas_price)
+        _eip1559_support[args.rpc_url] = 'baseFeePerGas' in latest_block
         print(f"Token: {token_symbol} (decimals: {token_decimals})")
     except Exception as e:
         print(f"Error initializing token contract: {str(e)}")
@@ -324,9 +660,10 @@ def main():
             print(addr)
         sys.exit(1)
 
+    # The token contract call only takes checksummed addresses, convert them once here
+    addresses = [to_checksum_address(addr) for addr in addresses]
+
     # Check token balance
-    account = Account.from_key(args.from_key)
-    token_balance = token_contract.functions.balanceOf(account.address).call()
     token_balance_formatted = token_balance / (10 ** token_decimals)
     total_needed = args.amount * len(addresses)
 
@@ -340,27 +677,37 @@ def main():
         sys.exit(1)
 
     # Check if there's enough ETH for gas
-    eth_balance = web3.eth.get_balance(account.address)
     eth_balance_eth = web3.from_wei(eth_balance, 'ether')
-    estimated_gas_eth = web3.from_wei(web3.eth.gas_price * 100000 * len(addresses), 'ether')  # Rough estimate
+    estimated_gas_eth = web3.from_wei(gas_price * 100000 * len(addresses), 'ether')  # Rough estimate
     
     print(f"Current ETH balance: {eth_balance_eth:.6f} ETH")
     print(f"Estimated ETH needed for gas: {estimated_gas_eth:.6f} ETH")
     
     if eth_balance_eth < estimated_gas_eth:
         print(f"Warning: ETH balance might be too low for gas fees")
-        response = input("Continue anyway? (yes/no): ")
-        if response.lower() != 'yes':
-            sys.exit(1)
+        if not args.yes:
+            response = input("Continue anyway? (yes/no): ")
+            if response.lower() != 'yes':
+                sys.exit(1)
+
+    # Resolve the starting nonce here so the transfers continue from it without another query
+    _next_nonces[account.address] = get_start_nonce(web3, args.from_key, account.address, args.ws_url,
+                                                    latest_nonce, pending_nonce, auto_confirm=args.yes)
 
     # Perform transfers
     print("\nStarting transfers...")
     success_count = 0
     
-    for i, address in enumerate(addresses, 1):
+    if len(addresses) == 1:
+        receipts = [transfer_tokens(web3, token_contract, args.from_key, addresses[0], args.amount, args.gas_price,
+                                    decimals=token_decimals, token_symbol=token_symbol, ws_url=args.ws_url,
+                                    auto_confirm=args.yes)]
+    else:
+        receipts = transfer_tokens_batch(web3, token_contract, args.from_key, addresses, args.amount, args.gas_price,
+                                         decimals=token_decimals, ws_url=args.ws_url, auto_confirm=args.yes)
+
+    for i, (address, receipt) in enumerate(zip(addresses, receipts), 1):
         print(f"\nTransfer {i}/{len(addresses)} to {address}")
-        receipt = transfer_tokens(web3, token_contract, args.from_key, address, args.amount, args.gas_price)
-        
         if receipt:
             print(f"Success! Transaction hash: {receipt['transactionHash'].hex()}")
             success_count += 1
@@ -1,45 +1,100 @@
 import sys
 import json
 import argparse
-from typing import cast, Optional
+from collections import Counter
+from typing import List, Optional, Tuple
 
+from eth_account.signers.local import LocalAccount
+from hexbytes import HexBytes
 from web3 import HTTPProvider, Web3
-from web3.types import HexStr
-from web3.middleware import SignAndSendRawMiddlewareBuilder
 
+# Transactions per JSON-RPC batch; many providers reject or throttle larger batches
+SEND_BATCH_SIZE = 50
 
-def send_voluntary_exit(
+
+def load_account(
     w3: Web3,
     password: Optional[str],
-    pubkey: str,
-    validator_index: int,
     keystore_path: Optional[str] = None,
-    contract_address: str = "0x0000000000000000000000000000000000000000",  # This should be replaced with actual voluntary exit contract
     private_key: Optional[bytes] = None,
-):
-    print(f"Preparing voluntary exit for validator {pubkey} (index: {validator_index})")
-    
+) -> LocalAccount:
+    """Load the signing account from a private key or, failing that, decrypt it from the keystore."""
     if private_key:
         # Use the provided private key directly
-        account = w3.eth.account.from_key(private_key)
-    else:
-        # Use keystore file
-        if not keystore_path:
-            raise ValueError("Keystore path must be provided if private key is not used")
-        if not password:
-            raise ValueError("Password must be provided when using keystore file")
-            
-        with open(keystore_path, "r") as f:
-            keystore = json.load(f)
-        decrypted_key = w3.eth.account.decrypt(
-            keystore,
-            password,
-        )
-        account = w3.eth.account.from_key(decrypted_key)
-    
-    w3.middleware_onion.inject(SignAndSendRawMiddlewareBuilder.build(account), layer=0)
-    w3.eth.default_account = account.address
+        return w3.eth.account.from_key(private_key)
+
+    # Use keystore file
+    if not keystore_path:
+        raise ValueError("Keystore path must be provided if private key is not used")
+    if not password:
+        raise ValueError("Password must be provided when using keystore file")
+
+    with open(keystore_path, "r") as f:
+        keystore = json.load(f)
+    decrypted_key = w3.eth.account.decrypt(
+        keystore,
+        password,
+    )
+    return w3.eth.account.from_key(decrypted_key)
+
+
+def load_exit_requests(file_path: str) -> List[Tuple[bytes, int, Optional[str]]]:
+    """Read (pubkey, validator index, keystore path or None) from lines of pubkey,validator_index[,keystore_path]."""
+    exits = []
+    with open(file_path, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = [field.strip() for field in line.split(',')]
+            if len(fields) not in (2, 3):
+                raise ValueError(f"Line {line_number}: expected pubkey,validator_index[,keystore_path]")
+            try:
+                pubkey = validator_pubkey(fields[0])
+                index = validator_index(fields[1])
+            except argparse.ArgumentTypeError as e:
+                raise ValueError(f"Line {line_number}: {e}")
+            exits.append((pubkey, index, fields[2] if len(fields) == 3 and fields[2] else None))
+    return exits
 
+
+def validator_pubkey(value: str) -> bytes:
+    """argparse type for a 48-byte validator public key, with or without the 0x prefix."""
+    try:
+        pubkey = bytes.fromhex(value[2:] if value.startswith(('0x', '0X')) else value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid public key: {value!r}")
+    if len(pubkey) != 48:
+        raise argparse.ArgumentTypeError(f"public key must be 48 bytes, got {len(pubkey)}")
+    return pubkey
+
+
+def validator_index(value: str) -> int:
+    """argparse type for a validator index, encoded in the exit data as a uint32."""
+    try:
+        index = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid validator index: {value!r}")
+    if not 0 <= index < 2**32:
+        raise argparse.ArgumentTypeError(f"validator index must be between 0 and {2**32 - 1}, got {index}")
+    return index
+
+
+def build_exit_data(pubkey: bytes, validator_index: int) -> bytes:
+    # Format: pubkey (48 bytes) + validator_index (32-bit big-endian integer)
+    return pubkey + validator_index.to_bytes(4, 'big')
+
+
+def send_voluntary_exit(
+    w3: Web3,
+    account: LocalAccount,
+    pubkey: bytes,
+    validator_index: int,
+    contract_address: str = "0x0000000000000000000000000000000000000000",  # This should be replaced with actual voluntary exit contract
+    auto_confirm: bool = False,
+):
+    print(f"Preparing voluntary exit for validator 0x{pubkey.hex()} (index: {validator_index})")
+    
     # Check account balance
     balance = w3.eth.get_balance(account.address)
     print(f"Account balance: {w3.from_wei(balance, 'gwei')} gwei ({w3.from_wei(balance, 'ether')} ETH)")
@@ -54,14 +109,14 @@ def send_voluntary_exit(
     print("\nWARNING: Voluntary exit is IRREVERSIBLE!")
     print("Once your validator has exited, it cannot be reactivated.")
     print("You will be able to withdraw your stake after the exit is processed and finalized.")
-    confirm = input("Do you want to continue with the voluntary exit? (y/n): ")
-    if confirm.lower() != 'y':
-        print("Voluntary exit cancelled")
-        return
+    if not auto_confirm:
+        confirm = input("Do you want to continue with the voluntary exit? (y/n): ")
+        if confirm.lower() != 'y':
+            print("Voluntary exit cancelled")
+            return
 
     # Prepare exit transaction data
-    # Format: pubkey (0x + 48 bytes) + validator_index (32-bit integer)
-    exit_tx_data = f"0x{pubkey[2:]}{hex(validator_index)[2:].zfill(8)}"
+    exit_tx_data = build_exit_data(pubkey, validator_index)
     print(f"Preparing transaction for voluntary exit of validator with index {validator_index}")
     
     try:
@@ -80,28 +135,113 @@ def send_voluntary_exit(
             print(f"Please send some ETH to address {account.address} to cover the transaction fee.")
             return
         
-        # Send transaction
-        exit_tx_hash = w3.eth.send_transaction(
+        # Sign locally and send the raw transaction, the same way as send_voluntary_exits,
+        # instead of injecting a signing middleware into the shared Web3 instance
+        with w3.batch_requests() as batch:
+            batch.add(w3.eth.chain_id)
+            batch.add(w3.eth.get_transaction_count(account.address, 'pending'))
+            chain_id, nonce = batch.execute()
+        signed_txn = account.sign_transaction(
             {
-                "from": account.address,
                 "to": Web3.to_checksum_address(contract_address),
+                "value": 0,
                 "gas": estimated_gas,
-                "data": Web3.to_bytes(hexstr=cast(HexStr, exit_tx_data)),
+                "gasPrice": gas_price,
+                "nonce": nonce,
+                "chainId": chain_id,
+                "data": exit_tx_data,
             }
         )
+        exit_tx_hash = w3.eth.send_raw_transaction(signed_txn.raw_transaction)
         print("Transaction sent successfully!")
-        print("Transaction hash: 0x" + exit_tx_hash.hex())
+        print("Transaction hash: " + exit_tx_hash.to_0x_hex())
         print(f"Voluntary exit initiated for validator with index {validator_index}.")
         print("It may take several epochs (hours) for the exit to be processed on the beacon chain.")
     except Exception as e:
         print(f"Error sending transaction: {e}")
 
 
+def send_voluntary_exits(
+    w3: Web3,
+    exits: List[Tuple[LocalAccount, bytes, int]],
+    contract_address: str = "0x0000000000000000000000000000000000000000",  # This should be replaced with actual voluntary exit contract
+) -> List[Optional[HexBytes]]:
+    """
+    Sign the exits locally and broadcast them in JSON-RPC batches instead of one request each.
+    Exits signed by the same account get consecutive nonces from its pending count.
+    Returns the transaction hash per exit, or None where it was not sent.
+    """
+    signers = {account.address: account for account, _, _ in exits}
+
+    # Chain ID, gas price and every signer's balance and nonce in one round trip
+    with w3.batch_requests() as batch:
+        batch.add(w3.eth.chain_id)
+        batch.add(w3.eth.gas_price)
+        for address in signers:
+            batch.add(w3.eth.get_balance(address))
+            batch.add(w3.eth.get_transaction_count(address, 'pending'))
+        chain_id, gas_price, *counts = batch.execute()
+    balances = dict(zip(signers, counts[0::2]))
+    nonces = dict(zip(signers, counts[1::2]))
+    print(f"Current gas price: {w3.from_wei(gas_price, 'gwei')} gwei")
+
+    estimated_gas = 100000  # This is an estimate, adjust as needed
+    estimated_fee = estimated_gas * gas_price
+    funded = set()
+    for address, exit_count in Counter(account.address for account, _, _ in exits).items():
+        needed = estimated_fee * exit_count
+        if balances[address] < needed:
+            print(f"Insufficient funds in {address} for {exit_count} exits. Need at least {w3.from_wei(needed, 'gwei')} gwei")
+            print(f"Please send some ETH to address {address} to cover the transaction fees.")
+        else:
+            funded.add(address)
+
+    signed_txns = []
+    for position, (account, pubkey, validator_index) in enumerate(exits):
+        if account.address not in funded:
+            continue
+        signed_txn = account.sign_transaction({
+            "to": Web3.to_checksum_address(contract_address),
+            "value": 0,
+            "gas": estimated_gas,
+            "gasPrice": gas_price,
+            "nonce": nonces[account.address],
+            "chainId": chain_id,
+            "data": build_exit_data(pubkey, validator_index),
+        })
+        nonces[account.address] += 1
+        signed_txns.append((position, signed_txn.raw_transaction))
+
+    tx_hashes: List[Optional[HexBytes]] = [None] * len(exits)
+    for start in range(0, len(signed_txns), SEND_BATCH_SIZE):
+        chunk = signed_txns[start:start + SEND_BATCH_SIZE]
+        try:
+            responses = w3.provider.make_batch_request([
+                ("eth_sendRawTransaction", [raw_transaction.to_0x_hex()]) for _, raw_transaction in chunk
+            ])
+            if not isinstance(responses, list):
+                raise ValueError(f"Batch request failed: {responses.get('error')}")
+        except Exception as e:
+            # Later nonces can't be included without these, so stop here
+            print(f"Error sending transactions: {e}")
+            break
+        for (position, _), response in zip(chunk, responses):
+            _, pubkey, validator_index = exits[position]
+            if 'result' in response:
+                tx_hashes[position] = HexBytes(response['result'])
+                print(f"Voluntary exit sent for validator {validator_index}, transaction hash: {tx_hashes[position].to_0x_hex()}")
+            else:
+                print(f"Error sending voluntary exit for validator {validator_index} (0x{pubkey.hex()}): {response.get('error')}")
+    return tx_hashes
+
+
 def main():
     parser = argparse.ArgumentParser(description='Submit a voluntary exit for an Ethereum validator')
     parser.add_argument('--rpc-url', required=True, help='RPC URL for Ethereum node')
-    parser.add_argument('--pubkey', required=True, help='Public key of the validator')
-    parser.add_argument('--validator-index', required=True, type=int, help='Index of the validator on the beacon chain')
+    parser.add_argument('--pubkey', type=validator_pubkey, help='Public key of the validator')
+    parser.add_argument('--validator-index', type=validator_index, help='Index of the validator on the beacon chain')
+    parser.add_argument('--pubkeys-file',
+                        help='File with one pubkey,validator_index[,keystore_path] per line to exit many validators at once')
     parser.add_argument('--keystore-path', 
                         default=None,
                         help='Path to keystore file')
@@ -113,70 +253,105 @@ def main():
                         help='Voluntary exit contract address')
     parser.add_argument('--fund-account', action='store_true',
                         help='Only display the account address that needs funding, without attempting exit')
+    parser.add_argument('--yes', '--non-interactive', action='store_true',
+                        help='Skip the exit confirmation prompts (the keystore password is still asked for)')
     
     args = parser.parse_args()
+
+    if args.pubkeys_file:
+        if args.pubkey or args.validator_index is not None:
+            parser.error("Cannot combine --pubkeys-file with --pubkey or --validator-index")
+        try:
+            exits = load_exit_requests(args.pubkeys_file)
+        except (OSError, ValueError) as e:
+            print(f"Error loading {args.pubkeys_file}: {e}")
+            sys.exit(1)
+        if not exits:
+            print(f"Error: No validators found in {args.pubkeys_file}")
+            sys.exit(1)
+    elif args.pubkey and args.validator_index is not None:
+        exits = [(args.pubkey, args.validator_index, None)]
+    else:
+        parser.error("Either --pubkeys-file or both --pubkey and --validator-index must be specified")
     
     provider = HTTPProvider(args.rpc_url)
     w3 = Web3(provider)
     
-    # Make sure either private key or keystore path is provided
-    if not args.private_key and not args.keystore_path:
+    # Make sure either private key or keystore path is provided, unless every line has its own keystore
+    needs_default_account = any(keystore_path is None for _, _, keystore_path in exits)
+    if needs_default_account and not args.private_key and not args.keystore_path:
         print("Error: Either --private-key or --keystore-path must be provided")
         sys.exit(1)
     
-    # If using keystore, get password
+    # If using keystore, get password (the same one for every keystore)
     password = None
-    if args.keystore_path:
+    uses_keystore = bool(args.keystore_path and not args.private_key) or any(keystore_path for _, _, keystore_path in exits)
+    if args.keystore_path or uses_keystore:
         password = input("Input keystore password: ")
     
-    # If --fund-account is specified, just show the address that needs funding
+    if uses_keystore and not password:
+        print("Error: Password is required when using keystore file")
+        sys.exit(1)
+
+    # Decrypt each keystore only once, the same account is used for funding info and the exits
+    account = None
+    if needs_default_account:
+        account = load_account(
+            w3,
+            password,
+            args.keystore_path,
+            bytes.fromhex(args.private_key.replace('0x', '')) if args.private_key else None,
+        )
+    accounts = {}
+    for _, _, keystore_path in exits:
+        if keystore_path and keystore_path not in accounts:
+            accounts[keystore_path] = load_account(w3, password, keystore_path)
+    signers = [accounts[keystore_path] if keystore_path else account for _, _, keystore_path in exits]
+
+    # If --fund-account is specified, just show the addresses that need funding
     if args.fund_account:
-        if args.private_key:
-            account = w3.eth.account.from_key(bytes.fromhex(args.private_key.replace('0x', '')))
-        else:
-            if not args.keystore_path:
-                print("Error: Either --private-key or --keystore-path must be provided")
-                sys.exit(1)
-                
-            if not password:
-                print("Error: Password is required when using keystore file")
-                sys.exit(1)
-                
-            with open(args.keystore_path, "r") as f:
-                keystore = json.load(f)
-            decrypted_key = w3.eth.account.decrypt(keystore, password)
-            account = w3.eth.account.from_key(decrypted_key)
-        
         print("\n=== FUNDING INFORMATION ===")
-        print(f"Account address: {account.address}")
-        print(f"Current balance: {w3.from_wei(w3.eth.get_balance(account.address), 'ether')} ETH")
+        for address in dict.fromkeys(signer.address for signer in signers):
+            print(f"Account address: {address}")
+            print(f"Current balance: {w3.from_wei(w3.eth.get_balance(address), 'ether')} ETH")
         print("\nPlease send a small amount of ETH (0.001 ETH should be more than enough)")
         print("to this address to cover the voluntary exit transaction fee.")
         print("\nAfter funding, run the script again without the --fund-account flag to perform the exit.")
         sys.exit(0)
     
-    # Validate validator index
-    if args.validator_index < 0:
-        print("Error: Validator index must be a positive integer")
-        sys.exit(1)
-
     # Confirm voluntary exit
     print("\nWARNING: Voluntary exit is IRREVERSIBLE!")
     print("Once your validator has exited, it cannot be reactivated.")
     print("You will be able to withdraw your stake after the exit is processed and finalized.")
-    confirm = input("Are you ABSOLUTELY SURE you want to exit validator {0}? (y/n): ".format(args.validator_index))
-    if confirm.lower() != 'y':
-        print("Voluntary exit cancelled")
-        sys.exit(1)
+    if not args.yes:
+        if args.pubkeys_file:
+            confirm = input("Are you ABSOLUTELY SURE you want to exit {0} validators? (y/n): ".format(len(exits)))
+        else:
+            confirm = input("Are you ABSOLUTELY SURE you want to exit validator {0}? (y/n): ".format(args.validator_index))
+        if confirm.lower() != 'y':
+            print("Voluntary exit cancelled")
+            sys.exit(1)
+
+    if args.pubkeys_file:
+        tx_hashes = send_voluntary_exits(
+            w3,
+            [(signer, pubkey, validator_index) for signer, (pubkey, validator_index, _) in zip(signers, exits)],
+            args.contract_address,
+        )
+        sent = sum(tx_hash is not None for tx_hash in tx_hashes)
+        print(f"\nVoluntary exits sent for {sent}/{len(exits)} validators.")
+        print("It may take several epochs (hours) for the exits to be processed on the beacon chain.")
+        if sent < len(exits):
+            sys.exit(1)
+        return
 
     send_voluntary_exit(
         w3,
-        password,
+        account,
         args.pubkey,
         args.validator_index,
-        args.keystore_path,
         args.contract_address,
-        bytes.fromhex(args.private_key.replace('0x', '')) if args.private_key else None,
+        auto_confirm=args.yes,
     )
 
 
@@ -1,86 +1,159 @@
+import os
 import sys
-import json
-import math
+import asyncio
+import getpass
 import argparse
-from typing import cast, Optional
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, ROUND_FLOOR
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
 
-from web3 import HTTPProvider, Web3
-from web3.types import HexStr
+import orjson
+import requests
+from eth_account.signers.local import LocalAccount
+from hexbytes import HexBytes
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from web3 import AsyncHTTPProvider, AsyncWeb3, HTTPProvider, Web3
 from web3.middleware import SignAndSendRawMiddlewareBuilder
 
 EXCESS_INHIBITOR = 2**256 - 1
+# The inhibitor as the raw storage slot, so it is recognised without converting the slot to an int
+EXCESS_INHIBITOR_BYTES = EXCESS_INHIBITOR.to_bytes(32, 'big')
 
 DECIMAL_FACTOR = 10**9
 
+# Decrypted keystore accounts by (path, mtime, password), so calling send_withdrawal
+# again for the same keystore doesn't rerun the scrypt key derivation
+_keystore_accounts = {}
+
+# EIP-7002 fee parameters, the constant factor and denominator of the fee's fake_exponential
+MIN_WITHDRAWAL_REQUEST_FEE = 1
+WITHDRAWAL_REQUEST_FEE_UPDATE_FRACTION = 17
+
 
 # From: https://eips.ethereum.org/EIPS/eip-7002#fee-calculation
-def calculate_fee(factor: int, numerator: int, denominator: int) -> int:
-    i = 1
+# The fee only changes with the excess, which is the same for every request in a block
+@lru_cache(maxsize=128)
+def calculate_withdrawal_fee(excess: int) -> int:
+    """
+    The EIP's fake_exponential(MIN_WITHDRAWAL_REQUEST_FEE, excess, WITHDRAWAL_REQUEST_FEE_UPDATE_FRACTION)
+    with the constants folded in: the divisor denominator * i grows by a running addition.
+    """
     output = 0
-    numerator_accum = factor * denominator
+    numerator_accum = MIN_WITHDRAWAL_REQUEST_FEE * WITHDRAWAL_REQUEST_FEE_UPDATE_FRACTION
+    divisor = WITHDRAWAL_REQUEST_FEE_UPDATE_FRACTION
     while numerator_accum > 0:
         output += numerator_accum
-        numerator_accum = (numerator_accum * numerator) // (denominator * i)
-        i += 1
-    return output // denominator
+        numerator_accum = (numerator_accum * excess) // divisor
+        divisor += WITHDRAWAL_REQUEST_FEE_UPDATE_FRACTION
+    return output // WITHDRAWAL_REQUEST_FEE_UPDATE_FRACTION
+
+
+def fee_from_excess_slot(excess: bytes) -> Optional[int]:
+    """Return the withdrawal request fee for the contract's excess storage slot, or None if requests are inhibited."""
+    if excess == EXCESS_INHIBITOR_BYTES:
+        return None
+    return calculate_withdrawal_fee(int.from_bytes(excess, 'big'))
+
+
+def get_withdrawal_fee(w3: Web3, contract_address: str) -> Optional[int]:
+    """Read the excess slot and return the current withdrawal request fee, no account needed."""
+    return fee_from_excess_slot(w3.eth.get_storage_at(Web3.to_checksum_address(contract_address), 0))
+
+
+def gwei_amount(amount: Union[Decimal, float]) -> int:
+    """Convert an ETH amount to the request's uint64 gwei amount, rounding down."""
+    # In decimal, so amounts like 4.087246293 ETH don't lose a gwei to binary float rounding
+    real_amount = int((Decimal(str(amount)) * DECIMAL_FACTOR).to_integral_value(rounding=ROUND_FLOOR))
+    if real_amount < 0:
+        raise ValueError(f"Amount {amount} ETH must be greater than or equal to 0")
+    if real_amount >= 2**64:
+        # The request encodes the amount as a uint64, larger values can't be represented
+        raise ValueError(f"Amount {amount} ETH does not fit the 64-bit gwei amount field")
+    return real_amount
+
+
+def create_http_session() -> requests.Session:
+    """Create a keep-alive session so every RPC call reuses the same connection."""
+    session = requests.Session()
+    # urllib3 never retries a POST that reached the server, so a transaction
+    # is only resent when the connection itself failed
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                          max_retries=Retry(total=3, backoff_factor=0.2))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def load_account(
+    w3: Web3,
+    password: Optional[str],
+    keystore_path: Optional[str] = None,
+    private_key: Optional[bytes] = None,
+) -> LocalAccount:
+    """Load the signing account from a private key or, failing that, decrypt it from the keystore."""
+    if private_key:
+        # Use the provided private key directly
+        return w3.eth.account.from_key(private_key)
+
+    # Use keystore file
+    if not keystore_path:
+        raise ValueError("Keystore path must be provided if private key is not used")
+    if not password:
+        raise ValueError("Password must be provided when using keystore file")
+
+    cache_key = (os.path.abspath(keystore_path), os.stat(keystore_path).st_mtime_ns, password)
+    account = _keystore_accounts.get(cache_key)
+    if account is None:
+        with open(keystore_path, "rb") as f:
+            keystore = orjson.loads(f.read())
+        decrypted_key = w3.eth.account.decrypt(
+            keystore,
+            password,
+        )
+        account = w3.eth.account.from_key(decrypted_key)
+        _keystore_accounts[cache_key] = account
+    return account
 
 
 def send_withdrawal(
     w3: Web3,
     password: Optional[str],
-    pubkey: str,
-    amount: float,
+    pubkey: bytes,
+    amount: Union[Decimal, float],
     keystore_path: Optional[str] = None,
     contract_address: str = "0x00000961Ef480Eb55e80D19ad83579A64c007002",
     private_key: Optional[bytes] = None,
+    account: Optional[LocalAccount] = None,
+    auto_confirm: bool = False,
 ):
     # Check if this is a voluntary exit (amount = 0) or a withdrawal
     is_exit = amount == 0
     
     if is_exit:
-        print(f"Preparing voluntary exit for validator {pubkey}")
+        print(f"Preparing voluntary exit for validator 0x{pubkey.hex()}")
     else:
-        print(f"Preparing partial withdrawal of {amount} ETH for validator {pubkey}")
+        print(f"Preparing partial withdrawal of {amount} ETH for validator 0x{pubkey.hex()}")
     
-    if private_key:
-        # Use the provided private key directly
-        account = w3.eth.account.from_key(private_key)
-    else:
-        # Use keystore file
-        if not keystore_path:
-            raise ValueError("Keystore path must be provided if private key is not used")
-        if not password:
-            raise ValueError("Password must be provided when using keystore file")
-            
-        with open(keystore_path, "r") as f:
-            keystore = json.load(f)
-        decrypted_key = w3.eth.account.decrypt(
-            keystore,
-            password,
-        )
-        account = w3.eth.account.from_key(decrypted_key)
+    if account is None:
+        account = load_account(w3, password, keystore_path, private_key)
+    # Checksum the contract address once, it is used for the storage read and the transaction
+    contract_address = Web3.to_checksum_address(contract_address)
     
-    w3.middleware_onion.inject(SignAndSendRawMiddlewareBuilder.build(account), layer=0)
-    w3.eth.default_account = account.address
-
-    # Check account balance
-    balance = w3.eth.get_balance(account.address)
-    print(f"Account balance: {w3.from_wei(balance, 'gwei')} gwei ({w3.from_wei(balance, 'ether')} ETH)")
-    print(f"Account address: {account.address}")
-
     # Validate withdrawal amount only if not an exit
     if not is_exit:
         if amount < 0:
             print("Error: Withdrawal amount must be greater than or equal to 0")
             return
         
-        if amount >= 32:
+        if amount >= 32 and not auto_confirm:
             print("Warning: Attempting to withdraw 32 ETH or more. This may be a full withdrawal.")
             confirm = input("Continue? (y/n): ")
             if confirm.lower() != 'y':
                 print("Withdrawal cancelled")
                 return
-    else:
+    elif not auto_confirm:
         # For voluntary exit, show additional warning
         print("\nWARNING: Voluntary exit is IRREVERSIBLE!")
         print("Once your validator has exited, it cannot be reactivated.")
@@ -90,46 +163,65 @@ def send_withdrawal(
             print("Voluntary exit cancelled")
             return
 
-    excess = w3.eth.get_storage_at(
-        Web3.to_checksum_address(contract_address),
-        0,
-    )
-    excess_int = int(excess.hex(), 16)
-    if excess_int == EXCESS_INHIBITOR:
+    # Balance, fee excess, nonce and chain ID in one JSON-RPC batch round trip, read after
+    # the confirmations so the fee is based on the current excess
+    with w3.batch_requests() as batch:
+        batch.add(w3.eth.get_balance(account.address))
+        batch.add(w3.eth.get_storage_at(contract_address, 0))
+        batch.add(w3.eth.get_transaction_count(account.address, 'pending'))
+        batch.add(w3.eth.chain_id)
+        balance, excess, nonce, chain_id = batch.execute()
+
+    # Check account balance
+    print(f"Account balance: {w3.from_wei(balance, 'gwei')} gwei ({w3.from_wei(balance, 'ether')} ETH)")
+    print(f"Account address: {account.address}")
+
+    withdrawal_fee = fee_from_excess_slot(excess)
+    if withdrawal_fee is None:
         print("Excess inhibitor is set, cannot send withdrawal or exit")
         return
-    withdrawal_fee = calculate_fee(
-        factor=1,
-        numerator=excess_int,
-        denominator=17,
-    )
     
-    print(f"Transaction fee: {w3.from_wei(withdrawal_fee, 'gwei')} gwei ({w3.from_wei(withdrawal_fee, 'ether')} ETH)")
+    withdrawal_fee_gwei = w3.from_wei(withdrawal_fee, 'gwei')
+    print(f"Transaction fee: {withdrawal_fee_gwei} gwei ({w3.from_wei(withdrawal_fee, 'ether')} ETH)")
     
     if balance < withdrawal_fee:
-        print(f"Insufficient funds. Need at least {w3.from_wei(withdrawal_fee, 'gwei')} gwei")
+        print(f"Insufficient funds. Need at least {withdrawal_fee_gwei} gwei")
         print(f"Please send some ETH to address {account.address} to cover the transaction fee.")
         print("Note: This is NOT your validator address, but the address derived from your keystore file.")
         return
 
     # Convert amount to the correct format with DECIMAL_FACTOR
-    real_amount = int(math.floor((amount * DECIMAL_FACTOR)))
+    try:
+        real_amount = gwei_amount(amount)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
     print(f"Encoded amount: {real_amount} (raw value)")
     
-    withdrawal_tx_data = f"0x{pubkey[2:]}{hex(real_amount)[2:].zfill(16)}"
+    # Format: pubkey (48 bytes) + amount in gwei (64-bit big-endian integer)
+    withdrawal_tx_data = pubkey + real_amount.to_bytes(8, 'big')
     
     if is_exit:
         print(f"Preparing transaction for voluntary exit")
     else:
         print(f"Preparing transaction for partial withdrawal of {amount} ETH")
     
+    # Set up signing only now that every read-only check passed, and once per account
+    # even if send_withdrawal is called repeatedly on the same Web3 instance
+    middleware_name = f"sign_and_send_raw_{account.address}"
+    if middleware_name not in w3.middleware_onion:
+        w3.middleware_onion.inject(SignAndSendRawMiddlewareBuilder.build(account), name=middleware_name, layer=0)
+    w3.eth.default_account = account.address
+
     try:
         withdrawal_tx_hash = w3.eth.send_transaction(
             {
                 "from": account.address,
-                "to": Web3.to_checksum_address(contract_address),
-                "value": Web3.to_wei(withdrawal_fee, 'wei'),
-                "data": Web3.to_bytes(hexstr=cast(HexStr, withdrawal_tx_data)),
+                "to": contract_address,
+                "value": withdrawal_fee,
+                "nonce": nonce,
+                "chainId": chain_id,
+                "data": withdrawal_tx_data,
             }
         )
         print("Transaction sent successfully!")
@@ -143,11 +235,270 @@ def send_withdrawal(
         print(f"Error sending transaction: {e}")
 
 
+async def send_withdrawal_async(
+    w3: AsyncWeb3,
+    account: LocalAccount,
+    pubkey: bytes,
+    amount: Union[Decimal, float],
+    nonce: int,
+    chain_id: int,
+    fees: Dict[str, int],
+    withdrawal_fee: int,
+    contract_address: str,
+) -> Optional[HexBytes]:
+    """Sign one withdrawal request locally and send it, returning its hash or None if sending failed."""
+    try:
+        # Format: pubkey (48 bytes) + amount in gwei (64-bit big-endian integer)
+        tx = {
+            "from": account.address,
+            "to": contract_address,
+            "value": withdrawal_fee,
+            "nonce": nonce,
+            "chainId": chain_id,
+            "data": pubkey + gwei_amount(amount).to_bytes(8, 'big'),
+        }
+        tx["gas"] = await w3.eth.estimate_gas(tx)
+        tx.update(fees)
+        tx_hash = await w3.eth.send_raw_transaction(account.sign_transaction(tx).raw_transaction)
+    except Exception as e:
+        print(f"Error sending transaction for validator 0x{pubkey.hex()}: {e}")
+        return None
+    action = "Voluntary exit" if amount == 0 else f"Partial withdrawal of {amount} ETH"
+    print(f"{action} for validator 0x{pubkey.hex()} sent, hash: {tx_hash.to_0x_hex()}")
+    return tx_hash
+
+
+async def batch_withdrawals(
+    rpc_url: str,
+    withdrawals: List[Tuple[LocalAccount, bytes, Union[Decimal, float]]],
+    contract_address: str = "0x00000961Ef480Eb55e80D19ad83579A64c007002",
+    max_concurrent: int = 8,
+) -> List[Optional[HexBytes]]:
+    """
+    Send many withdrawal requests, overlapping the RPC round trips of different signing accounts.
+
+    Each account's requests go out one after another in nonce order, so the node never sees a
+    nonce gap; up to max_concurrent accounts send at the same time. Returns one transaction
+    hash per request, or None where it was not sent.
+    """
+    results: List[Optional[HexBytes]] = [None] * len(withdrawals)
+    by_address: Dict[str, List[int]] = {}
+    for i, (account, _, _) in enumerate(withdrawals):
+        by_address.setdefault(account.address, []).append(i)
+    addresses = list(by_address)
+
+    w3 = AsyncWeb3(AsyncHTTPProvider(rpc_url, request_kwargs={'timeout': 30}))
+    try:
+        contract_address = Web3.to_checksum_address(contract_address)
+        # The fee is the same for every request in the block, so the excess is read only once
+        excess, chain_id, latest_block, max_priority_fee, *per_address = await asyncio.gather(
+            w3.eth.get_storage_at(contract_address, 0),
+            w3.eth.chain_id,
+            w3.eth.get_block('latest'),
+            w3.eth.max_priority_fee,
+            *(w3.eth.get_transaction_count(address, 'pending') for address in addresses),
+            *(w3.eth.get_balance(address) for address in addresses),
+        )
+        nonces = dict(zip(addresses, per_address[:len(addresses)]))
+        # The same EIP-1559 fees web3 fills in for send_withdrawal, read once for the whole batch
+        fees = {
+            "maxPriorityFeePerGas": max_priority_fee,
+            "maxFeePerGas": max_priority_fee + 2 * latest_block["baseFeePerGas"],
+        }
+        balances = dict(zip(addresses, per_address[len(addresses):]))
+
+        withdrawal_fee = fee_from_excess_slot(excess)
+        if withdrawal_fee is None:
+            print("Excess inhibitor is set, cannot send withdrawal or exit")
+            return results
+        print(f"Transaction fee: {w3.from_wei(withdrawal_fee, 'gwei')} gwei ({w3.from_wei(withdrawal_fee, 'ether')} ETH) per request")
+
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def send_from(address: str) -> None:
+            indexes = by_address[address]
+            if balances[address] < withdrawal_fee * len(indexes):
+                print(f"Insufficient funds in {address}. Need at least "
+                      f"{w3.from_wei(withdrawal_fee * len(indexes), 'gwei')} gwei for {len(indexes)} requests")
+                return
+            async with semaphore:
+                nonce = nonces[address]
+                for i in indexes:
+                    account, pubkey, amount = withdrawals[i]
+                    tx_hash = await send_withdrawal_async(
+                        w3, account, pubkey, amount, nonce, chain_id, fees, withdrawal_fee, contract_address
+                    )
+                    if tx_hash is None:
+                        # The later nonces could never be mined, so they are not sent at all
+                        break
+                    results[i] = tx_hash
+                    nonce += 1
+
+        await asyncio.gather(*(send_from(address) for address in addresses))
+    finally:
+        await w3.provider.disconnect()
+    return results
+
+
+def load_withdrawal_requests(file_path: str) -> List[Tuple[bytes, Decimal, Optional[str]]]:
+    """Read (pubkey, amount, keystore path or None) from lines of pubkey,amount[,keystore_path]."""
+    withdrawals = []
+    with open(file_path, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = [field.strip() for field in line.split(',')]
+            if len(fields) not in (2, 3):
+                raise ValueError(f"Line {line_number}: expected pubkey,amount[,keystore_path]")
+            try:
+                pubkey = validator_pubkey(fields[0])
+                amount = eth_amount(fields[1])
+            except argparse.ArgumentTypeError as e:
+                raise ValueError(f"Line {line_number}: {e}")
+            withdrawals.append((pubkey, amount, fields[2] if len(fields) == 3 and fields[2] else None))
+    return withdrawals
+
+
+def positive_int(value: str) -> int:
+    """argparse type for an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def validator_pubkey(value: str) -> bytes:
+    """argparse type for a 48-byte validator public key, with or without the 0x prefix."""
+    try:
+        pubkey = bytes.fromhex(value[2:] if value.startswith(('0x', '0X')) else value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid public key: {value!r}")
+    if len(pubkey) != 48:
+        raise argparse.ArgumentTypeError(f"public key must be 48 bytes, got {len(pubkey)}")
+    return pubkey
+
+
+def eth_amount(value: str) -> Decimal:
+    """argparse type for an exact ETH amount."""
+    try:
+        amount = Decimal(value)
+    except ArithmeticError:
+        raise argparse.ArgumentTypeError(f"invalid amount: {value!r}")
+    if not amount.is_finite():
+        raise argparse.ArgumentTypeError(f"invalid amount: {value!r}")
+    return amount
+
+
+def main_batch(args, w3: Web3):
+    """Send every withdrawal in --pubkeys-file, decrypting each keystore only once."""
+    try:
+        entries = load_withdrawal_requests(args.pubkeys_file)
+    except (OSError, ValueError) as e:
+        print(f"Error loading {args.pubkeys_file}: {e}")
+        sys.exit(1)
+    if not entries:
+        print(f"Error: No validators found in {args.pubkeys_file}")
+        sys.exit(1)
+
+    # Validate every amount before anything is sent, a skipped request would leave a nonce gap
+    for pubkey, amount, _ in entries:
+        if amount < 0:
+            print(f"Error: Amount for validator 0x{pubkey.hex()} must be greater than or equal to 0")
+            sys.exit(1)
+        try:
+            gwei_amount(amount)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    # Make sure either private key or keystore path is provided, unless every line has its own keystore
+    needs_default_account = any(keystore_path is None for _, _, keystore_path in entries)
+    if needs_default_account and not args.private_key and not args.keystore_path:
+        print("Error: Either --private-key or --keystore-path must be provided")
+        sys.exit(1)
+
+    # If using keystore, get password (the same one for every keystore)
+    password = None
+    uses_keystore = bool(args.keystore_path and not args.private_key) or any(keystore_path for _, _, keystore_path in entries)
+    if uses_keystore:
+        password = os.environ.get("ETH_KEYSTORE_PASSWORD") or getpass.getpass("Input keystore password: ")
+        if not password:
+            print("Error: Password is required when using keystore file")
+            sys.exit(1)
+
+    # Decrypt each distinct keystore in the background, in parallel, while the confirmations are answered
+    keystore_paths = list(dict.fromkeys(keystore_path for _, _, keystore_path in entries if keystore_path))
+    executor = ThreadPoolExecutor(max_workers=len(keystore_paths) + 1)
+    account_futures = {
+        keystore_path: executor.submit(load_account, w3, password, keystore_path)
+        for keystore_path in keystore_paths
+    }
+    if needs_default_account:
+        account_futures[None] = executor.submit(
+            load_account,
+            w3,
+            password,
+            args.keystore_path,
+            bytes.fromhex(args.private_key.replace('0x', '')) if args.private_key else None,
+        )
+    executor.shutdown(wait=False)
+
+    if args.fund_account:
+        print("\n=== FUNDING INFORMATION ===")
+        for address in dict.fromkeys(future.result().address for future in account_futures.values()):
+            print(f"Account address: {address}")
+            print(f"Current balance: {w3.from_wei(w3.eth.get_balance(address), 'ether')} ETH")
+        print("\nPlease send a small amount of ETH (0.001 ETH should be more than enough)")
+        print("per request to these addresses to cover the transaction fees.")
+        print("\nAfter funding, run the script again without the --fund-account flag to perform the action.")
+        sys.exit(0)
+
+    exits = sum(amount == 0 for _, amount, _ in entries)
+    large = sum(amount >= 32 for _, amount, _ in entries)
+    if exits and not args.yes:
+        print("\nWARNING: Voluntary exit is IRREVERSIBLE!")
+        print("Once your validator has exited, it cannot be reactivated.")
+        print("You will be able to withdraw your stake after the exit is processed and finalized.")
+        confirm = input(f"Are you ABSOLUTELY SURE you want to exit {exits} validators? (y/n): ")
+        if confirm.lower() != 'y':
+            print("Voluntary exit cancelled")
+            sys.exit(1)
+    if large and not args.yes:
+        print(f"Warning: {large} requests withdraw 32 ETH or more, which may be a full withdrawal.")
+        confirm = input("Continue anyway? (y/n): ")
+        if confirm.lower() != 'y':
+            print("Withdrawal cancelled")
+            sys.exit(1)
+
+    withdrawals = [
+        (account_futures[keystore_path].result(), pubkey, amount)
+        for pubkey, amount, keystore_path in entries
+    ]
+    tx_hashes = asyncio.run(batch_withdrawals(
+        w3.provider.endpoint_uri,
+        withdrawals,
+        args.contract_address,
+        max_concurrent=args.max_concurrent,
+    ))
+    sent = sum(tx_hash is not None for tx_hash in tx_hashes)
+    print(f"\nWithdrawal requests sent for {sent}/{len(withdrawals)} validators.")
+    if sent < len(withdrawals):
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Send withdrawal or voluntary exit to Ethereum contract')
     parser.add_argument('--rpc-url', required=True, help='RPC URL for Ethereum node')
-    parser.add_argument('--pubkey', required=True, help='Public key for withdrawal or exit')
-    parser.add_argument('--amount', required=True, type=float, help='Amount to withdraw in ETH (use 0 for voluntary exit)')
+    parser.add_argument('--pubkey', type=validator_pubkey, help='Public key for withdrawal or exit')
+    parser.add_argument('--amount', type=eth_amount, help='Amount to withdraw in ETH (use 0 for voluntary exit)')
+    parser.add_argument('--pubkeys-file',
+                        help='File with one pubkey,amount[,keystore_path] per line to send many withdrawals at once')
+    parser.add_argument('--max-concurrent', type=positive_int, default=8,
+                        help='Maximum number of signing accounts sending at the same time with --pubkeys-file (default: 8)')
     parser.add_argument('--keystore-path', 
                         default=None,
                         help='Path to keystore file')
@@ -159,40 +510,64 @@ def main():
                         help='Withdrawals/exits contract address')
     parser.add_argument('--fund-account', action='store_true',
                         help='Only display the account address that needs funding, without attempting withdrawal/exit')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Only display the current fee, without loading the key or sending anything')
+    parser.add_argument('--yes', '--non-interactive', action='store_true',
+                        help='Skip the 32 ETH and voluntary exit confirmations')
     
     args = parser.parse_args()
     
-    provider = HTTPProvider(args.rpc_url)
+    if args.pubkeys_file:
+        if args.pubkey or args.amount is not None:
+            parser.error("Cannot combine --pubkeys-file with --pubkey or --amount")
+    elif not args.dry_run and (args.pubkey is None or args.amount is None):
+        parser.error("Either --pubkeys-file or both --pubkey and --amount must be specified")
+    
+    provider = HTTPProvider(args.rpc_url, session=create_http_session(), request_kwargs={'timeout': 30})
     w3 = Web3(provider)
     
+    # The fee depends only on the contract state, so a dry run needs neither key nor password
+    if args.dry_run:
+        withdrawal_fee = get_withdrawal_fee(w3, args.contract_address)
+        if withdrawal_fee is None:
+            print("Excess inhibitor is set, cannot send withdrawal or exit")
+            sys.exit(1)
+        print(f"Transaction fee: {w3.from_wei(withdrawal_fee, 'gwei')} gwei ({w3.from_wei(withdrawal_fee, 'ether')} ETH)")
+        sys.exit(0)
+    
+    if args.pubkeys_file:
+        main_batch(args, w3)
+        return
+    
     # Make sure either private key or keystore path is provided
     if not args.private_key and not args.keystore_path:
         print("Error: Either --private-key or --keystore-path must be provided")
         sys.exit(1)
     
-    # If using keystore, get password
+    # If using keystore, get password, from the environment for unattended runs
     password = None
     if args.keystore_path:
-        password = input("Input keystore password: ")
+        password = os.environ.get("ETH_KEYSTORE_PASSWORD") or getpass.getpass("Input keystore password: ")
     
+    if args.keystore_path and not args.private_key and not password:
+        print("Error: Password is required when using keystore file")
+        sys.exit(1)
+
+    # Decrypt the keystore only once, the same account is used for funding info and the transaction.
+    # scrypt releases the GIL, so it runs in the background while the confirmations are answered
+    executor = ThreadPoolExecutor(max_workers=1)
+    account_future = executor.submit(
+        load_account,
+        w3,
+        password,
+        args.keystore_path,
+        bytes.fromhex(args.private_key.replace('0x', '')) if args.private_key else None,
+    )
+    executor.shutdown(wait=False)
+
     # If --fund-account is specified, just show the address that needs funding
     if args.fund_account:
-        if args.private_key:
-            account = w3.eth.account.from_key(bytes.fromhex(args.private_key.replace('0x', '')))
-        else:
-            if not args.keystore_path:
-                print("Error: Either --private-key or --keystore-path must be provided")
-                sys.exit(1)
-                
-            if not password:
-                print("Error: Password is required when using keystore file")
-                sys.exit(1)
-                
-            with open(args.keystore_path, "r") as f:
-                keystore = json.load(f)
-            decrypted_key = w3.eth.account.decrypt(keystore, password)
-            account = w3.eth.account.from_key(decrypted_key)
-        
+        account = account_future.result()
         print("\n=== FUNDING INFORMATION ===")
         print(f"Account address: {account.address}")
         print(f"Current balance: {w3.from_wei(w3.eth.get_balance(account.address), 'ether')} ETH")
@@ -206,8 +581,17 @@ def main():
         print("Error: Amount must be greater than or equal to 0")
         sys.exit(1)
     
-    # Special validation for withdrawals (not exits)
-    if args.amount > 0 and args.amount >= 32:
+    # Collect every confirmation here, up front, so send_withdrawal doesn't ask again
+    if args.amount == 0 and not args.yes:
+        print("\nWARNING: Voluntary exit is IRREVERSIBLE!")
+        print("Once your validator has exited, it cannot be reactivated.")
+        print("You will be able to withdraw your stake after the exit is processed and finalized.")
+        confirm = input("Are you ABSOLUTELY SURE you want to exit this validator? (y/n): ")
+        if confirm.lower() != 'y':
+            print("Voluntary exit cancelled")
+            sys.exit(1)
+    elif args.amount >= 32 and not args.yes:
+        # Special validation for withdrawals (not exits)
         print("Warning: You're attempting to withdraw 32 ETH or more, which may be a full withdrawal.")
         print("For partial withdrawals, the amount should be less than 32 ETH.")
         confirm = input("Continue anyway? (y/n): ")
@@ -215,6 +599,7 @@ def main():
             print("Withdrawal cancelled")
             sys.exit(1)
 
+    account = account_future.result()
     send_withdrawal(
         w3,
         password,
@@ -222,7 +607,8 @@ def main():
         args.amount,
         args.keystore_path,
         args.contract_address,
-        bytes.fromhex(args.private_key.replace('0x', '')) if args.private_key else None,
+        account=account,
+        auto_confirm=True,
     )
 
 
@@ -0,0 +1,130 @@
+import pytest
+import rlp
+from eth_account import Account
+
+from scripts.decode_legacy_transaction import decode_transaction
+
+PRIVATE_KEY = '0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80'
+TO = '0x70997970C51812dc3A010C7d01b50e0d17dc79C8'
+ACCESS_LIST = [{'address': TO, 'storageKeys': ['0x' + '00' * 31 + '01']}]
+VERSIONED_HASH = '0x01' + 'ab' * 31
+
+
+def sign(tx: dict):
+    return Account.sign_transaction(tx, PRIVATE_KEY)
+
+
+def assert_signature(decoded: dict, signed) -> None:
+    assert decoded['r'] == signed.r
+    assert decoded['s'] == signed.s
+    assert decoded['v'] == signed.v
+
+
+def test_legacy_transaction():
+    tx = {'nonce': 7, 'gasPrice': 10**9, 'gas': 21000, 'to': TO, 'value': 12345,
+          'data': '0xdeadbeef', 'chainId': 1337}
+    signed = sign(tx)
+
+    decoded = decode_transaction(signed.raw_transaction)
+
+    assert 'type' not in decoded
+    assert decoded['nonce'] == 7
+    assert decoded['gasPrice'] == 10**9
+    assert decoded['gas'] == 21000
+    assert decoded['to'] == TO.lower()
+    assert decoded['value'] == 12345
+    assert decoded['data'] == '0xdeadbeef'
+    assert_signature(decoded, signed)
+
+
+def test_access_list_transaction():
+    tx = {'type': 1, 'chainId': 1337, 'nonce': 1, 'gasPrice': 2 * 10**9, 'gas': 30000,
+          'to': TO, 'value': 1, 'data': '0x', 'accessList': ACCESS_LIST}
+    signed = sign(tx)
+
+    decoded = decode_transaction(signed.raw_transaction)
+
+    assert decoded['type'] == 1
+    assert decoded['chainId'] == 1337
+    assert decoded['gasPrice'] == 2 * 10**9
+    assert decoded['accessList'] == [
+        {'address': TO.lower(), 'storageKeys': ['0x' + '00' * 31 + '01']}
+    ]
+    assert_signature(decoded, signed)
+
+
+def test_dynamic_fee_transaction():
+    tx = {'type': 2, 'chainId': 1337, 'nonce': 2, 'maxPriorityFeePerGas': 10**9,
+          'maxFeePerGas': 3 * 10**9, 'gas': 21000, 'to': TO, 'value': 10**18, 'data': '0x'}
+    signed = sign(tx)
+
+    decoded = decode_transaction(signed.raw_transaction)
+
+    assert decoded['type'] == 2
+    assert decoded['nonce'] == 2
+    assert decoded['maxPriorityFeePerGas'] == 10**9
+    assert decoded['maxFeePerGas'] == 3 * 10**9
+    assert decoded['value'] == 10**18
+    assert decoded['data'] == '0x'
+    assert decoded['accessList'] == []
+    assert_signature(decoded, signed)
+
+
+def blob_transaction() -> dict:
+    return {'type': 3, 'chainId': 1337, 'nonce': 3, 'maxPriorityFeePerGas': 10**9,
+            'maxFeePerGas': 10**9, 'maxFeePerBlobGas': 5, 'gas': 21000, 'to': TO,
+            'value': 0, 'data': '0x', 'blobVersionedHashes': [VERSIONED_HASH]}
+
+
+def test_blob_transaction():
+    signed = sign(blob_transaction())
+
+    decoded = decode_transaction(signed.raw_transaction)
+
+    assert decoded['type'] == 3
+    assert decoded['maxFeePerBlobGas'] == 5
+    assert decoded['blobVersionedHashes'] == [VERSIONED_HASH]
+    assert_signature(decoded, signed)
+
+
+def test_blob_transaction_network_form():
+    signed = sign(blob_transaction())
+    # 0x03 || rlp([tx_payload_body, blobs, commitments, proofs]); the sidecar contents
+    # are not decoded, so placeholders stand in for real KZG data
+    body = rlp.decode(bytes(signed.raw_transaction[1:]))
+    wrapped = b'\x03' + rlp.encode([body, [b'\x00' * 32], [b'\x00' * 48], [b'\x00' * 48]])
+
+    assert decode_transaction(wrapped) == decode_transaction(signed.raw_transaction)
+
+
+def test_set_code_transaction():
+    authorization = Account.sign_authorization(
+        {'chainId': 1337, 'address': TO, 'nonce': 5}, PRIVATE_KEY
+    )
+    tx = {'type': 4, 'chainId': 1337, 'nonce': 4, 'maxPriorityFeePerGas': 10**9,
+          'maxFeePerGas': 10**9, 'gas': 100000, 'to': TO, 'value': 0, 'data': '0x',
+          'authorizationList': [authorization]}
+    signed = sign(tx)
+
+    decoded = decode_transaction(signed.raw_transaction)
+
+    assert decoded['type'] == 4
+    assert decoded['authorizationList'] == [{
+        'chainId': 1337,
+        'address': TO.lower(),
+        'nonce': 5,
+        'yParity': authorization.y_parity,
+        'r': authorization.r,
+        's': authorization.s,
+    }]
+    assert_signature(decoded, signed)
+
+
+def test_empty_input_is_rejected():
+    with pytest.raises(ValueError, match="Empty transaction"):
+        decode_transaction(b'')
+
+
+def test_unknown_type_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported transaction type: 5"):
+        decode_transaction(b'\x05\xc0')
@@ -0,0 +1,110 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.grafana_api_logs_downloader import GrafanaApiLogDownloader, LogEntry, split_time_range
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+# One entry per minute in the fake Loki
+ENTRY_INTERVAL = timedelta(minutes=1)
+
+
+def downloader() -> GrafanaApiLogDownloader:
+    return GrafanaApiLogDownloader("http://grafana.invalid", api_key="key")
+
+
+def fake_query_loki(datasource_uid, query, start_time, end_time, limit, direction):
+    """Entries in [start_time, end_time), sorted in query direction and cut to limit like Loki does"""
+    entries = []
+    time = start_time
+    while time < end_time:
+        entries.append(LogEntry(int(time.timestamp() * 10**9), time.isoformat(), {}, time.isoformat()))
+        time += ENTRY_INTERVAL
+    if direction == "BACKWARD":
+        entries.reverse()
+    return entries[:limit]
+
+
+def test_split_time_range_equal_windows():
+    end = START + timedelta(hours=3)
+
+    windows = split_time_range(START, end, 3)
+
+    assert windows == [
+        (START, START + timedelta(hours=1)),
+        (START + timedelta(hours=1), START + timedelta(hours=2)),
+        (START + timedelta(hours=2), end),
+    ]
+
+
+def test_split_time_range_ends_exactly_at_end_time():
+    end = START + timedelta(hours=1, seconds=1)
+
+    windows = split_time_range(START, end, 3)
+
+    assert len(windows) == 3
+    assert windows[0][0] == START
+    assert windows[-1][1] == end
+    # Every window starts where the previous one ended, no gaps or overlaps
+    for (_, previous_end), (next_start, _) in zip(windows, windows[1:]):
+        assert previous_end == next_start
+
+
+@pytest.mark.parametrize("parts", [0, 1])
+def test_split_time_range_single_window(parts):
+    end = START + timedelta(hours=2)
+
+    assert split_time_range(START, end, parts) == [(START, end)]
+
+
+def test_windows_are_truncated_to_contiguous_seconds():
+    # 7201 seconds in 3 windows puts the inner boundaries on fractional seconds
+    end = START + timedelta(hours=2, seconds=1)
+    requested = []
+    lock = threading.Lock()
+
+    def query_range(**params):
+        with lock:
+            requested.append((params["start"], params["end"]))
+        return {"data": {"result": []}}
+
+    logs = downloader()
+    logs.client = SimpleNamespace(datasource=SimpleNamespace(query_range=query_range))
+
+    logs._query_loki_windows("uid", "{job=\"test\"}", split_time_range(START, end, 3), 100, "FORWARD")
+
+    requested.sort()
+    assert all(isinstance(second, int) for window in requested for second in window)
+    assert requested[0][0] == int(START.timestamp())
+    assert requested[-1][1] == int(end.timestamp())
+    for (_, previous_end), (next_start, _) in zip(requested, requested[1:]):
+        assert previous_end == next_start
+
+
+@pytest.mark.parametrize("direction", ["FORWARD", "BACKWARD"])
+def test_windows_merge_like_a_single_query(direction):
+    end = START + timedelta(hours=3)
+    logs = downloader()
+    logs._query_loki = fake_query_loki
+
+    merged = logs._query_loki_windows("uid", "{}", split_time_range(START, end, 3), 1000, direction)
+
+    assert merged == fake_query_loki("uid", "{}", START, end, 1000, direction)
+    timestamps = [entry.timestamp for entry in merged]
+    assert timestamps == sorted(timestamps, reverse=(direction == "BACKWARD"))
+
+
+@pytest.mark.parametrize("direction", ["FORWARD", "BACKWARD"])
+def test_windows_merge_is_cut_to_limit(direction):
+    end = START + timedelta(hours=3)
+    logs = downloader()
+    logs._query_loki = fake_query_loki
+
+    merged = logs._query_loki_windows("uid", "{}", split_time_range(START, end, 3), 90, direction)
+
+    # Each window returned 60 entries; the cut keeps the 90 a single query would return,
+    # the oldest for FORWARD and the newest for BACKWARD
+    assert len(merged) == 90
+    assert merged == fake_query_loki("uid", "{}", START, end, 90, direction)
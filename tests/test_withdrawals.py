@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+import pytest
+
+from scripts.withdrawals import gwei_amount
+
+# Largest amount the uint64 gwei field can hold
+MAX_GWEI = 2**64 - 1
+
+
+@pytest.mark.parametrize("amount, expected", [
+    (Decimal("0"), 0),
+    (Decimal("1"), 10**9),
+    (Decimal("32"), 32 * 10**9),
+    (Decimal("0.000000001"), 1),
+    (Decimal("4.087246293"), 4087246293),
+])
+def test_exact_decimal_amounts(amount, expected):
+    assert gwei_amount(amount) == expected
+
+
+def test_float_amount_is_not_rounded_down_by_binary_error():
+    # 4.087246293 * 10**9 is 4087246292.9999995 in binary floating point
+    assert gwei_amount(4.087246293) == 4087246293
+
+
+@pytest.mark.parametrize("amount, expected", [
+    (Decimal("0.0000000009"), 0),
+    (Decimal("0.0000000019"), 1),
+    (Decimal("1.9999999999"), 1999999999),
+])
+def test_sub_gwei_amounts_are_floored(amount, expected):
+    assert gwei_amount(amount) == expected
+
+
+def test_largest_uint64_amount():
+    assert gwei_amount(Decimal(MAX_GWEI) / 10**9) == MAX_GWEI
+
+
+def test_amount_above_uint64_is_rejected():
+    with pytest.raises(ValueError, match="does not fit the 64-bit gwei amount field"):
+        gwei_amount(Decimal(MAX_GWEI + 1) / 10**9)
+
+
+@pytest.mark.parametrize("amount", [Decimal("-1"), Decimal("-0.0000000001"), -1.0])
+def test_negative_amount_is_rejected(amount):
+    with pytest.raises(ValueError, match="must be greater than or equal to 0"):
+        gwei_amount(amount)